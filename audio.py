@@ -0,0 +1,139 @@
+"""Music and voice-over for c4.py, loaded only when it's about to be heard.
+
+c4 used to decode menu_music.mp3 and every cutsceneN.mp3 into full PCM
+Sounds in its constructor: tens of megabytes held for the whole session and
+a slower start, for audio that often never plays. AudioManager only notes
+which files exist. Long tracks stream from disk through pygame.mixer.music.
+Clips (the cutscene audio) are decoded on a worker thread once the game says
+one is coming up, and decoded clips live in an LRU that drops the least
+recently played ones once they exceed a byte budget.
+"""
+import os
+import threading
+from collections import OrderedDict
+
+import pygame
+
+
+class AudioManager:
+    def __init__(self, directory, budget=24 * 1024 * 1024):
+        self.directory = directory
+        self.budget = budget          # Bytes of decoded PCM kept in memory
+        self.tracks = {}              # name -> path, streamed through mixer.music
+        self.clips = {}               # name -> path, decoded into a Sound
+        self.cache = OrderedDict()    # name -> (Sound, bytes), LRU order
+        self.cached_bytes = 0
+        self.loading = {}             # name -> Thread decoding it
+        self.lock = threading.Lock()
+        self.channel = None           # Channel the current clip plays on
+        self.current = None           # Name of what's playing, if anything
+        self.failed = set()           # Names whose file wouldn't decode or play; never retried
+
+    def register(self, name, filename, stream=False, label=None, optional=True):
+        """Note a file if it exists; nothing is decoded yet. Returns whether it was found."""
+        path = os.path.join(self.directory, filename)
+        if not os.path.exists(path):
+            if optional:
+                print(f"❌ {filename} not found (optional)")
+            else:
+                print(f"❌ File not found: {path}")
+            return False
+        (self.tracks if stream else self.clips)[name] = path
+        print(f"✅ {label or filename} found{' (streamed)' if stream else ''}")
+        return True
+
+    def has(self, name):
+        return name in self.tracks or name in self.clips
+
+    def preload(self, name):
+        """Start decoding a clip in the background so play() won't stall on it."""
+        if not pygame.mixer.get_init():
+            return   # No mixer (headless): nothing will be heard
+        with self.lock:
+            if name not in self.clips or name in self.cache or name in self.loading or name in self.failed:
+                return
+            thread = threading.Thread(target=self._load, args=(name,), name=f'audio-{name}', daemon=True)
+            self.loading[name] = thread
+        thread.start()
+
+    def _load(self, name):
+        try:
+            sound = pygame.mixer.Sound(self.clips[name])
+        except Exception as e:
+            print(f"❌ Error loading {name}: {e}")
+            sound = None
+        with self.lock:
+            self.loading.pop(name, None)
+            if sound is None:
+                self.failed.add(name)
+            else:
+                self._store(name, sound)
+        return sound
+
+    def _store(self, name, sound):
+        freq, size, channels = pygame.mixer.get_init()
+        nbytes = int(sound.get_length() * freq) * channels * abs(size) // 8
+        self.cache[name] = (sound, nbytes)
+        self.cached_bytes += nbytes
+        while self.cached_bytes > self.budget and len(self.cache) > 1:
+            _, (_, dropped) = self.cache.popitem(last=False)
+            self.cached_bytes -= dropped
+
+    def clip(self, name):
+        """The decoded clip, waiting for (or doing) the decode if it isn't cached yet."""
+        with self.lock:
+            entry = self.cache.get(name)
+            if entry:
+                self.cache.move_to_end(name)
+                return entry[0]
+            thread = self.loading.get(name)
+            if name in self.failed:
+                return None
+        if thread:
+            thread.join()
+            with self.lock:
+                entry = self.cache.get(name)
+            return entry[0] if entry else None
+        return self._load(name)
+
+    def play(self, name, loops=0):
+        """Stop whatever is playing and start name (silence if it has no file or no mixer)."""
+        self.stop()
+        if not pygame.mixer.get_init() or name in self.failed:
+            return
+        try:
+            if name in self.tracks:
+                pygame.mixer.music.load(self.tracks[name])
+                pygame.mixer.music.play(loops)
+            elif name in self.clips:
+                sound = self.clip(name)
+                if sound is None:
+                    return
+                self.channel = sound.play(loops)
+            else:
+                return
+        except pygame.error as e:
+            print(f"❌ Can't play {name}: {e}")
+            self.failed.add(name)
+            return
+        self.current = name
+
+    def ensure(self, name, loops=-1):
+        """Play name unless it's already the thing playing.
+
+        Called every frame, so a name that failed once just means silence
+        rather than reopening the file (and printing the error) each time.
+        """
+        if self.current != name and self.has(name):
+            if name in self.failed:
+                self.stop()
+            else:
+                self.play(name, loops)
+
+    def stop(self):
+        if self.current in self.tracks:
+            pygame.mixer.music.stop()
+        elif self.channel is not None:
+            self.channel.stop()
+        self.channel = None
+        self.current = None
@@ -0,0 +1,227 @@
+"""Benchmark how long each of c4's full-screen draws takes.
+
+    python bench_render.py                       # every screen, 120 frames each
+    python bench_render.py --screens menu,shop --frames 300
+    python bench_render.py --save-golden golden/ # write one PNG per screen
+    python bench_render.py --check-golden golden/   # exit 1 if any pixel changed
+
+Each screen is a game state (menu, shop, every house room, every cutscene
+mode, a few levels in play, ...) set up on a headless Game that draws into an off-screen Surface.
+For each one the benchmark reports milliseconds per frame (mean and p95) and
+how many Surfaces a frame creates: pygame.Surface() calls plus font renders,
+copies, conversions, subsurfaces and pygame.transform results. Play screens
+also report how many entities view culling skipped in the last frame.
+
+Golden screenshots are taken from a repeatable frame: fresh screen state,
+seeded randomness and a frozen pygame.time.get_ticks(), so an optimisation
+can be checked for pixel equivalence against the PNGs taken before it.
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from c4 import Game, SCREEN_WIDTH, SCREEN_HEIGHT
+
+FROZEN_TICKS = 12345   # get_ticks() while a golden frame is drawn
+CUTSCENE_MODES = (4, 8, 9, 5, 6, 7)
+PLAY_LEVELS = (0, 9, 14, 29)   # Levels drawn in play, from the spawn point
+
+# Functions and methods whose result is a new Surface
+SURFACE_METHODS = {'render', 'copy', 'convert', 'convert_alpha', 'subsurface'}
+
+
+def screens():
+    """name -> (attributes to set on the game, draw method names)."""
+    out = {}
+    for t, scene in ((60, 1), (180, 2), (300, 3)):
+        out[f'intro/{scene}'] = ({'state': 'intro', 'intro_timer': t}, ['draw_intro'])
+    out['menu'] = ({'state': 'menu'}, ['draw_menu'])
+    out['clicker'] = ({'state': 'menu'}, ['draw_clicker'])
+    out['shop'] = ({'state': 'menu', 'shop_open': True}, ['draw_shop'])
+    out['world_map'] = ({'state': 'menu', 'map_open': True}, ['draw_world_map'])
+    for room in ('living', 'bedroom', 'kitchen', 'garden'):
+        out[f'house/{room}'] = ({'state': 'menu', 'house_open': True, 'house_room': room}, ['draw_house'])
+    out['garden'] = ({'state': 'menu', 'house_open': True, 'house_room': 'garden'}, ['draw_garden'])
+    for race_state in ('ready', 'racing', 'done'):
+        out[f'race/{race_state}'] = ({
+            'state': 'menu', 'race_open': True, 'race_state': race_state, 'race_countdown': 90,
+            'race_player_x': 300.0, 'race_cpu_x': 280.0, 'race_timer': 200,
+            'race_player_time': 0, 'race_cpu_time': 0, 'race_result': None, 'race_player_vel': 0.0,
+        }, ['draw_race'])
+    for mode in CUTSCENE_MODES:
+        out[f'cutscene/{mode}'] = ({'state': 'cutscene', 'cutscene_mode': mode, 'cutscene_timer': 200},
+                                   ['draw_cutscene'])
+    out['credits'] = ({'state': 'menu', 'credits_open': True, 'credits_scroll': 0}, ['draw_credits'])
+    out['journal'] = ({'state': 'menu', 'journal_open': True}, ['draw_journal'])
+    out['achievements'] = ({'state': 'menu', 'achievements_open': True}, ['draw_achievements_screen'])
+    for level in PLAY_LEVELS:
+        out[f'play/{level}'] = ({'state': 'playing', 'current_level': level}, ['draw_gameplay'])
+    return out
+
+
+class SurfaceCounter:
+    """Counts Surfaces created while active (Surface() calls and Surface-returning C calls)."""
+    def __init__(self):
+        self.count = 0
+        self.real_surface = pygame.Surface
+
+    def __enter__(self):
+        counter = self
+
+        class CountingSurface(self.real_surface):
+            def __init__(self, *args, **kwargs):
+                counter.count += 1
+                super().__init__(*args, **kwargs)
+
+        pygame.Surface = CountingSurface
+        sys.setprofile(self._profile)
+        return self
+
+    def _profile(self, frame, event, arg):
+        if event != 'c_call':
+            return
+        if getattr(arg, '__module__', None) == 'pygame.transform':
+            self.count += 1
+        elif arg.__name__ in SURFACE_METHODS and isinstance(
+                getattr(arg, '__self__', None), (self.real_surface, pygame.font.Font)):
+            self.count += 1
+
+    def __exit__(self, *exc):
+        sys.setprofile(None)
+        pygame.Surface = self.real_surface
+
+
+def enter(game, attrs, clouds=None):
+    """Put the game on a screen from a clean, repeatable state.
+
+    clouds is the sky as Game() made it; gameplay draws drift the clouds, so
+    play screens start over from a copy of it.
+    """
+    if attrs.get('state') == 'playing':
+        random.seed(0)   # Level objects take their start phases from it
+        game.begin_run(attrs['current_level'], 0)
+        game.weather.reset(0)
+        if clouds is not None:
+            game.clouds = copy.deepcopy(clouds)
+    for flag in ('shop_open', 'map_open', 'house_open', 'race_open', 'credits_open',
+                 'journal_open', 'achievements_open', 'minigame_active'):
+        setattr(game, flag, False)
+    for name, value in attrs.items():
+        setattr(game, name, value)
+    game.particles.clear()
+    game.particles.seed(0)
+    random.seed(0)
+
+
+def draw(game, methods):
+    for name in methods:
+        getattr(game, name)()
+
+
+def golden_frame(game, attrs, methods, clouds=None):
+    enter(game, attrs, clouds)
+    real_ticks = pygame.time.get_ticks
+    pygame.time.get_ticks = lambda: FROZEN_TICKS
+    try:
+        game.screen.fill((0, 0, 0))
+        draw(game, methods)
+    finally:
+        pygame.time.get_ticks = real_ticks
+    return game.screen.copy()
+
+
+def bench_screen(game, attrs, methods, frames, warmup=5, clouds=None):
+    enter(game, attrs, clouds)
+    for _ in range(warmup):
+        draw(game, methods)
+    times = []
+    for _ in range(frames):
+        start = time.perf_counter()
+        draw(game, methods)
+        times.append((time.perf_counter() - start) * 1000)
+    with SurfaceCounter() as counter:
+        for _ in range(5):
+            draw(game, methods)
+    times.sort()
+    return {
+        'ms': sum(times) / len(times),
+        'p95': times[round((len(times) - 1) * 0.95)],
+        'surfaces': counter.count / 5,
+        'culled': game.culled if attrs.get('state') == 'playing' else None,
+    }
+
+
+def golden_path(directory, name):
+    return os.path.join(directory, name.replace('/', '_') + '.png')
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark c4's full-screen draws")
+    parser.add_argument('--screens', help="comma-separated screen names; default all")
+    parser.add_argument('--frames', type=int, default=120, help="timed frames per screen")
+    parser.add_argument('--save-golden', metavar='DIR', help="write a golden PNG per screen")
+    parser.add_argument('--check-golden', metavar='DIR', help="compare against golden PNGs")
+    parser.add_argument('--list', action='store_true', help="list screen names and exit")
+    args = parser.parse_args(argv)
+
+    table = screens()
+    if args.list:
+        print('\n'.join(table))
+        return 0
+    names = args.screens.split(',') if args.screens else list(table)
+    unknown = [n for n in names if n not in table]
+    if unknown:
+        parser.error(f"unknown screen(s): {', '.join(unknown)}")
+
+    random.seed(0)   # Game() scatters the clouds with it
+    game = Game(headless=True)
+    clouds = copy.deepcopy(game.clouds)
+    game.screen = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT))
+    if args.save_golden:
+        os.makedirs(args.save_golden, exist_ok=True)
+
+    status = 0
+    print(f"{'screen':<16} {'ms/frame':>9} {'p95':>7} {'surfaces':>9} {'culled':>7}  golden")
+    for name in names:
+        attrs, methods = table[name]
+        golden = ''
+        if args.save_golden or args.check_golden:
+            shot = golden_frame(game, attrs, methods, clouds)
+            if args.save_golden:
+                pygame.image.save(shot, golden_path(args.save_golden, name))
+                golden = 'saved'
+            if args.check_golden:
+                path = golden_path(args.check_golden, name)
+                if not os.path.exists(path):
+                    golden = 'missing'
+                else:
+                    expected = pygame.image.load(path)
+                    diff = pixel_diff(shot, expected)
+                    golden = 'match' if diff == 0 else f'{diff} px differ'
+                    if diff:
+                        status = 1
+        r = bench_screen(game, attrs, methods, args.frames, clouds=clouds)
+        culled = '-' if r['culled'] is None else r['culled']
+        print(f"{name:<16} {r['ms']:>9.2f} {r['p95']:>7.2f} {r['surfaces']:>9.1f} {culled:>7}  {golden}")
+    pygame.quit()
+    return status
+
+
+def pixel_diff(a, b):
+    """Number of pixels whose RGB differs (every pixel if the sizes differ)."""
+    if a.get_size() != b.get_size():
+        return a.get_width() * a.get_height()
+    ra = pygame.surfarray.pixels3d(a)
+    rb = pygame.surfarray.pixels3d(b)
+    return int((ra != rb).any(axis=2).sum())
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
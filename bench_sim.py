@@ -0,0 +1,176 @@
+"""Benchmark c4's gameplay simulation level by level.
+
+    python bench_sim.py                          # all 30 levels + the tutorial
+    python bench_sim.py --levels 0,9,-1 --ticks 10000
+    python bench_sim.py --save bench_sim.json    # store a baseline
+    python bench_sim.py --baseline bench_sim.json   # compare; exit 1 on regression
+    python bench_sim.py --replay run.c4r         # also bench a recording (keyed level:file)
+
+Every level starts from Game.begin_run() with a fixed seed and is driven by
+headless.py's scripted input (or a replay.py recording) for --ticks ticks;
+if the run ends early (the player finishes the game or gets bounced to the
+intro) it starts over. Two passes are made per level:
+
+- a plain pass, timed (best of --repeat), giving ticks/s and the net number
+  of memory blocks left allocated per tick (a leak shows up here);
+- a tracemalloc pass giving the bytes allocated per tick above what the
+  tick started with (allocation churn) and the peak Python-heap memory, level
+  construction included.
+
+Runs on SDL's dummy video/audio drivers, so any Linux box will do.
+"""
+import argparse
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from headless import advance, scripted_input   # Sets the dummy SDL drivers
+import pygame
+from c4 import Game, GAME_KEYS
+from replay import Replay
+
+TUTORIAL = -1
+
+
+def level_key(level):
+    return 'tutorial' if level == TUTORIAL else str(level)
+
+
+def timed_pass(game, begin, make_inputs):
+    """(ticks, seconds, restarts, net blocks) for one untraced run."""
+    begin(game)
+    gc.collect()
+    blocks = sys.getallocatedblocks()
+    start = time.perf_counter()
+    ticks = 0
+    restarts = 0
+    for tick_input in make_inputs():
+        ticks += 1
+        if not advance(game, tick_input):
+            begin(game)
+            restarts += 1
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    return ticks, elapsed, restarts, sys.getallocatedblocks() - blocks
+
+
+def bench_level(game, begin, make_inputs, repeat=3):
+    """Both passes for one level; begin(game) starts the run from its known state
+    and make_inputs() returns a fresh iterable of TickInputs.
+
+    The timed pass runs repeat times and keeps the fastest, which is the
+    least disturbed by whatever else the machine was doing.
+    """
+    ticks, elapsed, restarts, blocks = timed_pass(game, begin, make_inputs)
+    for _ in range(repeat - 1):
+        elapsed = min(elapsed, timed_pass(game, begin, make_inputs)[1])
+
+    # Traced pass
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    begin(game)
+    peak = tracemalloc.get_traced_memory()[1] - base
+    churn = 0
+    for tick_input in make_inputs():
+        before = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        if not advance(game, tick_input):
+            begin(game)
+        tick_peak = tracemalloc.get_traced_memory()[1]
+        churn += tick_peak - before
+        peak = max(peak, tick_peak - base)
+    tracemalloc.stop()
+
+    return {
+        'ticks': ticks,
+        'ticks_per_s': round(ticks / elapsed if elapsed else float('inf'), 1),
+        'net_blocks_per_tick': round(blocks / ticks, 3),
+        'alloc_kb_per_tick': round(churn / ticks / 1024, 3),
+        'peak_kb': round(peak / 1024, 1),
+        'restarts': restarts,
+    }
+
+
+def compare(results, baseline, max_slowdown, max_growth):
+    """Regressions against a baseline, as readable lines."""
+    regressions = []
+    base_levels = baseline.get('levels', {})
+    for key, r in results.items():
+        b = base_levels.get(key)
+        if not b:
+            continue
+        if r['ticks_per_s'] < b['ticks_per_s'] * (1 - max_slowdown):
+            regressions.append(f"level {key}: {b['ticks_per_s']:.0f} -> {r['ticks_per_s']:.0f} ticks/s")
+        # Small absolute slack so near-zero numbers don't trip on noise
+        for metric, slack in (('alloc_kb_per_tick', 0.5), ('peak_kb', 64), ('net_blocks_per_tick', 0.5)):
+            if r[metric] > b[metric] * (1 + max_growth) + slack:
+                regressions.append(f"level {key}: {metric} {b[metric]} -> {r[metric]}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark c4's simulation per level")
+    parser.add_argument('--levels', help="comma-separated level indexes (-1 = tutorial); default all")
+    parser.add_argument('--ticks', type=int, default=3600, help="ticks per level (scripted input)")
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--jump-every', type=int, default=30)
+    parser.add_argument('--repeat', type=int, default=3, help="timed passes per level; the best counts")
+    parser.add_argument('--replay', action='append', default=[],
+                        help="drive the recording's level with its input instead (repeatable)")
+    parser.add_argument('--baseline', help="baseline JSON to compare against")
+    parser.add_argument('--save', help="write the results as a baseline JSON")
+    parser.add_argument('--max-slowdown', type=float, default=0.10,
+                        help="allowed drop in ticks/s before it counts as a regression")
+    parser.add_argument('--max-growth', type=float, default=0.25,
+                        help="allowed growth in allocations/peak memory")
+    args = parser.parse_args(argv)
+
+    game = Game(headless=True)
+    if args.levels:
+        levels = [int(x) for x in args.levels.split(',')]
+    else:
+        levels = list(range(len(game.levels))) + [TUTORIAL]
+
+    jobs = {}   # key -> (begin, make_inputs)
+    for level in levels:
+        jobs[level_key(level)] = (lambda game, level=level: game.begin_run(level, args.seed), lambda: (
+            scripted_input(t, args.jump_every) for t in range(1, args.ticks + 1)))
+    for path in args.replay:
+        rec = Replay.load(path)
+        # Keyed apart from the scripted run of the same level and from other recordings of it
+        jobs[f"{level_key(rec.level)}:{os.path.basename(path)}"] = (rec.begin, lambda rec=rec: rec.inputs(GAME_KEYS))
+
+    print(f"{'level':>20} {'ticks/s':>9} {'KB/tick':>8} {'blocks/tick':>12} {'peak KB':>8} {'restarts':>8}")
+    results = {}
+    for key, (begin, make_inputs) in jobs.items():
+        r = results[key] = bench_level(game, begin, make_inputs, args.repeat)
+        print(f"{key:>20} {r['ticks_per_s']:>9.0f} {r['alloc_kb_per_tick']:>8.2f} "
+              f"{r['net_blocks_per_tick']:>12.2f} {r['peak_kb']:>8.0f} {r['restarts']:>8}")
+
+    if args.save:
+        with open(args.save, 'w') as f:
+            json.dump({'ticks': args.ticks, 'seed': args.seed, 'levels': results}, f, indent=2)
+        print(f"Baseline written to {args.save}")
+
+    status = 0
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+        if (baseline.get('ticks'), baseline.get('seed')) != (args.ticks, args.seed):
+            print("⚠️ Baseline was recorded with different --ticks/--seed; numbers may not compare")
+        regressions = compare(results, baseline, args.max_slowdown, args.max_growth)
+        for line in regressions:
+            print(f"❌ {line}")
+        if regressions:
+            status = 1
+        else:
+            print(f"✅ No regressions against {args.baseline}")
+    pygame.quit()
+    return status
+
+
+if __name__ == '__main__':
+    raise SystemExit(main())
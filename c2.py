@@ -1,6 +1,11 @@
 import pygame
 import math
 import random
+from collision import PlatformGrid
+from engine import Body, Bullet, Entity, Patroller, follow
+import glow
+from particles import ParticleSystem
+from timestep import FixedTimestep, Interpolator
 
 # Initialize Pygame
 print("Initializing game...")
@@ -38,71 +43,31 @@ CYAN = (100, 200, 200)
 NEON_PINK = (255, 105, 180)
 ORANGE = (255, 165, 0)
 
-class Particle:
-    def __init__(self, x, y, vel_x, vel_y, color, life):
-        self.x = x
-        self.y = y
-        self.vel_x = vel_x
-        self.vel_y = vel_y
-        self.color = color
-        self.life = life
-        self.max_life = life
-    
-    def update(self):
-        self.x += self.vel_x
-        self.y += self.vel_y
-        self.vel_y += 0.2  # Gravity
-        self.life -= 1
-    
-    def draw(self, screen):
-        if self.life > 0:
-            alpha = int(255 * (self.life / self.max_life))
-            size = max(1, int(3 * (self.life / self.max_life)))
-            surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-            color = (*self.color[:3], alpha)
-            pygame.draw.circle(surface, color, (size, size), size)
-            screen.blit(surface, (int(self.x) - size, int(self.y) - size))
-
-class Projectile:
+class Projectile(Bullet):
     def __init__(self, x, y, direction, color=CYAN):
-        self.x = x
-        self.y = y
-        self.width = 10
-        self.height = 5
-        self.vel_x = (PROJECTILE_SPEED if color == CYAN else BOSS_PROJECTILE_SPEED) * direction
+        super().__init__(x, y, 10, 5,
+                         (PROJECTILE_SPEED if color == CYAN else BOSS_PROJECTILE_SPEED) * direction)
         self.color = color
-        self.rect = pygame.Rect(x, y, self.width, self.height)
-    
-    def update(self):
-        self.x += self.vel_x
-        self.rect.x = self.x
     
     def draw(self, screen, camera_x, camera_y):
         pygame.draw.rect(screen, self.color, 
                         (self.x - camera_x, self.y - camera_y, 
                          self.width, self.height))
         # Glow effect
-        glow_surface = pygame.Surface((self.width + 6, self.height + 6), pygame.SRCALPHA)
-        glow_color = (*self.color[:3], 80)
-        pygame.draw.rect(glow_surface, glow_color, (0, 0, self.width + 6, self.height + 6))
-        screen.blit(glow_surface, (self.x - camera_x - 3, self.y - camera_y - 3))
+        screen.blit(glow.rect(self.width + 6, self.height + 6, self.color, 80),
+                    (self.x - camera_x - 3, self.y - camera_y - 3))
 
-class Player:
+class Player(Body):
+    max_fall = 15
+    
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.width = 20
-        self.height = 20
-        self.vel_x = 0
-        self.vel_y = 0
-        self.on_ground = False
+        super().__init__(x, y, 20, 20)
         self.double_jump_available = True
         self.dashing = 0
         self.dash_cooldown = 0
         self.speed_boost = 0
         self.shoot_cooldown = 0
         self.facing_right = True
-        self.rect = pygame.Rect(x, y, self.width, self.height)
         self.invincible_timer = 0
     
     def update(self, platforms, game):
@@ -114,12 +79,12 @@ class Player:
             self.vel_x = DASH_SPEED * (1 if self.facing_right else -1)
             self.dashing -= 1
             if game.frame_count % 3 == 0:
-                game.particles.append(Particle(
+                game.particles.emit(
                     self.x + self.width // 2, self.y + self.height // 2,
                     -self.vel_x * 0.3 + random.uniform(-1, 1),
                     random.uniform(-2, 2),
                     CYAN, 20
-                ))
+                )
         else:
             # Movement
             if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -137,12 +102,10 @@ class Player:
         if keys[pygame.K_LSHIFT] and self.dash_cooldown == 0 and self.dashing == 0:
             self.dashing = DASH_DURATION
             self.dash_cooldown = DASH_COOLDOWN
-            for _ in range(8):
-                game.particles.append(Particle(
-                    self.x + self.width // 2, self.y + self.height // 2,
-                    random.uniform(-3, 3), random.uniform(-3, 3),
-                    CYAN, 25
-                ))
+            game.particles.burst(
+                self.x + self.width // 2, self.y + self.height // 2,
+                8, CYAN, 25, (-3, 3)
+            )
         
         # Shooting
         if keys[pygame.K_LCTRL] and self.shoot_cooldown == 0:
@@ -152,46 +115,13 @@ class Player:
                 direction
             ))
             self.shoot_cooldown = SHOOT_COOLDOWN
-            for _ in range(5):
-                game.particles.append(Particle(
-                    self.x + self.width // 2, self.y + self.height // 2,
-                    direction * random.uniform(2, 4), random.uniform(-1, 1),
-                    CYAN, 15
-                ))
-        
-        # Gravity
-        self.vel_y += GRAVITY
-        self.vel_y = min(self.vel_y, 15)
-        
-        # Horizontal movement
-        self.x += self.vel_x
-        self.rect.x = self.x
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.vel_x > 0:
-                    self.rect.right = platform.left
-                    self.x = self.rect.x
-                elif self.vel_x < 0:
-                    self.rect.left = platform.right
-                    self.x = self.rect.x
-                self.vel_x = 0
-        
-        # Vertical movement
-        self.y += self.vel_y
-        self.rect.y = self.y
-        self.on_ground = False
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.vel_y > 0:
-                    self.rect.bottom = platform.top
-                    self.y = self.rect.y
-                    self.on_ground = True
-                    self.double_jump_available = True
-                    self.vel_y = 0
-                elif self.vel_y < 0:
-                    self.rect.top = platform.bottom
-                    self.y = self.rect.y
-                    self.vel_y = 0
+            game.particles.burst(
+                self.x + self.width // 2, self.y + self.height // 2,
+                5, CYAN, 15, (direction * 2, direction * 4), (-1, 1)
+            )
+        
+        self.fall(GRAVITY)
+        self.move_and_collide(platforms)
         
         # Update timers
         if self.dash_cooldown > 0:
@@ -211,6 +141,9 @@ class Player:
             self.vel_y = DOUBLE_JUMP_STRENGTH
             self.double_jump_available = False
     
+    def landed(self):
+        self.double_jump_available = True
+    
     def draw(self, screen, camera_x, camera_y):
         x = self.x - camera_x
         y = self.y - camera_y
@@ -243,31 +176,13 @@ class Player:
                            (x, y + self.height // 2 + bounce),
                            (x - self.vel_x, y + self.height // 2 + bounce), 3)
 
-class Enemy:
+class Enemy(Patroller):
     def __init__(self, x, y, patrol_distance):
-        self.start_x = x
-        self.x = x
-        self.y = y
-        self.width = 18
-        self.height = 18
-        self.patrol_distance = patrol_distance
-        self.direction = 1
-        self.rect = pygame.Rect(x, y, self.width, self.height)
+        super().__init__(x, y, 18, 18, patrol_distance)
     
     def update(self, platforms):
-        self.x += ENEMY_SPEED * self.direction
-        if abs(self.x - self.start_x) >= self.patrol_distance:
-            self.direction *= -1
-        self.rect.x = self.x
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.direction > 0:
-                    self.rect.right = platform.left
-                    self.x = self.rect.x
-                else:
-                    self.rect.left = platform.right
-                    self.x = self.rect.x
-                self.direction *= -1
+        self.patrol(ENEMY_SPEED)
+        self.bounce_off(platforms, self.width)
     
     def draw(self, screen, camera_x, camera_y):
         wobble = math.sin(pygame.time.get_ticks() * 0.02) * 1
@@ -280,16 +195,12 @@ class Enemy:
         pygame.draw.circle(screen, YELLOW, 
                           (int(self.x - camera_x + 13), int(self.y - camera_y + 5 + wobble)), 2)
 
-class FlyingEnemy:
+class FlyingEnemy(Entity):
     def __init__(self, x, y, patrol_height):
+        super().__init__(x, y, 18, 18)
         self.start_y = y
-        self.x = x
-        self.y = y
-        self.width = 18
-        self.height = 18
         self.patrol_height = patrol_height
         self.direction = 1
-        self.rect = pygame.Rect(x, y, self.width, self.height)
     
     def update(self, platforms=None):
         self.y += FLYING_ENEMY_SPEED * self.direction
@@ -309,37 +220,18 @@ class FlyingEnemy:
         pygame.draw.circle(screen, WHITE, 
                           (int(self.x - camera_x + 12), int(self.y - camera_y + 7 + wobble)), 2)
 
-class Boss:
+class Boss(Patroller):
     def __init__(self, x, y, patrol_distance):
-        self.start_x = x
-        self.x = x
-        self.y = y
-        self.width = 40
-        self.height = 40
-        self.patrol_distance = patrol_distance
-        self.direction = 1
+        super().__init__(x, y, 40, 40, patrol_distance)
         self.health = 20
         self.max_health = 20
         self.shoot_cooldown = BOSS_SHOOT_COOLDOWN
-        self.rect = pygame.Rect(x, y, self.width, self.height)
         self.name = "BOSS"
     
     def update(self, platforms, player, game):
         # Movement
-        self.x += ENEMY_SPEED * self.direction
-        if abs(self.x - self.start_x) >= self.patrol_distance:
-            self.direction *= -1
-        self.rect.x = self.x
-        
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.direction > 0:
-                    self.rect.right = platform.left
-                    self.x = self.rect.x
-                else:
-                    self.rect.left = platform.right
-                    self.x = self.rect.x
-                self.direction *= -1
+        self.patrol(ENEMY_SPEED)
+        self.bounce_off(platforms, self.width)
         
         # Shooting
         if self.shoot_cooldown <= 0:
@@ -350,12 +242,10 @@ class Boss:
                 direction, color=RED
             ))
             self.shoot_cooldown = BOSS_SHOOT_COOLDOWN
-            for _ in range(5):
-                game.particles.append(Particle(
-                    self.x + self.width // 2, self.y + self.height // 2,
-                    direction * random.uniform(1, 3), random.uniform(-1, 1),
-                    RED, 20
-                ))
+            game.particles.burst(
+                self.x + self.width // 2, self.y + self.height // 2,
+                5, RED, 20, (direction * 1, direction * 3), (-1, 1)
+            )
         else:
             self.shoot_cooldown -= 1
     
@@ -454,11 +344,9 @@ class Key:
             float_y = math.sin(pygame.time.get_ticks() * 0.005) * 5
             # Glow
             glow_alpha = int(150 + math.sin(pygame.time.get_ticks() * 0.01) * 100)
-            glow_surface = pygame.Surface((self.width + 10, self.height + 10), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*YELLOW, glow_alpha), 
-                             (self.width // 2 + 5, self.height // 2 + 5), 
-                             self.width // 2 + 5)
-            screen.blit(glow_surface, (self.x - camera_x - 5, self.y - camera_y + float_y - 5))
+            glow.blit_circle(screen, self.x - camera_x + self.width // 2,
+                             self.y - camera_y + float_y + self.height // 2,
+                             self.width // 2 + 5, YELLOW, glow_alpha)
             
             # Key shape
             pygame.draw.circle(screen, YELLOW, 
@@ -477,10 +365,8 @@ class Door:
     def draw(self, screen, camera_x, camera_y):
         # Glow effect
         glow_alpha = int(100 + math.sin(pygame.time.get_ticks() * 0.01) * 50)
-        glow_surface = pygame.Surface((self.width + 10, self.height + 10), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surface, (*GREEN, glow_alpha), 
-                        (0, 0, self.width + 10, self.height + 10))
-        screen.blit(glow_surface, (self.x - camera_x - 5, self.y - camera_y - 5))
+        screen.blit(glow.rect(self.width + 10, self.height + 10, GREEN, glow_alpha),
+                    (self.x - camera_x - 5, self.y - camera_y - 5))
         
         # Door
         pygame.draw.rect(screen, GREEN, 
@@ -495,6 +381,8 @@ class Game:
         pygame.display.set_caption("Cyber Platformer - Your Epic Game!")
         self.clock = pygame.time.Clock()
         self.frame_count = 0
+        self.timestep = FixedTimestep(FPS)  # Gameplay always ticks at 60 Hz
+        self.interp = Interpolator()
         
         # Game state
         self.state = 'menu'  # menu, playing, game_over, victory
@@ -510,7 +398,7 @@ class Game:
         self.power_ups = []
         self.coins = []
         self.spikes = []
-        self.particles = []
+        self.particles = ParticleSystem(gravity=0.2, radius=3, min_radius=1)
         self.key = None
         self.door = None
         self.exit_rect = None
@@ -724,7 +612,7 @@ class Game:
         self.player = Player(spawn_x, spawn_y)
         
         # Load platforms
-        self.platforms = level['platforms']
+        self.platforms = PlatformGrid(level['platforms'])
         
         # Load enemies
         self.enemies = []
@@ -759,7 +647,7 @@ class Game:
         
         # Reset state
         self.projectiles = []
-        self.particles = []
+        self.particles.clear()
         self.key = None
         self.door = None
         self.boss_defeated = False
@@ -767,14 +655,8 @@ class Game:
         self.camera_y = 0
     
     def update_camera(self):
-        target_x = self.player.x - SCREEN_WIDTH // 3
-        target_y = self.player.y - SCREEN_HEIGHT // 2
-        
-        self.camera_x += (target_x - self.camera_x) * 0.1
-        self.camera_y += (target_y - self.camera_y) * 0.1
-        
-        self.camera_x = max(0, self.camera_x)
-        self.camera_y = max(0, min(self.camera_y, 100))
+        self.camera_x = follow(self.camera_x, self.player.x - SCREEN_WIDTH // 3, low=0)
+        self.camera_y = follow(self.camera_y, self.player.y - SCREEN_HEIGHT // 2, low=0, high=100)
     
     def respawn_player(self):
         level = self.levels[self.current_level]
@@ -785,13 +667,10 @@ class Game:
         self.player.vel_y = 0
         self.player.invincible_timer = 120
         
-        for _ in range(20):
-            self.particles.append(Particle(
-                self.player.x + self.player.width // 2, 
-                self.player.y + self.player.height // 2,
-                random.uniform(-4, 4), random.uniform(-4, 4),
-                BLUE, 30
-            ))
+        self.particles.burst(
+            self.player.x + self.player.width // 2, self.player.y + self.player.height // 2,
+            20, BLUE, 30, (-4, 4)
+        )
     
     def draw_background(self):
         # Gradient background
@@ -843,17 +722,14 @@ class Game:
         
         # Particles
         if self.frame_count % 10 == 0:
-            self.particles.append(Particle(
+            self.particles.emit(
                 random.randint(0, SCREEN_WIDTH), 0,
                 random.uniform(-0.5, 0.5), random.uniform(1, 3),
                 random.choice([CYAN, PURPLE, BLUE]), 100
-            ))
+            )
         
-        for particle in self.particles[:]:
-            particle.update()
-            particle.draw(self.screen)
-            if particle.life <= 0 or particle.y > SCREEN_HEIGHT:
-                self.particles.remove(particle)
+        self.particles.update(kill_below=SCREEN_HEIGHT)
+        self.particles.draw(self.screen)
     
     def draw_game(self):
         self.draw_background()
@@ -905,11 +781,7 @@ class Game:
         self.player.draw(self.screen, self.camera_x, self.camera_y)
         
         # Particles
-        for particle in self.particles[:]:
-            particle.update()
-            particle.draw(self.screen)
-            if particle.life <= 0:
-                self.particles.remove(particle)
+        self.particles.draw(self.screen, self.camera_x, self.camera_y)
         
         # HUD
         hud_font = pygame.font.Font(None, 32)
@@ -957,17 +829,14 @@ class Game:
         
         # Celebration particles
         if self.frame_count % 5 == 0:
-            self.particles.append(Particle(
+            self.particles.emit(
                 random.randint(0, SCREEN_WIDTH), 0,
                 random.uniform(-2, 2), random.uniform(2, 5),
                 random.choice([YELLOW, GREEN, CYAN, PURPLE]), 80
-            ))
+            )
         
-        for particle in self.particles[:]:
-            particle.update()
-            particle.draw(self.screen)
-            if particle.life <= 0:
-                self.particles.remove(particle)
+        self.particles.update()
+        self.particles.draw(self.screen)
     
     def handle_collisions(self):
         # Player-enemy collision
@@ -988,33 +857,27 @@ class Game:
                     if projectile.rect.colliderect(enemy.rect):
                         if isinstance(enemy, Boss):
                             enemy.health -= 1
-                            for _ in range(10):
-                                self.particles.append(Particle(
-                                    enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
-                                    random.uniform(-3, 3), random.uniform(-3, 3),
-                                    RED, 25
-                                ))
+                            self.particles.burst(
+                                enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
+                                10, RED, 25, (-3, 3)
+                            )
                             if enemy.health <= 0:
                                 self.enemies.remove(enemy)
                                 self.boss_defeated = True
-                                for _ in range(30):
-                                    self.particles.append(Particle(
-                                        enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
-                                        random.uniform(-5, 5), random.uniform(-5, 5),
-                                        RED, 40
-                                    ))
+                                self.particles.burst(
+                                    enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
+                                    30, RED, 40, (-5, 5)
+                                )
                                 # Drop key
                                 self.key = Key(enemy.x + enemy.width // 2 - 8, 
                                              enemy.y + enemy.height // 2 - 8)
                         else:
                             self.enemies.remove(enemy)
-                            for _ in range(8):
-                                color = RED if isinstance(enemy, Enemy) else GREEN
-                                self.particles.append(Particle(
-                                    enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
-                                    random.uniform(-3, 3), random.uniform(-3, 3),
-                                    color, 25
-                                ))
+                            color = RED if isinstance(enemy, Enemy) else GREEN
+                            self.particles.burst(
+                                enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
+                                8, color, 25, (-3, 3)
+                            )
                         if projectile in self.projectiles:
                             self.projectiles.remove(projectile)
                         break
@@ -1032,24 +895,20 @@ class Game:
                 power_up.collected = True
                 if power_up.type == "speed":
                     self.player.speed_boost = 300
-                for _ in range(15):
-                    self.particles.append(Particle(
-                        power_up.x + power_up.width // 2, power_up.y + power_up.height // 2,
-                        random.uniform(-3, 3), random.uniform(-3, 3),
-                        PURPLE, 30
-                    ))
+                self.particles.burst(
+                    power_up.x + power_up.width // 2, power_up.y + power_up.height // 2,
+                    15, PURPLE, 30, (-3, 3)
+                )
         
         # Coin collection
         for coin in self.coins:
             if not coin.collected and self.player.rect.colliderect(coin.rect):
                 coin.collected = True
                 self.coins_collected += 1
-                for _ in range(10):
-                    self.particles.append(Particle(
-                        coin.x + coin.width // 2, coin.y + coin.height // 2,
-                        random.uniform(-2, 2), random.uniform(-2, 2),
-                        YELLOW, 20
-                    ))
+                self.particles.burst(
+                    coin.x + coin.width // 2, coin.y + coin.height // 2,
+                    10, YELLOW, 20, (-2, 2)
+                )
         
         # Spike collision
         for spike in self.spikes:
@@ -1060,12 +919,10 @@ class Game:
         if self.key and not self.key.collected and self.player.rect.colliderect(self.key.rect):
             self.key.collected = True
             self.door = Door(self.exit_rect.x, self.exit_rect.y - 10)
-            for _ in range(20):
-                self.particles.append(Particle(
-                    self.key.x + self.key.width // 2, self.key.y + self.key.height // 2,
-                    random.uniform(-4, 4), random.uniform(-4, 4),
-                    YELLOW, 35
-                ))
+            self.particles.burst(
+                self.key.x + self.key.width // 2, self.key.y + self.key.height // 2,
+                20, YELLOW, 35, (-4, 4)
+            )
         
         # Door entry
         if self.door and self.player.rect.colliderect(self.door.rect):
@@ -1087,12 +944,42 @@ class Game:
         if self.player.y > 1000:
             self.respawn_player()
     
+    def step(self):
+        # One fixed 1/60 s tick of gameplay
+        self.frame_count += 1
+        self.player.update(self.platforms, self)
+        
+        for enemy in self.enemies:
+            if isinstance(enemy, Boss):
+                enemy.update(self.platforms, self.player, self)
+            elif isinstance(enemy, FlyingEnemy):
+                enemy.update()
+            else:
+                enemy.update(self.platforms)
+        
+        for projectile in self.projectiles:
+            projectile.update()
+        
+        self.handle_collisions()
+        self.update_camera()
+        self.particles.update()
+    
+    def capture_motion(self):
+        # Remember positions before a tick so draw_game() can interpolate
+        self.interp.clear()
+        self.interp.capture([self.player])
+        self.interp.capture(self.enemies)
+        self.interp.capture(self.projectiles)
+        self.interp.capture([self], ('camera_x', 'camera_y'))
+    
     def run(self):
         print("Game started!")
         running = True
         
         while running:
-            self.frame_count += 1
+            if self.state != 'playing':
+                self.frame_count += 1  # Gameplay counts its own ticks in step()
+                self.timestep.reset()
             
             # Events
             for event in pygame.event.get():
@@ -1116,37 +1003,23 @@ class Game:
                             self.player.jump()
                         elif event.key == pygame.K_ESCAPE:
                             self.state = 'menu'
-                            self.particles = []
+                            self.particles.clear()
                     
                     elif self.state == 'victory':
                         if event.key == pygame.K_ESCAPE:
                             self.state = 'menu'
-                            self.particles = []
+                            self.particles.clear()
             
             # Update and draw
             if self.state == 'menu':
                 self.draw_menu()
             
             elif self.state == 'playing':
-                # Update
-                self.player.update(self.platforms, self)
-                
-                for enemy in self.enemies:
-                    if isinstance(enemy, Boss):
-                        enemy.update(self.platforms, self.player, self)
-                    elif isinstance(enemy, FlyingEnemy):
-                        enemy.update()
-                    else:
-                        enemy.update(self.platforms)
-                
-                for projectile in self.projectiles:
-                    projectile.update()
-                
-                self.handle_collisions()
-                self.update_camera()
-                
-                # Draw
-                self.draw_game()
+                for _ in range(self.timestep.advance()):
+                    self.capture_motion()
+                    self.step()
+                with self.interp.blend(self.timestep.alpha):
+                    self.draw_game()
             
             elif self.state == 'victory':
                 self.draw_victory()
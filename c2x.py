@@ -2,6 +2,11 @@ import pygame
 import math
 import random
 import os
+from collision import PlatformGrid
+from engine import Body, Bullet, Entity, follow
+import glow
+from particles import ParticleSystem
+from timestep import FixedTimestep, Interpolator
 
 # Set window position before initializing Pygame
 os.environ['SDL_VIDEO_WINDOW_POS'] = '0,0'
@@ -58,65 +63,25 @@ NEON_PINK = (255, 105, 180)
 NEON_BLUE = (0, 255, 255)
 ORANGE = (255, 165, 0)
 
-class Particle:
-    def __init__(self, x, y, vel_x, vel_y, color, life):
-        self.x = x
-        self.y = y
-        self.vel_x = vel_x
-        self.vel_y = vel_y
-        self.color = color
-        self.life = life
-        self.max_life = life
-    
-    def update(self):
-        self.x += self.vel_x
-        self.y += self.vel_y
-        self.vel_y += 0.2  # Gravity on particles
-        self.life -= 1
-    
-    def draw(self, screen):
-        if self.life > 0:
-            alpha = int(255 * (self.life / self.max_life))
-            size = int(4 * (self.life / self.max_life))
-            if size > 0:
-                surface = pygame.Surface((size * 2, size * 2), pygame.SRCALPHA)
-                color = (*self.color[:3], alpha)
-                pygame.draw.circle(surface, color, (size, size), size)
-                screen.blit(surface, (int(self.x) - size, int(self.y) - size))
-
-class Projectile:
+class Projectile(Bullet):
     def __init__(self, x, y, direction, color=CYAN):
-        self.x = x
-        self.y = y
-        self.width = 8
-        self.height = 4
-        self.vel_x = (PROJECTILE_SPEED if color == CYAN else BOSS_PROJECTILE_SPEED) * direction
+        super().__init__(x, y, 8, 4,
+                         (PROJECTILE_SPEED if color == CYAN else BOSS_PROJECTILE_SPEED) * direction)
         self.color = color
-        self.rect = pygame.Rect(x, y, self.width, self.height)
-    
-    def update(self):
-        self.x += self.vel_x
-        self.rect.x = self.x
     
     def draw(self, screen, camera_x, camera_y):
         pygame.draw.rect(screen, self.color, 
                         (self.x - camera_x, self.y - camera_y, 
                          self.width, self.height))
         # Add glow effect
-        glow_color = (*self.color[:3], 100)
-        glow_surface = pygame.Surface((self.width + 4, self.height + 4), pygame.SRCALPHA)
-        pygame.draw.rect(glow_surface, glow_color, (0, 0, self.width + 4, self.height + 4))
-        screen.blit(glow_surface, (self.x - camera_x - 2, self.y - camera_y - 2))
+        screen.blit(glow.rect(self.width + 4, self.height + 4, self.color, 100),
+                    (self.x - camera_x - 2, self.y - camera_y - 2))
 
-class Player:
+class Player(Body):
+    max_fall = 15
+    
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.width = 20
-        self.height = 20
-        self.vel_x = 0
-        self.vel_y = 0
-        self.on_ground = False
+        super().__init__(x, y, 20, 20)
         self.double_jump_available = True
         self.dashing = 0
         self.dash_cooldown = 0
@@ -124,7 +89,6 @@ class Player:
         self.shield = 0
         self.shoot_cooldown = 0
         self.facing_right = True
-        self.rect = pygame.Rect(x, y, self.width, self.height)
         self.invincible = 0
     
     def update(self, platforms, game):
@@ -137,12 +101,12 @@ class Player:
             self.dashing -= 1
             # Dash particles
             if game.frame_count % 2 == 0:
-                game.particles.append(Particle(
+                game.particles.emit(
                     self.x + self.width // 2, self.y + self.height // 2,
                     -self.vel_x * 0.3 + random.uniform(-1, 1),
                     random.uniform(-2, 2),
                     NEON_BLUE, 20
-                ))
+                )
         else:
             # Movement
             if keys[pygame.K_LEFT] or keys[pygame.K_a]:
@@ -160,13 +124,11 @@ class Player:
         if keys[pygame.K_LSHIFT] and self.dash_cooldown == 0 and self.dashing == 0 and abs(self.vel_x) > 0:
             self.dashing = DASH_DURATION
             self.dash_cooldown = DASH_COOLDOWN
-            for _ in range(10):
-                game.particles.append(Particle(
-                    self.x + self.width // 2, self.y + self.height // 2,
-                    -self.vel_x * 0.2 + random.uniform(-2, 2),
-                    random.uniform(-3, 3),
-                    NEON_BLUE, 25
-                ))
+            game.particles.burst(
+                self.x + self.width // 2, self.y + self.height // 2,
+                10, NEON_BLUE, 25,
+                (-self.vel_x * 0.2 - 2, -self.vel_x * 0.2 + 2), (-3, 3)
+            )
         
         # Shooting
         if keys[pygame.K_LCTRL] and self.shoot_cooldown == 0:
@@ -176,47 +138,13 @@ class Player:
                 direction
             ))
             self.shoot_cooldown = SHOOT_COOLDOWN
-            for _ in range(5):
-                game.particles.append(Particle(
-                    self.x + self.width // 2, self.y + self.height // 2,
-                    direction * random.uniform(2, 4), random.uniform(-1, 1),
-                    CYAN, 15
-                ))
+            game.particles.burst(
+                self.x + self.width // 2, self.y + self.height // 2,
+                5, CYAN, 15, (direction * 2, direction * 4), (-1, 1)
+            )
         
-        # Gravity
-        self.vel_y += GRAVITY
-        if self.vel_y > 15:
-            self.vel_y = 15
-        
-        # Horizontal collision
-        self.x += self.vel_x
-        self.rect.x = self.x
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.vel_x > 0:
-                    self.rect.right = platform.left
-                    self.x = self.rect.x
-                elif self.vel_x < 0:
-                    self.rect.left = platform.right
-                    self.x = self.rect.x
-                self.vel_x = 0
-        
-        # Vertical collision
-        self.y += self.vel_y
-        self.rect.y = self.y
-        self.on_ground = False
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.vel_y > 0:
-                    self.rect.bottom = platform.top
-                    self.y = self.rect.y
-                    self.on_ground = True
-                    self.double_jump_available = True
-                    self.vel_y = 0
-                elif self.vel_y < 0:
-                    self.rect.top = platform.bottom
-                    self.y = self.rect.y
-                    self.vel_y = 0
+        self.fall(GRAVITY)
+        self.move_and_collide(platforms)
         
         # Update cooldowns
         if self.dash_cooldown > 0:
@@ -238,6 +166,9 @@ class Player:
             self.vel_y = DOUBLE_JUMP_STRENGTH
             self.double_jump_available = False
     
+    def landed(self):
+        self.double_jump_available = True
+    
     def draw(self, screen, camera_x, camera_y):
         x = self.x - camera_x
         y = self.y - camera_y
@@ -245,11 +176,8 @@ class Player:
         # Shield effect
         if self.shield > 0:
             shield_alpha = int(150 + math.sin(pygame.time.get_ticks() * 0.01) * 50)
-            shield_surface = pygame.Surface((self.width + 8, self.height + 8), pygame.SRCALPHA)
-            pygame.draw.circle(shield_surface, (*CYAN, shield_alpha), 
-                             (self.width // 2 + 4, self.height // 2 + 4), 
-                             self.width // 2 + 4)
-            screen.blit(shield_surface, (x - 4, y - 4))
+            glow.blit_circle(screen, x + self.width // 2, y + self.height // 2,
+                             self.width // 2 + 4, CYAN, shield_alpha)
         
         # Invincibility flash
         if self.invincible > 0 and self.invincible % 10 < 5:
@@ -273,16 +201,12 @@ class Player:
             pygame.draw.rect(trail_surface, (*color, trail_alpha), (0, 0, self.width, self.height))
             screen.blit(trail_surface, (x - self.vel_x * 2, y))
 
-class Enemy:
+class Enemy(Entity):
     def __init__(self, x, y, patrol_start, patrol_end):
-        self.x = x
-        self.y = y
-        self.width = 20
-        self.height = 20
+        super().__init__(x, y, 20, 20)
         self.vel_x = ENEMY_SPEED
         self.patrol_start = patrol_start
         self.patrol_end = patrol_end
-        self.rect = pygame.Rect(x, y, self.width, self.height)
     
     def update(self, platforms):
         self.x += self.vel_x
@@ -298,46 +222,19 @@ class Enemy:
         pygame.draw.circle(screen, WHITE, (x + 6, y + 7), 2)
         pygame.draw.circle(screen, WHITE, (x + 14, y + 7), 2)
 
-class ChasingEnemy:
+class ChasingEnemy(Body):
+    max_fall = 15
+    
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.width = 20
-        self.height = 20
-        self.rect = pygame.Rect(x, y, self.width, self.height)
-        self.vel_y = 0
-        self.on_ground = False
+        super().__init__(x, y, 20, 20)
     
     def update(self, player, platforms):
-        # Chase player
+        # Chase player (runs through walls; only the floor stops it)
+        self.vel_x = 0
         if abs(player.x - self.x) < 400:
-            if player.x > self.x:
-                self.x += CHASING_ENEMY_SPEED
-            else:
-                self.x -= CHASING_ENEMY_SPEED
-        
-        # Gravity
-        self.vel_y += GRAVITY
-        if self.vel_y > 15:
-            self.vel_y = 15
-        
-        self.y += self.vel_y
-        self.rect.x = self.x
-        self.rect.y = self.y
-        
-        # Platform collision
-        self.on_ground = False
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.vel_y > 0:
-                    self.rect.bottom = platform.top
-                    self.y = self.rect.y
-                    self.on_ground = True
-                    self.vel_y = 0
-                elif self.vel_y < 0:
-                    self.rect.top = platform.bottom
-                    self.y = self.rect.y
-                    self.vel_y = 0
+            self.vel_x = CHASING_ENEMY_SPEED if player.x > self.x else -CHASING_ENEMY_SPEED
+        self.fall(GRAVITY)
+        self.move_and_collide(platforms, solid_x=False)
     
     def draw(self, screen, camera_x, camera_y):
         x = self.x - camera_x
@@ -349,16 +246,12 @@ class ChasingEnemy:
         pygame.draw.circle(screen, RED, (x + 7, y + 7), 1)
         pygame.draw.circle(screen, RED, (x + 15, y + 7), 1)
 
-class FlyingEnemy:
+class FlyingEnemy(Entity):
     def __init__(self, x, y, patrol_start_y, patrol_end_y):
-        self.x = x
-        self.y = y
-        self.width = 20
-        self.height = 20
+        super().__init__(x, y, 20, 20)
         self.vel_y = FLYING_ENEMY_SPEED
         self.patrol_start_y = patrol_start_y
         self.patrol_end_y = patrol_end_y
-        self.rect = pygame.Rect(x, y, self.width, self.height)
     
     def update(self):
         self.y += self.vel_y
@@ -378,16 +271,12 @@ class FlyingEnemy:
         pygame.draw.circle(screen, WHITE, (x + 8, y + 8), 2)
         pygame.draw.circle(screen, WHITE, (x + 12, y + 8), 2)
 
-class Boss:
+class Boss(Entity):
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.width = 60
-        self.height = 60
+        super().__init__(x, y, 60, 60)
         self.health = 30
         self.max_health = 30
         self.shoot_cooldown = 0
-        self.rect = pygame.Rect(x, y, self.width, self.height)
         self.phase = 1
     
     def update(self, platforms, player, game):
@@ -443,9 +332,7 @@ class Boss:
         # Phase 2 glow
         if self.phase == 2:
             glow_alpha = int(100 + math.sin(pygame.time.get_ticks() * 0.01) * 50)
-            glow_surface = pygame.Surface((self.width + 20, self.height + 20), pygame.SRCALPHA)
-            pygame.draw.rect(glow_surface, (*NEON_PINK, glow_alpha), (0, 0, self.width + 20, self.height + 20))
-            screen.blit(glow_surface, (x - 10, y - 10))
+            screen.blit(glow.rect(self.width + 20, self.height + 20, NEON_PINK, glow_alpha), (x - 10, y - 10))
 
 class PowerUp:
     def __init__(self, x, y, power_type):
@@ -470,10 +357,8 @@ class PowerUp:
             
             # Glow effect
             glow_alpha = int(100 + math.sin(pygame.time.get_ticks() * 0.01) * 50)
-            glow_surface = pygame.Surface((self.width + 10, self.height + 10), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*color, glow_alpha), 
-                             (self.width // 2 + 5, self.height // 2 + 5), self.width // 2 + 5)
-            screen.blit(glow_surface, (x - 5, y - 5))
+            glow.blit_circle(screen, x + self.width // 2, y + self.height // 2,
+                             self.width // 2 + 5, color, glow_alpha)
             
             # Power-up
             pygame.draw.circle(screen, color, (x + self.width // 2, y + self.height // 2), self.width // 2)
@@ -509,10 +394,8 @@ class Key:
             
             # Glow
             glow_alpha = int(150 + math.sin(pygame.time.get_ticks() * 0.01) * 100)
-            glow_surface = pygame.Surface((self.width + 10, self.height + 10), pygame.SRCALPHA)
-            pygame.draw.circle(glow_surface, (*YELLOW, glow_alpha), 
-                             (self.width // 2 + 5, self.height // 2 + 5), self.width // 2 + 5)
-            screen.blit(glow_surface, (x - 5, y - 5))
+            glow.blit_circle(screen, x + self.width // 2, y + self.height // 2,
+                             self.width // 2 + 5, YELLOW, glow_alpha)
             
             # Key
             pygame.draw.circle(screen, YELLOW, (x + 4, y + 4), 3)
@@ -543,9 +426,7 @@ class Door:
         else:
             # Glow when unlocked
             glow_alpha = int(100 + math.sin(pygame.time.get_ticks() * 0.01) * 50)
-            glow_surface = pygame.Surface((self.width + 10, self.height + 10), pygame.SRCALPHA)
-            pygame.draw.rect(glow_surface, (*GREEN, glow_alpha), (0, 0, self.width + 10, self.height + 10))
-            screen.blit(glow_surface, (x - 5, y - 5))
+            screen.blit(glow.rect(self.width + 10, self.height + 10, GREEN, glow_alpha), (x - 5, y - 5))
 
 class Game:
     def __init__(self):
@@ -553,6 +434,8 @@ class Game:
         pygame.display.set_caption("Cyber Platformer 2X - Enhanced Edition")
         self.clock = pygame.time.Clock()
         self.frame_count = 0
+        self.timestep = FixedTimestep(FPS)  # Gameplay always ticks at 60 Hz
+        self.interp = Interpolator()
         
         # Game state
         self.state = 'menu'  # 'menu', 'playing', 'tutorial', 'victory', 'game_over'
@@ -567,7 +450,7 @@ class Game:
         self.enemies = []
         self.projectiles = []
         self.power_ups = []
-        self.particles = []
+        self.particles = ParticleSystem(gravity=0.2, radius=4, min_radius=0)
         self.key = None
         self.door = None
         
@@ -689,7 +572,7 @@ class Game:
         self.player = Player(spawn_x, spawn_y)
         
         # Load platforms
-        self.platforms = level['platforms']
+        self.platforms = PlatformGrid(level['platforms'])
         
         # Load enemies
         self.enemies = []
@@ -723,7 +606,7 @@ class Game:
         
         # Clear projectiles and particles
         self.projectiles = []
-        self.particles = []
+        self.particles.clear()
         
         # Reset camera
         self.camera_x = 0
@@ -731,15 +614,8 @@ class Game:
     
     def update_camera(self):
         """Update camera to follow player"""
-        target_x = self.player.x - SCREEN_WIDTH // 3
-        target_y = self.player.y - SCREEN_HEIGHT // 2
-        
-        self.camera_x += (target_x - self.camera_x) * 0.1
-        self.camera_y += (target_y - self.camera_y) * 0.1
-        
-        # Keep camera in bounds
-        self.camera_x = max(0, self.camera_x)
-        self.camera_y = max(0, min(self.camera_y, 200))
+        self.camera_x = follow(self.camera_x, self.player.x - SCREEN_WIDTH // 3, low=0)
+        self.camera_y = follow(self.camera_y, self.player.y - SCREEN_HEIGHT // 2, low=0, high=200)
     
     def handle_collisions(self):
         """Handle all game collisions"""
@@ -749,13 +625,10 @@ class Game:
                 if self.player.shield > 0:
                     self.player.shield = 0
                     self.player.invincible = 60
-                    for _ in range(15):
-                        self.particles.append(Particle(
-                            self.player.x + self.player.width // 2, 
-                            self.player.y + self.player.height // 2,
-                            random.uniform(-3, 3), random.uniform(-3, 3),
-                            CYAN, 25
-                        ))
+                    self.particles.burst(
+                        self.player.x + self.player.width // 2, self.player.y + self.player.height // 2,
+                        15, CYAN, 25, (-3, 3)
+                    )
                 else:
                     self.respawn_player()
         
@@ -772,33 +645,27 @@ class Game:
                     if projectile.rect.colliderect(enemy.rect):
                         if isinstance(enemy, Boss):
                             enemy.health -= 1
-                            for _ in range(10):
-                                self.particles.append(Particle(
-                                    enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
-                                    random.uniform(-3, 3), random.uniform(-3, 3),
-                                    NEON_PINK, 25
-                                ))
+                            self.particles.burst(
+                                enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
+                                10, NEON_PINK, 25, (-3, 3)
+                            )
                             if enemy.health <= 0:
                                 self.enemies.remove(enemy)
                                 self.score += 1000
-                                for _ in range(30):
-                                    self.particles.append(Particle(
-                                        enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
-                                        random.uniform(-5, 5), random.uniform(-5, 5),
-                                        NEON_PINK, 40
-                                    ))
+                                self.particles.burst(
+                                    enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
+                                    30, NEON_PINK, 40, (-5, 5)
+                                )
                                 # Drop key
                                 self.key = Key(enemy.x + enemy.width // 2 - 8, enemy.y + enemy.height // 2 - 8)
                         else:
                             self.enemies.remove(enemy)
                             self.score += 100
-                            for _ in range(8):
-                                color = RED if isinstance(enemy, Enemy) else GREEN if isinstance(enemy, FlyingEnemy) else PURPLE
-                                self.particles.append(Particle(
-                                    enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
-                                    random.uniform(-3, 3), random.uniform(-3, 3),
-                                    color, 25
-                                ))
+                            color = RED if isinstance(enemy, Enemy) else GREEN if isinstance(enemy, FlyingEnemy) else PURPLE
+                            self.particles.burst(
+                                enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
+                                8, color, 25, (-3, 3)
+                            )
                         if projectile in self.projectiles:
                             self.projectiles.remove(projectile)
                         break
@@ -809,13 +676,10 @@ class Game:
                     if self.player.shield > 0:
                         self.player.shield = 0
                         self.player.invincible = 60
-                        for _ in range(15):
-                            self.particles.append(Particle(
-                                self.player.x + self.player.width // 2, 
-                                self.player.y + self.player.height // 2,
-                                random.uniform(-3, 3), random.uniform(-3, 3),
-                                CYAN, 25
-                            ))
+                        self.particles.burst(
+                            self.player.x + self.player.width // 2, self.player.y + self.player.height // 2,
+                            15, CYAN, 25, (-3, 3)
+                        )
                     else:
                         self.respawn_player()
                     if projectile in self.projectiles:
@@ -831,25 +695,21 @@ class Game:
                 elif power_up.power_type == 'shield':
                     self.player.shield = SHIELD_DURATION
                 
-                for _ in range(15):
-                    color = YELLOW if power_up.power_type == 'speed' else CYAN
-                    self.particles.append(Particle(
-                        power_up.x + power_up.width // 2, power_up.y + power_up.height // 2,
-                        random.uniform(-3, 3), random.uniform(-3, 3),
-                        color, 30
-                    ))
+                color = YELLOW if power_up.power_type == 'speed' else CYAN
+                self.particles.burst(
+                    power_up.x + power_up.width // 2, power_up.y + power_up.height // 2,
+                    15, color, 30, (-3, 3)
+                )
         
         # Key collection
         if self.key and not self.key.collected and self.player.rect.colliderect(self.key.rect):
             self.key.collected = True
             self.door.locked = False
             self.score += 500
-            for _ in range(20):
-                self.particles.append(Particle(
-                    self.key.x + self.key.width // 2, self.key.y + self.key.height // 2,
-                    random.uniform(-4, 4), random.uniform(-4, 4),
-                    YELLOW, 35
-                ))
+            self.particles.burst(
+                self.key.x + self.key.width // 2, self.key.y + self.key.height // 2,
+                20, YELLOW, 35, (-4, 4)
+            )
         
         # Door entry
         if not self.door.locked and self.player.rect.colliderect(self.door.rect):
@@ -872,13 +732,10 @@ class Game:
         self.player.invincible = 120
         self.score = max(0, self.score - 100)
         
-        for _ in range(20):
-            self.particles.append(Particle(
-                self.player.x + self.player.width // 2, 
-                self.player.y + self.player.height // 2,
-                random.uniform(-4, 4), random.uniform(-4, 4),
-                BLUE, 30
-            ))
+        self.particles.burst(
+            self.player.x + self.player.width // 2, self.player.y + self.player.height // 2,
+            20, BLUE, 30, (-4, 4)
+        )
     
     def draw_menu(self):
         """Draw main menu"""
@@ -942,17 +799,14 @@ class Game:
         
         # Animated background particles
         for _ in range(2):
-            self.particles.append(Particle(
+            self.particles.emit(
                 random.randint(0, SCREEN_WIDTH), 0,
                 random.uniform(-0.5, 0.5), random.uniform(1, 3),
                 random.choice([NEON_BLUE, CYAN, PURPLE]), 100
-            ))
+            )
         
-        for particle in self.particles[:]:
-            particle.update()
-            particle.draw(self.screen)
-            if particle.life <= 0 or particle.y > SCREEN_HEIGHT:
-                self.particles.remove(particle)
+        self.particles.update(kill_below=SCREEN_HEIGHT)
+        self.particles.draw(self.screen)
     
     def draw_game(self):
         """Draw game scene"""
@@ -972,12 +826,10 @@ class Game:
         
         # Draw key
         if self.key:
-            self.key.update()
             self.key.draw(self.screen, self.camera_x, self.camera_y)
         
         # Draw power-ups
         for power_up in self.power_ups:
-            power_up.update()
             power_up.draw(self.screen, self.camera_x, self.camera_y)
         
         # Draw enemies
@@ -992,11 +844,7 @@ class Game:
         self.player.draw(self.screen, self.camera_x, self.camera_y)
         
         # Draw particles
-        for particle in self.particles[:]:
-            particle.update()
-            particle.draw(self.screen)
-            if particle.life <= 0:
-                self.particles.remove(particle)
+        self.particles.draw(self.screen, self.camera_x, self.camera_y)
         
         # Draw HUD
         hud_font = pygame.font.Font(None, 32)
@@ -1055,23 +903,57 @@ class Game:
         
         # Celebration particles
         for _ in range(3):
-            self.particles.append(Particle(
+            self.particles.emit(
                 random.randint(0, SCREEN_WIDTH), 0,
                 random.uniform(-2, 2), random.uniform(2, 5),
                 random.choice([YELLOW, GREEN, CYAN, NEON_BLUE]), 80
-            ))
+            )
+        
+        self.particles.update()
+        self.particles.draw(self.screen)
+    
+    def step(self):
+        """Advance gameplay by one fixed 1/60 s tick"""
+        self.frame_count += 1
+        self.player.update(self.platforms, self)
+        
+        for enemy in self.enemies:
+            if isinstance(enemy, Boss):
+                enemy.update(self.platforms, self.player, self)
+            elif isinstance(enemy, ChasingEnemy):
+                enemy.update(self.player, self.platforms)
+            elif isinstance(enemy, FlyingEnemy):
+                enemy.update()
+            else:
+                enemy.update(self.platforms)
+        
+        for projectile in self.projectiles:
+            projectile.update()
         
-        for particle in self.particles[:]:
-            particle.update()
-            particle.draw(self.screen)
-            if particle.life <= 0:
-                self.particles.remove(particle)
+        if self.key:
+            self.key.update()
+        for power_up in self.power_ups:
+            power_up.update()
+        
+        self.handle_collisions()
+        self.update_camera()
+        self.particles.update()
+    
+    def capture_motion(self):
+        """Remember positions before a tick so draw_game() can interpolate"""
+        self.interp.clear()
+        self.interp.capture([self.player])
+        self.interp.capture(self.enemies)
+        self.interp.capture(self.projectiles)
+        self.interp.capture([self], ('camera_x', 'camera_y'))
     
     def run(self):
         """Main game loop"""
         running = True
         while running:
-            self.frame_count += 1
+            if self.state != 'playing':
+                self.frame_count += 1  # Gameplay counts its own ticks in step()
+                self.timestep.reset()
             
             # Event handling
             for event in pygame.event.get():
@@ -1096,37 +978,23 @@ class Game:
                             self.player.jump()
                         elif event.key == pygame.K_ESCAPE:
                             self.state = 'menu'
-                            self.particles = []
+                            self.particles.clear()
                     
                     elif self.state == 'victory':
                         if event.key == pygame.K_ESCAPE:
                             self.state = 'menu'
-                            self.particles = []
+                            self.particles.clear()
             
             # Game logic
             if self.state == 'menu':
                 self.draw_menu()
             
             elif self.state == 'playing':
-                # Update game objects
-                self.player.update(self.platforms, self)
-                
-                for enemy in self.enemies:
-                    if isinstance(enemy, Boss):
-                        enemy.update(self.platforms, self.player, self)
-                    elif isinstance(enemy, ChasingEnemy):
-                        enemy.update(self.player, self.platforms)
-                    elif isinstance(enemy, FlyingEnemy):
-                        enemy.update()
-                    else:
-                        enemy.update(self.platforms)
-                
-                for projectile in self.projectiles:
-                    projectile.update()
-                
-                self.handle_collisions()
-                self.update_camera()
-                self.draw_game()
+                for _ in range(self.timestep.advance()):
+                    self.capture_motion()
+                    self.step()
+                with self.interp.blend(self.timestep.alpha):
+                    self.draw_game()
             
             elif self.state == 'victory':
                 self.draw_victory()
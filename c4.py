@@ -3,6 +3,22 @@ import math
 import random
 import json
 import os
+from collections import OrderedDict
+from audio import AudioManager
+from collision import PlatformGrid, SpatialIndex
+from engine import Body, Bullet, Entity, Patroller, follow
+import glow
+from labels import Banner, LabelPool
+from minimap import MiniMap
+from particles import ParticleSystem
+from profiler import Profiler
+from savewriter import SaveWriter
+from snapshot import LevelSnapshot
+from sprites import SpriteSheet
+from synth import Synth
+from tiles import StaticLayer
+from timestep import FixedTimestep, Interpolator
+from weather import Weather
 
 # Initialize Pygame
 pygame.init()
@@ -18,6 +34,30 @@ PLAYER_SPEED = 5
 ENEMY_SPEED = 2
 BOSS_SPEED = 1.5
 PROJECTILE_SPEED = 5
+PARTICLE_BUDGET = 1000  # Live particles, ever; the oldest make room for new ones
+PARTICLE_CAPS = {'dash': 60, 'sparks': 400, 'boss': 500, 'power_up': 200, 'ambient': 300}
+CULL_MARGIN = 64  # Entities this far outside the screen still get drawn (glows, health bars)
+SFX_TONES = {  # name -> (freq Hz, seconds, volume, wave), synthesised by synth.py
+    'jump': (440, 0.12, 0.3, 'sine'), 'shoot': (880, 0.07, 0.2, 'square'),
+    'coin': (660, 0.10, 0.3, 'sine'), 'hit': (150, 0.18, 0.4, 'noise'),
+    'death': (200, 0.35, 0.4, 'sine'), 'gem': (880, 0.15, 0.3, 'sine'),
+    'powerup': (523, 0.20, 0.4, 'sine'),
+}
+CUTSCENES = {  # Next level index -> cutscene shown once before it
+    5: 4,    # After level 5 flying boss: Gas station
+    6: 8,    # After level 6: The Long Road
+    8: 9,    # After level 8: Desert gas station
+    10: 5,   # After level 10 boss: Confrontation
+    15: 6,   # After level 15: Enter the Woods
+    29: 7,   # Before level 30: Final boss
+}
+COIN_NOTES = (0, 2, 4, 5, 7, 9, 11, 12)  # Semitones up; each coin in a level plays the next one
+PROFILED_METHODS = ('step', 'update_camera', 'check_achievements', 'load_level')  # Besides every draw_*
+HAT_BOUNDS = (-4, -27, 24, 8)  # Box around (px, py) that _draw_hat_at draws in
+LEVEL_CACHE_SIZE = 4  # Built levels kept around; older ones are rebuilt from scratch when revisited
+MINI_MAP_SIZE = (200, 150)  # Corner map; its moving markers are redrawn every 4th frame
+WEATHER_DROPS = {'rain': 3000, 'snow': 1200}  # Drops on screen in rainy and snowy levels
+FLOATY_TEXT_POOL = 64  # Floaty texts on screen at once; past this the nearest to fading out make way
 
 # Colors
 WHITE = (255, 255, 255)
@@ -34,6 +74,132 @@ ORANGE = (240, 140, 40)
 BROWN = (140, 80, 40)
 PLATFORM_COLOR = BLACK  # Platforms are BLACK!
 
+class FontCache:
+    """Loads each (face, size) once and keeps an LRU of rendered text surfaces.
+
+    Surfaces from render() are shared between callers, so don't set_alpha or
+    draw on them - use font.render() directly for text that gets faded.
+    """
+    def __init__(self, text_budget=4 * 1024 * 1024):
+        self.fonts = {}
+        self.text = OrderedDict()
+        self.text_budget = text_budget
+        self.text_bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, size, face=None):
+        key = (face, int(size))
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.Font(face, int(size))
+            self.fonts[key] = font
+        return font
+
+    def sys(self, name, size):
+        key = ('sys', name, int(size))
+        font = self.fonts.get(key)
+        if font is None:
+            font = pygame.font.SysFont(name, int(size))
+            self.fonts[key] = font
+        return font
+
+    def render(self, font, text, antialias, color):
+        key = (font, text, antialias, tuple(color))
+        surf = self.text.get(key)
+        if surf is not None:
+            self.hits += 1
+            self.text.move_to_end(key)
+            return surf
+        self.misses += 1
+        surf = font.render(text, antialias, color)
+        self.text[key] = surf
+        self.text_bytes += surf.get_width() * surf.get_height() * surf.get_bytesize()
+        while self.text_bytes > self.text_budget and len(self.text) > 1:
+            _, old = self.text.popitem(last=False)
+            self.text_bytes -= old.get_width() * old.get_height() * old.get_bytesize()
+        return surf
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {
+            'fonts': len(self.fonts),
+            'texts': len(self.text),
+            'bytes': self.text_bytes,
+            'budget': self.text_budget,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+        }
+
+    def report(self):
+        st = self.stats()
+        return (f"🔤 Fonts: {st['fonts']} loaded, {st['texts']} texts cached "
+                f"({st['bytes'] / 1024:.0f} / {st['budget'] / 1024:.0f} KB), "
+                f"hit rate {st['hit_rate'] * 100:.1f}%")
+
+    def summary(self):
+        """report() short enough for a line of the F3 overlay."""
+        st = self.stats()
+        return (f"fonts  {st['texts']} texts  {st['bytes'] / 1024:.0f}/{st['budget'] / 1024:.0f} KB  "
+                f"hit {st['hit_rate'] * 100:.1f}%")
+
+FONTS = FontCache()
+
+# Every key the gameplay simulation reads
+GAME_KEYS = (
+    pygame.K_LEFT, pygame.K_RIGHT, pygame.K_UP, pygame.K_DOWN,
+    pygame.K_a, pygame.K_d, pygame.K_w, pygame.K_s,
+    pygame.K_SPACE, pygame.K_LSHIFT, pygame.K_RSHIFT, pygame.K_LCTRL, pygame.K_RCTRL,
+)
+
+class TickInput:
+    """Keyboard input for one simulation tick: keys held down plus keys newly pressed.
+
+    Indexing works like pygame.key.get_pressed(), so update code can take either.
+    """
+    def __init__(self, held=(), pressed=()):
+        self.held = frozenset(held)
+        self.pressed = frozenset(pressed)
+
+    def __getitem__(self, key):
+        return key in self.held
+
+    @classmethod
+    def capture(cls, pressed=()):
+        """Snapshot the real keyboard, keeping only the keys gameplay cares about."""
+        keys = pygame.key.get_pressed()
+        return cls([k for k in GAME_KEYS if keys[k]], [k for k in pressed if k in GAME_KEYS])
+
+class LevelCache:
+    """The game's levels, each built only when first indexed.
+
+    Holds one factory per level (called with the level's own RNG) and keeps
+    the most recently used built levels in an LRU, so startup and memory stay
+    flat however many levels there are. Indexing and len() work like the list
+    of level dicts it replaces.
+    """
+    def __init__(self, builders, seed, size=LEVEL_CACHE_SIZE):
+        self.builders = builders
+        self.seed = seed
+        self.size = size
+        self.built = OrderedDict()   # index -> level dict, LRU order
+        self.builds = 0
+
+    def __len__(self):
+        return len(self.builders)
+
+    def __getitem__(self, index):
+        level = self.built.get(index)
+        if level is not None:
+            self.built.move_to_end(index)
+            return level
+        # Seeded per level, so a level comes out the same whatever was built before it
+        level = self.builders[index](random.Random(f"{self.seed}:{index}"))
+        self.builds += 1
+        self.built[index] = level
+        while len(self.built) > self.size:
+            self.built.popitem(last=False)
+        return level
+
 class MovingPlatform:
     def __init__(self, x, y, width, height, move_x_range=0, move_y_range=0, speed=2):
         self.start_x = x
@@ -90,40 +256,14 @@ class MovingPlatform:
                         (self.x - camera_x, self.y - camera_y, 
                          self.width, self.height), 2)
 
-class Particle:
-    def __init__(self, x, y, vel_x, vel_y, color, life):
-        self.x = x
-        self.y = y
-        self.vel_x = vel_x
-        self.vel_y = vel_y
-        self.color = color
-        self.life = life
-        self.max_life = life
-    
-    def update(self):
-        self.x += self.vel_x
-        self.y += self.vel_y
-        self.life -= 1
+class Player(Body):
+    # Frames are ('body', facing_right, leg step -3..3, invincible outline) or ('trail', ghost 0..2)
+    sheet = None
+    sheet_color = None   # Colour the sheet was baked in
     
-    def draw(self, screen):
-        if self.life > 0:
-            alpha = int(255 * (self.life / self.max_life))
-            color = (*self.color[:3], alpha)
-            surface = pygame.Surface((4, 4), pygame.SRCALPHA)
-            pygame.draw.circle(surface, color, (2, 2), 2)
-            screen.blit(surface, (int(self.x), int(self.y)))
-
-class Player:
     def __init__(self, x, y):
-        self.x = x
-        self.y = y
-        self.width = 20
-        self.height = 20
-        self.vel_x = 0
-        self.vel_y = 0
-        self.on_ground = False
+        super().__init__(x, y, 20, 20)
         self.double_jump_available = True
-        self.rect = pygame.Rect(x, y, self.width, self.height)
         # Power-up timers!
         self.speed_boost = 0
         self.invincible = 0
@@ -131,7 +271,7 @@ class Player:
         self.shoot_cooldown = 0  # For the GUN!
         self.facing_right = True  # Track which way player is facing
         
-    def update(self, platforms, projectiles=None):
+    def update(self, platforms, projectiles=None, keys=None):
         # Decrement power-up timers
         if self.speed_boost > 0:
             self.speed_boost -= 1
@@ -142,7 +282,8 @@ class Player:
         if self.shoot_cooldown > 0:
             self.shoot_cooldown -= 1
         
-        keys = pygame.key.get_pressed()
+        if keys is None:
+            keys = pygame.key.get_pressed()
         
         # GUN! Shoot with CTRL in the direction you're moving/facing!
         if keys[pygame.K_LCTRL] or keys[pygame.K_RCTRL]:
@@ -187,33 +328,11 @@ class Player:
             self.vel_x *= 0.8
             if abs(self.vel_x) < 0.5:
                 self.vel_x = 0
-        self.vel_y += GRAVITY
-        self.x += self.vel_x
-        self.rect.x = self.x
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.vel_x > 0:
-                    self.rect.right = platform.left
-                    self.x = self.rect.x
-                elif self.vel_x < 0:
-                    self.rect.left = platform.right
-                    self.x = self.rect.x
-                self.vel_x = 0
-        self.y += self.vel_y
-        self.rect.y = self.y
-        self.on_ground = False
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.vel_y > 0:
-                    self.rect.bottom = platform.top
-                    self.y = self.rect.y
-                    self.vel_y = 0
-                    self.on_ground = True
-                    self.double_jump_available = True
-                elif self.vel_y < 0:
-                    self.rect.top = platform.bottom
-                    self.y = self.rect.y
-                    self.vel_y = 0
+        self.fall(GRAVITY)
+        self.move_and_collide(platforms)
+    
+    def landed(self):
+        self.double_jump_available = True
     
     def jump(self):
         # Mega jump power-up makes jumps HUGE!
@@ -226,171 +345,184 @@ class Player:
             self.vel_y = double_jump_power
             self.double_jump_available = False
     
+    @classmethod
+    def bake(cls, col):
+        """Pre-render every frame of the player in colour col (done again when it changes)."""
+        col = tuple(col)
+        keys = [('body', facing, step, outline)
+                for facing in (True, False) for step in range(-3, 4) for outline in (False, True)]
+        keys += [('trail', i) for i in range(3)]
+        cls.sheet = SpriteSheet(lambda s, x, y, *key: cls.paint(s, x, y, col, *key), (-12, -3, 32, 30), keys)
+        cls.sheet_color = col
+        return cls.sheet
+
+    @staticmethod
+    def paint(screen, px, py, col, kind, *frame):
+        width, height = 20, 20
+        if kind == 'trail':
+            ghost, = frame
+            screen.fill((*col, (180 - ghost*50)//3), (px, py, width, height))
+            return
+        facing_right, step, outline = frame
+        leg_col = tuple(max(0,c-40) for c in col)
+        # Shadow (opaque black, as it always came out on the screen)
+        pygame.draw.ellipse(screen, (0,0,0), (px-2, py+height-2, width+4, 8))
+        # Body
+        pygame.draw.rect(screen, col, (px, py, width, height), 0, 4)
+        # Outline when invincible (flashing)
+        if outline:
+            pygame.draw.rect(screen, WHITE, (px-1, py-1, width+2, height+2), 2, 4)
+        # Eyes
+        ex = px + 13 if facing_right else px + 4
+        pygame.draw.circle(screen, WHITE, (ex, py+6), 4)
+        pygame.draw.circle(screen, BLACK, (ex + (1 if facing_right else -1), py+7), 2)
+        # Legs
+        pygame.draw.rect(screen, leg_col, (px+3, py+height, 7, 5+step))
+        pygame.draw.rect(screen, leg_col, (px+10, py+height, 7, 5-step))
+        # Gun arm
+        if facing_right:
+            pygame.draw.rect(screen, GRAY, (px+width, py+8, 10, 5))
+        else:
+            pygame.draw.rect(screen, GRAY, (px-10, py+8, 10, 5))
+
     def draw(self, screen, camera_x, camera_y):
         t = pygame.time.get_ticks() * 0.01
         bounce = math.sin(t) * 2 if self.on_ground else 0
         # Walking leg animation
         walk_cycle = math.sin(t * 3) if abs(self.vel_x) > 0.5 else 0
-        col = getattr(self, 'color', BLUE)
+        col = tuple(getattr(self, 'color', BLUE))
+        sheet = Player.sheet if Player.sheet_color == col else Player.bake(col)
         px = self.x - camera_x
         py = self.y - camera_y + bounce
-        # Shadow
-        pygame.draw.ellipse(screen, (0,0,0,0), (px-2, py+self.height-2, self.width+4, 8))
-        # Body
-        pygame.draw.rect(screen, col, (px, py, self.width, self.height), 0, 4)
         # Outline when invincible (flashing)
-        if getattr(self, 'invincible', 0) > 0 and int(t*4)%2==0:
-            pygame.draw.rect(screen, WHITE, (px-1, py-1, self.width+2, self.height+2), 2, 4)
-        # Eyes
-        ex = px + 13 if self.facing_right else px + 4
-        pygame.draw.circle(screen, WHITE, (int(ex), int(py+6)), 4)
-        pygame.draw.circle(screen, BLACK, (int(ex + (1 if self.facing_right else -1)), int(py+7)), 2)
-        # Legs
-        if abs(self.vel_x) > 0.5:
-            pygame.draw.rect(screen, tuple(max(0,c-40) for c in col),
-                (px+3, py+self.height, 7, 5+int(walk_cycle*3)))
-            pygame.draw.rect(screen, tuple(max(0,c-40) for c in col),
-                (px+10, py+self.height, 7, 5-int(walk_cycle*3)))
-        else:
-            pygame.draw.rect(screen, tuple(max(0,c-40) for c in col), (px+3, py+self.height, 7, 5))
-            pygame.draw.rect(screen, tuple(max(0,c-40) for c in col), (px+10, py+self.height, 7, 5))
-        # Gun arm
-        if self.facing_right:
-            pygame.draw.rect(screen, GRAY, (px+self.width, py+8, 10, 5))
-        else:
-            pygame.draw.rect(screen, GRAY, (px-10, py+8, 10, 5))
+        outline = getattr(self, 'invincible', 0) > 0 and int(t*4)%2==0
+        sheet.blit(screen, ('body', self.facing_right, int(walk_cycle*3), outline), px, py)
         # Speed boost trail
         if getattr(self, 'speed_boost', 0) > 0:
             for i in range(3):
-                tx2 = px - (i+1)*8*(1 if self.facing_right else -1)
-                alpha = 180 - i*50
-                ts2 = pygame.Surface((self.width, self.height), pygame.SRCALPHA)
-                ts2.fill((*col, alpha//3))
-                screen.blit(ts2, (tx2, py))
+                sheet.blit(screen, ('trail', i), px - (i+1)*8*(1 if self.facing_right else -1), py)
 
-class Enemy:
+class Enemy(Patroller):
+    sheet = None  # SpriteSheet shared by every Enemy, made by bake()
+    
     def __init__(self, x, y, patrol_distance):
-        self.start_x = x
-        self.x = x
-        self.y = y
-        self.width = 18
-        self.height = 18
-        self.patrol_distance = patrol_distance
-        self.direction = 1
-        self.rect = pygame.Rect(x, y, self.width, self.height)
+        super().__init__(x, y, 18, 18, patrol_distance)
         
     def update(self, platforms):
-        self.x += ENEMY_SPEED * self.direction
-        if abs(self.x - self.start_x) >= self.patrol_distance:
-            self.direction *= -1
-        self.rect.x = self.x
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.direction > 0:
-                    self.rect.right = platform.left
-                    self.x = self.rect.x
-                else:
-                    self.rect.left = platform.right
-                    self.x = self.rect.x
-                self.direction *= -1
+        self.patrol(ENEMY_SPEED)
+        self.bounce_off(platforms, self.width)
+    
+    @classmethod
+    def bake(cls):
+        cls.sheet = SpriteSheet(cls.paint, (-2, -2, 20, 20), [()])
+        return cls.sheet
+    
+    @staticmethod
+    def paint(screen, x, y):
+        pygame.draw.rect(screen, RED, (x, y, 18, 18))
+        pygame.draw.circle(screen, YELLOW, (x + 5, y + 5), 2)
+        pygame.draw.circle(screen, YELLOW, (x + 13, y + 5), 2)
     
     def draw(self, screen, camera_x, camera_y):
         wobble = math.sin(pygame.time.get_ticks() * 0.02) * 1
-        pygame.draw.rect(screen, RED, 
-                        (self.x - camera_x, self.y - camera_y + wobble, 
-                         self.width, self.height))
-        pygame.draw.circle(screen, YELLOW, 
-                          (int(self.x - camera_x + 5), int(self.y - camera_y + 5 + wobble)), 2)
-        pygame.draw.circle(screen, YELLOW, 
-                          (int(self.x - camera_x + 13), int(self.y - camera_y + 5 + wobble)), 2)
+        (Enemy.sheet or Enemy.bake()).blit(screen, (), self.x - camera_x, self.y - camera_y + wobble)
 
-class FastEnemy:
+class FastEnemy(Patroller):
     """Runs twice as fast, smaller, orange coloured."""
+    truncate_x = True
+    sheet = None
     def __init__(self, x, y, patrol_distance):
-        self.start_x = x; self.x = x; self.y = y
-        self.width = 14; self.height = 14
-        self.patrol_distance = patrol_distance
-        self.direction = 1
-        self.rect = pygame.Rect(x, y, self.width, self.height)
+        super().__init__(x, y, 14, 14, patrol_distance)
     def update(self, platforms):
-        self.x += ENEMY_SPEED * 2.2 * self.direction
-        if abs(self.x - self.start_x) >= self.patrol_distance:
+        self.patrol(ENEMY_SPEED * 2.2)
+        if self.blocked(platforms):
             self.direction *= -1
-        self.rect.x = int(self.x)
-        for p in platforms:
-            if self.rect.colliderect(p):
-                self.direction *= -1; break
+    @classmethod
+    def bake(cls):
+        cls.sheet = SpriteSheet(cls.paint, (-8, -2, 16, 16), [('body',), ('streak',)])
+        return cls.sheet
+    @staticmethod
+    def paint(screen, x, y, part):
+        if part == 'body':
+            pygame.draw.rect(screen, ORANGE, (x, y, 14, 14), 0, 3)
+            for ex2 in [x+3, x+9]:
+                pygame.draw.circle(screen, WHITE, (ex2, y+4), 2)
+        else:
+            # Speed lines
+            pygame.draw.line(screen, (255,180,80), (x-6, y+7), (x-1, y+7), 2)
     def draw(self, screen, camera_x, camera_y):
         t = pygame.time.get_ticks() * 0.03
         wobble = math.sin(t) * 2
-        pygame.draw.rect(screen, ORANGE,
-            (self.x-camera_x, self.y-camera_y+wobble, self.width, self.height), 0, 3)
-        for ex2 in [self.x-camera_x+3, self.x-camera_x+9]:
-            pygame.draw.circle(screen, WHITE, (int(ex2), int(self.y-camera_y+4+wobble)), 2)
-        # Speed lines
-        pygame.draw.line(screen, (255,180,80),
-            (int(self.x-camera_x-6), int(self.y-camera_y+7)),
-            (int(self.x-camera_x-1), int(self.y-camera_y+7)), 2)
-
-class ShieldEnemy:
+        sheet = FastEnemy.sheet or FastEnemy.bake()
+        sheet.blit(screen, ('body',), self.x-camera_x, self.y-camera_y+wobble)
+        sheet.blit(screen, ('streak',), self.x-camera_x, self.y-camera_y)   # Streak doesn't wobble
+
+class ShieldEnemy(Patroller):
     """Takes 2 hits to kill, has a visible shield."""
+    truncate_x = True
+    sheet = None  # Frames are (hit flash, facing left, health)
     def __init__(self, x, y, patrol_distance):
-        self.start_x = x; self.x = x; self.y = y
-        self.width = 20; self.height = 20
-        self.patrol_distance = patrol_distance
-        self.direction = 1
+        super().__init__(x, y, 20, 20, patrol_distance)
         self.health = 2
-        self.rect = pygame.Rect(x, y, self.width, self.height)
         self.hit_flash = 0
     def update(self, platforms):
-        self.x += ENEMY_SPEED * 0.8 * self.direction
-        if abs(self.x - self.start_x) >= self.patrol_distance:
-            self.direction *= -1
-        self.rect.x = int(self.x)
+        self.patrol(ENEMY_SPEED * 0.8)
         if self.hit_flash > 0: self.hit_flash -= 1
-        for p in platforms:
-            if self.rect.colliderect(p):
-                self.direction *= -1; break
-    def draw(self, screen, camera_x, camera_y):
-        col = WHITE if self.hit_flash > 0 else (100, 100, 200)
-        pygame.draw.rect(screen, col,
-            (self.x-camera_x, self.y-camera_y, self.width, self.height), 0, 4)
+        if self.blocked(platforms):
+            self.direction *= -1
+    @classmethod
+    def bake(cls):
+        keys = [(flash, left, hp) for flash in (False, True) for left in (False, True) for hp in range(3)]
+        cls.sheet = SpriteSheet(cls.paint, (-10, -12, 28, 24), keys)
+        return cls.sheet
+    @staticmethod
+    def paint(screen, x, y, flash, facing_left, health):
+        col = WHITE if flash else (100, 100, 200)
+        pygame.draw.rect(screen, col, (x, y, 20, 20), 0, 4)
         # Shield
-        shield_col = (150, 200, 255) if self.health == 2 else (100, 100, 100)
-        side = self.x - camera_x - 8 if self.direction < 0 else self.x - camera_x + self.width - 2
-        pygame.draw.rect(screen, shield_col, (int(side), int(self.y-camera_y-2), 8, 24), 0, 3)
-        pygame.draw.rect(screen, WHITE, (int(side), int(self.y-camera_y-2), 8, 24), 1, 3)
+        shield_col = (150, 200, 255) if health == 2 else (100, 100, 100)
+        side = x - 8 if facing_left else x + 20 - 2
+        pygame.draw.rect(screen, shield_col, (side, y-2, 8, 24), 0, 3)
+        pygame.draw.rect(screen, WHITE, (side, y-2, 8, 24), 1, 3)
         # Eyes
-        for ex2 in [self.x-camera_x+5, self.x-camera_x+13]:
-            pygame.draw.circle(screen, YELLOW, (int(ex2), int(self.y-camera_y+7)), 2)
+        for ex2 in [x+5, x+13]:
+            pygame.draw.circle(screen, YELLOW, (ex2, y+7), 2)
         # Health pips
-        for i in range(self.health):
-            pygame.draw.circle(screen, GREEN, (int(self.x-camera_x+4+i*8), int(self.y-camera_y-7)), 3)
+        for i in range(health):
+            pygame.draw.circle(screen, GREEN, (x+4+i*8, y-7), 3)
+    def draw(self, screen, camera_x, camera_y):
+        (ShieldEnemy.sheet or ShieldEnemy.bake()).blit(
+            screen, (self.hit_flash > 0, self.direction < 0, self.health), self.x-camera_x, self.y-camera_y)
 
-class JumperEnemy:
+class JumperEnemy(Patroller):
     """Bounces up and down, harder to hit."""
-    def __init__(self, x, y, patrol_distance):
-        self.start_x = x; self.x = x; self.y = y; self.base_y = y
-        self.width = 16; self.height = 16
-        self.patrol_distance = patrol_distance
-        self.direction = 1; self.jump_phase = random.uniform(0, math.pi*2)
-        self.rect = pygame.Rect(x, y, self.width, self.height)
+    truncate_x = True
+    sheet = None  # Frames are the squished (width, height)
+    def __init__(self, x, y, patrol_distance, rng=random):
+        super().__init__(x, y, 16, 16, patrol_distance)
+        self.base_y = y
+        self.jump_phase = rng.uniform(0, math.pi*2)
     def update(self, platforms):
-        self.x += ENEMY_SPEED * self.direction
-        if abs(self.x - self.start_x) >= self.patrol_distance:
-            self.direction *= -1
+        self.patrol(ENEMY_SPEED)
         self.jump_phase += 0.08
         self.y = self.base_y + math.sin(self.jump_phase) * 22
-        self.rect.x = int(self.x); self.rect.y = int(self.y)
+        self.rect.y = int(self.y)
+    @classmethod
+    def bake(cls):
+        keys = {(int(16 * (1 + (1-sq/100)*0.3)), int(16 * (1 - (1-sq/100)*0.2))) for sq in range(101)}
+        cls.sheet = SpriteSheet(cls.paint, (-2, -2, 22, 18), sorted(keys))
+        return cls.sheet
+    @staticmethod
+    def paint(screen, x, y, w2, h2):
+        pygame.draw.rect(screen, (180, 60, 180), (x, y, w2, h2), 0, 5)
+        pygame.draw.circle(screen, WHITE, (x+5, y+5), 2)
+        pygame.draw.circle(screen, WHITE, (x+11, y+5), 2)
     def draw(self, screen, camera_x, camera_y):
         # Squish when landing
         squish = abs(math.sin(self.jump_phase))
         w2 = int(self.width * (1 + (1-squish)*0.3))
         h2 = int(self.height * (1 - (1-squish)*0.2))
-        pygame.draw.rect(screen, (180, 60, 180),
-            (int(self.x-camera_x), int(self.y-camera_y), w2, h2), 0, 5)
-        pygame.draw.circle(screen, WHITE, (int(self.x-camera_x+5), int(self.y-camera_y+5)), 2)
-        pygame.draw.circle(screen, WHITE, (int(self.x-camera_x+11), int(self.y-camera_y+5)), 2)
+        (JumperEnemy.sheet or JumperEnemy.bake()).blit(screen, (w2, h2), self.x-camera_x, self.y-camera_y)
 
 class Gem:
     """Collectible gem worth 5 coins, rare, sparkles blue/purple."""
@@ -410,9 +542,7 @@ class Gem:
         cy2 = self.y - camera_y + 8 + bob
         # Glow
         for r2,a2 in [(14,30),(10,60),(7,100)]:
-            gs = pygame.Surface((r2*2,r2*2), pygame.SRCALPHA)
-            pygame.draw.circle(gs, (*self.col, a2), (r2,r2), r2)
-            screen.blit(gs, (cx2-r2, cy2-r2))
+            glow.blit_circle(screen, cx2, cy2, r2, self.col, a2)
         # Diamond shape
         pts = [(cx2, cy2-7),(cx2+5,cy2),(cx2,cy2+7),(cx2-5,cy2)]
         pygame.draw.polygon(screen, self.col, pts)
@@ -451,15 +581,15 @@ class NPC:
         pygame.draw.rect(screen,(40,120,60),(px+2,py+bob-4,16,6))
         # Exclamation mark above when nearby
         if self.talking:
-            ef = pygame.font.Font(None,22)
-            es2 = ef.render("!", True, YELLOW)
+            ef = FONTS.get(22)
+            es2 = FONTS.render(ef, "!", True, YELLOW)
             screen.blit(es2,(px+6, py+bob-20))
             # Speech bubble
             bx=px-160; by=py-55
             pygame.draw.rect(screen,WHITE,(bx,by,190,44),0,8)
             pygame.draw.rect(screen,(60,180,80),(bx,by,190,44),2,8)
             pygame.draw.polygon(screen,WHITE,[(px+2,py+bob-2),(px+18,py+bob-2),(px+10,py+bob+4)])
-            tf=pygame.font.Font(None,17)
+            tf=FONTS.get(17)
             words=self.tip.split(); line2=''; lines2=[]
             for w in words:
                 test=line2+w+' '
@@ -467,35 +597,19 @@ class NPC:
                 else: line2=test
             if line2: lines2.append(line2)
             for i,l in enumerate(lines2[:2]):
-                screen.blit(tf.render(l.strip(),True,(20,60,20)),(bx+6,by+7+i*16))
+                screen.blit(FONTS.render(tf,l.strip(),True,(20,60,20)),(bx+6,by+7+i*16))
 
-class Boss:
+class Boss(Patroller):
+    sheet = None
+    
     def __init__(self, x, y, health=5):
-        self.x = x
-        self.y = y
-        self.width = 50
-        self.height = 50
+        super().__init__(x, y, 50, 50, 200)
         self.health = health
-        self.direction = 1
-        self.patrol_distance = 200
-        self.start_x = x
         self.shoot_timer = 0
-        self.rect = pygame.Rect(x, y, self.width, self.height)
     
     def update(self, platforms, player, projectiles):
-        self.x += BOSS_SPEED * self.direction
-        if abs(self.x - self.start_x) >= self.patrol_distance:
-            self.direction *= -1
-        self.rect.x = self.x
-        for platform in platforms:
-            if self.rect.colliderect(platform):
-                if self.direction > 0:
-                    self.rect.right = platform.left
-                    self.x = self.rect.x
-                else:
-                    self.rect.left = platform.right
-                    self.x = self.rect.x
-                self.direction *= -1
+        self.patrol(BOSS_SPEED)
+        self.bounce_off(platforms, self.width)
         self.shoot_timer += 1
         if self.shoot_timer >= 120:
             dx = player.x - self.x
@@ -507,41 +621,46 @@ class Boss:
                                              dx * PROJECTILE_SPEED, dy * PROJECTILE_SPEED))
             self.shoot_timer = 0
     
+    @classmethod
+    def bake(cls):
+        """One frame per health left; the bar is full at 5."""
+        cls.sheet = SpriteSheet(cls.paint, (-2, -12, 52, 52), [(hp,) for hp in range(6)])
+        return cls.sheet
+    
+    @staticmethod
+    def paint(screen, x, y, health):
+        pygame.draw.rect(screen, PURPLE, (x, y, 50, 50))
+        pygame.draw.circle(screen, YELLOW, (x + 15, y + 15), 5)
+        pygame.draw.circle(screen, YELLOW, (x + 35, y + 15), 5)
+        pygame.draw.rect(screen, RED, (x, y - 10, 50 * (health / 5), 5))
+    
     def draw(self, screen, camera_x, camera_y):
         wobble = math.sin(pygame.time.get_ticks() * 0.015) * 2
-        pygame.draw.rect(screen, PURPLE, 
-                        (self.x - camera_x, self.y - camera_y + wobble, 
-                         self.width, self.height))
-        pygame.draw.circle(screen, YELLOW, 
-                          (int(self.x - camera_x + 15), int(self.y - camera_y + 15 + wobble)), 5)
-        pygame.draw.circle(screen, YELLOW, 
-                          (int(self.x - camera_x + 35), int(self.y - camera_y + 15 + wobble)), 5)
-        pygame.draw.rect(screen, RED, 
-                        (self.x - camera_x, self.y - camera_y - 10 + wobble, 
-                         self.width * (self.health / 5), 5))
-
-class FlyingBoss:
+        (Boss.sheet or Boss.bake()).blit(screen, (max(0, min(self.health, 5)),),
+                                         self.x - camera_x, self.y - camera_y + wobble)
+
+class FlyingBoss(Entity):
     """Red Guy with WINGS! Flies around and you have to jump on him!"""
+    sheet = None  # Frames are ('body', wing offset) or ('bar', health, max health)
+    
     def __init__(self, x, y, health=5):
-        self.x = x
-        self.y = y
-        self.width = 60
-        self.height = 60
+        super().__init__(x, y, 60, 60)
         self.health = health
         self.max_health = health
         self.direction_x = 1
         self.direction_y = 1
         self.speed = 3
-        self.rect = pygame.Rect(x, y, self.width, self.height)
         self.wing_flap = 0
+        self.bob = 0  # Ticks flown - drives the up/down bob
     
-    def update(self, player):
+    def update(self, player, rng=random):
         # Fly in a pattern
         self.x += self.speed * self.direction_x
-        self.y += math.sin(pygame.time.get_ticks() * 0.01) * 2
+        self.bob += 1
+        self.y += math.sin(self.bob * 1000 / FPS * 0.01) * 2
         
         # Change direction randomly
-        if random.random() < 0.02:
+        if rng.random() < 0.02:
             self.direction_x *= -1
         
         # Keep in bounds
@@ -558,59 +677,43 @@ class FlyingBoss:
         self.rect.y = self.y
         self.wing_flap += 0.3
     
-    def draw(self, screen, camera_x, camera_y):
+    @classmethod
+    def bake(cls):
+        """Wing frames for each whole pixel of flap; health bars are added as they're needed."""
+        cls.sheet = SpriteSheet(cls.paint, (-32, -17, 92, 62), [('body', w) for w in range(-15, 16)])
+        return cls.sheet
+    
+    @staticmethod
+    def paint(screen, x, y, part, *frame):
+        width = height = 60
+        if part == 'bar':
+            health, max_health = frame
+            pygame.draw.rect(screen, BLACK, (x, y - 15, width, 8))
+            pygame.draw.rect(screen, RED, (x, y - 15, width * (health / max_health), 8))
+            return
+        wing_offset, = frame
         # Red Guy body
-        pygame.draw.rect(screen, RED, 
-                        (self.x - camera_x, self.y - camera_y, 
-                         self.width, self.height))
-        
+        pygame.draw.rect(screen, RED, (x, y, width, height))
         # WINGS!
-        wing_offset = math.sin(self.wing_flap) * 15
-        # Left wing
-        wing_points_left = [
-            (self.x - camera_x, self.y - camera_y + 30),
-            (self.x - camera_x - 30, self.y - camera_y + 20 + wing_offset),
-            (self.x - camera_x - 20, self.y - camera_y + 40 + wing_offset)
-        ]
-        pygame.draw.polygon(screen, (180, 50, 50), wing_points_left)
-        
-        # Right wing
-        wing_points_right = [
-            (self.x - camera_x + self.width, self.y - camera_y + 30),
-            (self.x - camera_x + self.width + 30, self.y - camera_y + 20 + wing_offset),
-            (self.x - camera_x + self.width + 20, self.y - camera_y + 40 + wing_offset)
-        ]
-        pygame.draw.polygon(screen, (180, 50, 50), wing_points_right)
-        
+        pygame.draw.polygon(screen, (180, 50, 50), [
+            (x, y + 30), (x - 30, y + 20 + wing_offset), (x - 20, y + 40 + wing_offset)])
+        pygame.draw.polygon(screen, (180, 50, 50), [
+            (x + width, y + 30), (x + width + 30, y + 20 + wing_offset), (x + width + 20, y + 40 + wing_offset)])
         # Evil eyes
-        pygame.draw.circle(screen, YELLOW, 
-                          (int(self.x - camera_x + 18), int(self.y - camera_y + 20)), 5)
-        pygame.draw.circle(screen, YELLOW, 
-                          (int(self.x - camera_x + 42), int(self.y - camera_y + 20)), 5)
-        
-        # Health bar
-        pygame.draw.rect(screen, BLACK, 
-                        (self.x - camera_x, self.y - camera_y - 15, self.width, 8))
-        pygame.draw.rect(screen, RED, 
-                        (self.x - camera_x, self.y - camera_y - 15, 
-                         self.width * (self.health / self.max_health), 8))
-
-class Projectile:
+        pygame.draw.circle(screen, YELLOW, (x + 18, y + 20), 5)
+        pygame.draw.circle(screen, YELLOW, (x + 42, y + 20), 5)
+    
+    def draw(self, screen, camera_x, camera_y):
+        sheet = FlyingBoss.sheet or FlyingBoss.bake()
+        x, y = self.x - camera_x, self.y - camera_y
+        # Wing tips land on whole pixels, so the frame is picked by where they'd be truncated to
+        sheet.blit(screen, ('body', math.floor(y % 1 + math.sin(self.wing_flap) * 15)), x, y)
+        sheet.blit(screen, ('bar', max(0, self.health), self.max_health), x, y)
+
+class Projectile(Bullet):
     def __init__(self, x, y, vel_x, vel_y, is_player_bullet=False):
-        self.x = x
-        self.y = y
-        self.vel_x = vel_x
-        self.vel_y = vel_y
-        self.width = 8
-        self.height = 8
+        super().__init__(x, y, 8, 8, vel_x, vel_y)
         self.is_player_bullet = is_player_bullet  # Player bullets are cyan, enemy bullets are red
-        self.rect = pygame.Rect(x, y, self.width, self.height)
-    
-    def update(self):
-        self.x += self.vel_x
-        self.y += self.vel_y
-        self.rect.x = self.x
-        self.rect.y = self.y
     
     def draw(self, screen, camera_x, camera_y):
         color = CYAN if self.is_player_bullet else RED
@@ -671,9 +774,9 @@ class PowerUp:
                            (self.x - camera_x + 6, self.y - camera_y + pulse + 6, 
                             12, 12))
             # Letter indicator
-            font = pygame.font.Font(None, 16)
+            font = FONTS.get(16)
             letter = self.power_type[0].upper() if self.power_type else 'P'
-            text = font.render(letter, True, color)
+            text = FONTS.render(font, letter, True, color)
             screen.blit(text, (self.x - camera_x + 8, self.y - camera_y + pulse + 8))
 
 class Spike:
@@ -694,10 +797,20 @@ class Spike:
         pygame.draw.polygon(screen, WHITE, points, 2)
 
 class Game:
-    def __init__(self):
+    def __init__(self, headless=False):
+        self.headless = headless  # No save file reads/writes and no sound (see headless.py)
+        if headless:
+            # pygame.init() started the mixer; its audio thread has no business in
+            # a benchmark (and crashes under tracemalloc)
+            pygame.mixer.quit()
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         pygame.display.set_caption("Minimal Platformer 4: The Red Uprising  — by Kyle")
         self.clock = pygame.time.Clock()
+        self.timestep = FixedTimestep(FPS)  # Gameplay always ticks at 60 Hz
+        self.interp = Interpolator()
+        self.profiler = Profiler()  # F3 toggles it with an overlay; --profile exports it
+        self.show_profiler = False
+        self.culled = 0  # Entities skipped by the last frame's draw, shown in the F3 overlay
         self.camera_x = 0
         self.camera_y = 0
         self.current_level = 0
@@ -707,6 +820,12 @@ class Game:
         self.boss_defeated = False
         self.state = "intro"
         self.intro_timer = 0
+        # Everything random in the simulation draws from self.rng, so a seed plus
+        # the per-tick input reproduces a run exactly (see replay.py)
+        self.seed = random.randrange(1 << 32)
+        self.rng = random.Random(self.seed)
+        self.recorder = None
+        self.record_path = None
         self.levels = self.create_levels()
         self.projectiles = []
         self.tutorial_step = 0
@@ -716,6 +835,7 @@ class Game:
         self.combo = 0           # current kill streak
         self.combo_timer = 0     # frames since last kill
         self.max_combo = 0       # personal best
+        self.combo_banner = Banner(FONTS.get(52))
 
         # ── SCREEN SHAKE ──────────────────────────────────────────────────
         self.shake_timer = 0
@@ -732,11 +852,10 @@ class Game:
         self.best_times  = {}     # level_index -> best frame count
 
         # ── FLOATY SCORE TEXT ─────────────────────────────────────────────
-        self.floaty_texts = []    # list of {x,y,vy,text,col,life,maxlife}
+        self.floaty_texts = LabelPool(FLOATY_TEXT_POOL)
 
         # ── WEATHER / ATMOSPHERE ─────────────────────────────────────────
-        self.weather_particles = []
-        self.weather_timer = 0
+        self.weather = Weather(SCREEN_WIDTH, SCREEN_HEIGHT)
 
         # ── ACHIEVEMENTS ─────────────────────────────────────────────────
         self.achievements_earned = set()
@@ -868,42 +987,17 @@ class Game:
 
         # ── SOUND EFFECTS ─────────────────────────────────────────────────
         self.sfx = {}
+        self.synth = None
         try:
-            sr = 44100; bits = -16; ch = 1; sz = 512
-            pygame.mixer.pre_init(sr, bits, ch, sz)
-            def make_tone(freq, dur, vol=0.4, wave='sine', decay=True):
-                """Generate a simple tone as a Sound object."""
-                frames = int(sr * dur)
-                buf = bytearray(frames * 2)
-                for i in range(frames):
-                    t2 = i / sr
-                    if wave == 'sine':
-                        s2 = math.sin(2*math.pi*freq*t2)
-                    elif wave == 'square':
-                        s2 = 1.0 if math.sin(2*math.pi*freq*t2) > 0 else -1.0
-                    elif wave == 'noise':
-                        s2 = random.uniform(-1,1)
-                    else:
-                        s2 = math.sin(2*math.pi*freq*t2)
-                    if decay: s2 *= max(0, 1 - i/frames)
-                    s2 = max(-1, min(1, s2 * vol))
-                    v = int(s2 * 32767)
-                    buf[i*2]   = v & 0xFF
-                    buf[i*2+1] = (v >> 8) & 0xFF
-                snd = pygame.sndarray.make_sound(
-                    __import__('array').array('h', [
-                        int(math.sin(2*math.pi*freq*(i/sr)) * 32767 * vol * max(0, 1-i/frames if decay else 1))
-                        for i in range(frames)
-                    ])
-                )
-                return snd
-            self.sfx['jump']   = make_tone(440, 0.12, 0.3, 'sine')
-            self.sfx['shoot']  = make_tone(880, 0.07, 0.2, 'square')
-            self.sfx['coin']   = make_tone(660, 0.10, 0.3, 'sine')
-            self.sfx['hit']    = make_tone(150, 0.18, 0.4, 'noise')
-            self.sfx['death']  = make_tone(200, 0.35, 0.4, 'sine', decay=True)
-            self.sfx['gem']    = make_tone(880, 0.15, 0.3, 'sine')
-            self.sfx['powerup']= make_tone(523, 0.20, 0.4, 'sine')
+            if not headless:
+                cache_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.sfx_cache')
+                self.synth = Synth(cache_dir)
+                for name, params in SFX_TONES.items():
+                    self.sfx[name] = self.synth.sound(*params)
+                # Every coin pitch too, so a pickup never synthesises (or hits the disk) mid-tick
+                freq, dur, vol, wave = SFX_TONES['coin']
+                for note in COIN_NOTES:
+                    self.synth.sound(freq * 2 ** (note / 12), dur, vol, wave)
         except Exception as e:
             print(f"SFX init skipped: {e}")
 
@@ -944,9 +1038,14 @@ class Game:
              'layer': random.randint(0,2)}
             for i in range(14)
         ]
+
+        # ── CACHED SKY GRADIENTS (keyed by size + top/bottom colour) ─────
+        self.gradient_cache = {}
         self.selected_option = 0
         self.start_level = 1
-        self.particles = []
+        self.particles = ParticleSystem(PARTICLE_BUDGET, radius=2, shrink=False, centered=False,
+                                        evict_oldest=True, caps=PARTICLE_CAPS)
+        self.particles.seed(self.seed)
         self.menu_gradient = 0
 
         # Cutscene tracking
@@ -1013,118 +1112,33 @@ class Game:
         self.tv_channel = 0
         self.tv_timer   = 0
         
-        # MUSIC! Load music files if they exist
-        pygame.mixer.init()
-        import os
+        # MUSIC! Only noted here; AudioManager streams or decodes it when it's needed
+        if not headless:
+            pygame.mixer.init()
         
         # Get the directory where the game is running
         game_dir = os.path.dirname(os.path.abspath(__file__))
         print(f"🎵 Looking for music files in: {game_dir}")
-        
-        self.music_loaded = False
-        self.menu_music = None
-        self.cutscene1_music = None
-        self.cutscene2_music = None
-        self.cutscene3_music = None
-        
-        # Try to load menu/gameplay music
-        menu_path = os.path.join(game_dir, "menu_music.mp3")
-        try:
-            if os.path.exists(menu_path):
-                self.menu_music = pygame.mixer.Sound(menu_path)
-                self.music_loaded = True
-                print(f"✅ Menu music loaded from: {menu_path}")
-            else:
-                print(f"❌ File not found: {menu_path}")
-                print("   Put menu_music.mp3 in the same folder as the game!")
-        except Exception as e:
-            print(f"❌ Error loading menu music: {e}")
-        
-        # Try to load cutscene music/voice acting
-        cutscene1_path = os.path.join(game_dir, "cutscene1.mp3")
-        try:
-            if os.path.exists(cutscene1_path):
-                self.cutscene1_music = pygame.mixer.Sound(cutscene1_path)
-                print(f"✅ Cutscene 1 audio loaded!")
-            else:
-                print(f"❌ cutscene1.mp3 not found (optional)")
-        except Exception as e:
-            print(f"❌ Error loading cutscene 1: {e}")
-        
-        cutscene2_path = os.path.join(game_dir, "cutscene2.mp3")
-        try:
-            if os.path.exists(cutscene2_path):
-                self.cutscene2_music = pygame.mixer.Sound(cutscene2_path)
-                print(f"✅ Cutscene 2 audio loaded!")
-            else:
-                print(f"❌ cutscene2.mp3 not found (optional)")
-        except Exception as e:
-            print(f"❌ Error loading cutscene 2: {e}")
-        
-        cutscene3_path = os.path.join(game_dir, "cutscene3.mp3")
-        try:
-            if os.path.exists(cutscene3_path):
-                self.cutscene3_music = pygame.mixer.Sound(cutscene3_path)
-                print(f"✅ Cutscene 3 audio loaded!")
-            else:
-                print(f"❌ cutscene3.mp3 not found (optional)")
-        except Exception as e:
-            print(f"❌ Error loading cutscene 3: {e}")
-        
-        # Cutscene 4: Gas Station (after level 5)
-        self.cutscene4_music = None
-        cutscene4_path = os.path.join(game_dir, "cutscene4.mp3")
-        try:
-            if os.path.exists(cutscene4_path):
-                self.cutscene4_music = pygame.mixer.Sound(cutscene4_path)
-                print(f"✅ Cutscene 4 audio loaded!")
-            else:
-                print(f"❌ cutscene4.mp3 not found (optional)")
-        except Exception as e:
-            print(f"❌ Error loading cutscene 4: {e}")
-        
-        # Cutscene 5: Boss Fight (before level 10)
-        self.cutscene5_music = None
-        cutscene5_path = os.path.join(game_dir, "cutscene5.mp3")
-        try:
-            if os.path.exists(cutscene5_path):
-                self.cutscene5_music = pygame.mixer.Sound(cutscene5_path)
-                print(f"✅ Cutscene 5 audio loaded!")
-            else:
-                print(f"❌ cutscene5.mp3 not found (optional)")
-        except Exception as e:
-            print(f"❌ Error loading cutscene 5: {e}")
-        
-        # Cutscene 6: Woods World (after level 15, before 16)
-        self.cutscene6_music = None
-        cutscene6_path = os.path.join(game_dir, "cutscene6.mp3")
-        try:
-            if os.path.exists(cutscene6_path):
-                self.cutscene6_music = pygame.mixer.Sound(cutscene6_path)
-                print(f"✅ Cutscene 6 audio loaded!")
-            else:
-                print(f"❌ cutscene6.mp3 not found (optional)")
-        except Exception as e:
-            print(f"❌ Error loading cutscene 6: {e}")
-        
-        # Cutscene 7: Final Boss (before level 30)
-        self.cutscene7_music = None
-        cutscene7_path = os.path.join(game_dir, "cutscene7.mp3")
-        try:
-            if os.path.exists(cutscene7_path):
-                self.cutscene7_music = pygame.mixer.Sound(cutscene7_path)
-                print(f"✅ Cutscene 7 audio loaded!")
-            else:
-                print(f"❌ cutscene7.mp3 not found (optional)")
-        except Exception as e:
-            print(f"❌ Error loading cutscene 7: {e}")
-        
-        self.current_music = None  # Track what's playing
+        self.audio = AudioManager(game_dir)
+        # Menu/gameplay music is long, so it streams from disk
+        self.music_loaded = self.audio.register('menu', "menu_music.mp3", stream=True,
+                                                label="Menu music", optional=False)
+        if not self.music_loaded:
+            print("   Put menu_music.mp3 in the same folder as the game!")
+        # Cutscene music/voice acting: 1-3 play during the intro, the rest before levels (CUTSCENES)
+        for n in range(1, 8):
+            self.audio.register(f'cutscene{n}', f"cutscene{n}.mp3", label=f"Cutscene {n} audio")
+        self.audio.preload('cutscene1')  # The game opens on the intro, which starts with it
         print("🎵 Music system ready!")
 
         # ── AUTO LOAD SAVE ────────────────────────────────────────────────
-        self.load_game()
+        self.saver = SaveWriter(self.get_save_path())  # Writes happen off the render thread
+        if not self.headless:
+            self.load_game()
         self.save_notif = 0  # frames to show "SAVED!" notification
+        self.save_banner = Banner(FONTS.get(36))       # In play
+        self.menu_save_banner = Banner(FONTS.get(38))  # On the menu
+        self.bake_sprites()  # After the save, so the player is baked in the saved colour
         # Now safe to load the starting level — all data dicts are ready
         self.load_level(self.current_level)
         if not self.music_loaded:
@@ -1154,10 +1168,16 @@ class Game:
         }
     
     def create_levels(self):
-        levels = []
-        
+        """Describe every level without building any of them (see LevelCache)."""
+        builders = [self.level_1, self.level_2, self.level_3, self.level_4, self.level_5,
+                    self.level_6, self.level_7, self.level_8, self.level_9, self.level_10,
+                    self.level_11, self.level_12, self.level_13, self.level_14, self.level_15]
+        builders += [lambda rng, i=i: self.woods_level(i, rng) for i in range(16, 31)]
+        return LevelCache(builders, self.seed)
+
+    def level_1(self, rng):
         # LEVEL 1 - Tutorial: Learn the basics (SHORT and EASY)
-        level1 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 300, 68),
                 pygame.Rect(350, 650, 200, 20),
@@ -1176,9 +1196,10 @@ class Game:
             'boss': None,
             'flying_boss': None
         }
-        levels.append(level1)
+
+    def level_2(self, rng):
         # LEVEL 2 - Easy stairs
-        level2 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 250, 68),
                 pygame.Rect(300, 650, 150, 20),
@@ -1197,10 +1218,10 @@ class Game:
             'flying_boss': None,
             'world': 'normal'
         }
-        levels.append(level2)
-        
+
+    def level_3(self, rng):
         # LEVEL 3
-        level3 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 200, 68),
                 pygame.Rect(250, 650, 150, 20),
@@ -1218,10 +1239,10 @@ class Game:
             'flying_boss': None,
             'world': 'normal'
         }
-        levels.append(level3)
-        
+
+    def level_4(self, rng):
         # LEVEL 4
-        level4 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 200, 68),
                 pygame.Rect(250, 650, 150, 20),
@@ -1241,10 +1262,10 @@ class Game:
             'flying_boss': None,
             'world': 'normal'
         }
-        levels.append(level4)
-        
+
+    def level_5(self, rng):
         # LEVEL 5 - Flying Boss
-        level5 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 200, 68),
                 pygame.Rect(250, 650, 900, 118),  # Boss arena floor
@@ -1264,10 +1285,10 @@ class Game:
             'flying_boss': FlyingBoss(650, 300, health=5),
             'world': 'normal'
         }
-        levels.append(level5)
-        
+
+    def level_6(self, rng):
         # LEVEL 6 - The Long Road: lots of platforms, enemies patrolling
-        level6 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 200, 68),
                 pygame.Rect(250, 650, 130, 20), pygame.Rect(450, 620, 130, 20),
@@ -1284,10 +1305,10 @@ class Game:
             'spawn': (50, 640), 'exit': (1950, 380),
             'boss': None, 'flying_boss': None, 'world': 'normal'
         }
-        levels.append(level6)
 
+    def level_7(self, rng):
         # LEVEL 7 - The Pit: platforms over a deadly spike pit (with safe gaps!)
-        level7 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 200, 68),
                 pygame.Rect(220, 590, 130, 20),
@@ -1321,10 +1342,10 @@ class Game:
             'spawn': (50, 650), 'exit': (1720, 318),
             'boss': None, 'flying_boss': None, 'world': 'normal'
         }
-        levels.append(level7)
 
+    def level_8(self, rng):
         # LEVEL 8 - The Tower: climb straight UP, platforms going vertical
-        level8 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 300, 68),
                 pygame.Rect(40, 620, 180, 20), pygame.Rect(240, 545, 180, 20),
@@ -1345,10 +1366,10 @@ class Game:
             'spawn': (50, 640), 'exit': (370, 70),
             'boss': None, 'flying_boss': None, 'world': 'normal'
         }
-        levels.append(level8)
 
+    def level_9(self, rng):
         # LEVEL 9 - Chaos Bridge: narrow platforms with enemies AND spikes below
-        level9 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 180, 68),
                 pygame.Rect(230, 640, 90, 20), pygame.Rect(390, 590, 90, 20),
@@ -1370,10 +1391,10 @@ class Game:
             'spawn': (50, 640), 'exit': (1920, 310),
             'boss': None, 'flying_boss': None, 'world': 'normal'
         }
-        levels.append(level9)
 
+    def level_10(self, rng):
         # LEVEL 10 - BOSS FIGHT: Walking Red Guy
-        level10 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 200, 68),
                 pygame.Rect(200, 650, 900, 18),  # Arena floor
@@ -1387,10 +1408,10 @@ class Game:
             'spawn': (50, 630), 'exit': (950, 620),
             'boss': Boss(700, 600, health=5), 'flying_boss': None, 'world': 'normal'
         }
-        levels.append(level10)
 
+    def level_11(self, rng):
         # LEVEL 11 - The Gauntlet: enemies EVERYWHERE, tight spaces
-        level11 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 200, 68),
                 pygame.Rect(220, 650, 110, 20), pygame.Rect(400, 600, 110, 20),
@@ -1404,18 +1425,18 @@ class Game:
                 MovingPlatform(1030, 280, 100, 15, move_x_range=120, speed=2),
             ],
             'enemies': [Enemy(240, 622, 80), FastEnemy(420, 572, 100), ShieldEnemy(600, 522, 80),
-                        JumperEnemy(780, 472, 80), Enemy(960, 422, 80), ShieldEnemy(1140, 372, 80),
-                        FastEnemy(1320, 322, 100), JumperEnemy(1500, 272, 80)],
+                        JumperEnemy(780, 472, 80, rng), Enemy(960, 422, 80), ShieldEnemy(1140, 372, 80),
+                        FastEnemy(1320, 322, 100), JumperEnemy(1500, 272, 80, rng)],
             'coins': [Coin(250, 620), Coin(430, 570), Coin(610, 520), Coin(790, 470), Coin(970, 420), Coin(1150, 370), Coin(1330, 320), Coin(1510, 270), Coin(1680, 220)],
             'power_ups': [PowerUp(790, 470, 'invincible')],
             'spikes': [Spike(340, 680), Spike(520, 680), Spike(700, 680), Spike(880, 680), Spike(1060, 680), Spike(1240, 680), Spike(1420, 680), Spike(1600, 680)],
             'spawn': (50, 640), 'exit': (1930, 170),
             'boss': None, 'flying_boss': None, 'world': 'normal'
         }
-        levels.append(level11)
 
+    def level_12(self, rng):
         # LEVEL 12 - The Maze: platforms going up AND down, confusing layout
-        level12 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 200, 68),
                 pygame.Rect(220, 600, 120, 20), pygame.Rect(420, 500, 120, 20),
@@ -1437,10 +1458,10 @@ class Game:
             'spawn': (50, 640), 'exit': (2100, 270),
             'boss': None, 'flying_boss': None, 'world': 'normal'
         }
-        levels.append(level12)
 
+    def level_13(self, rng):
         # LEVEL 13 - Speed Run: fast moving platforms, wide gaps, must keep moving
-        level13 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 180, 68),
                 pygame.Rect(220, 580, 100, 20), pygame.Rect(550, 500, 100, 20),
@@ -1461,10 +1482,10 @@ class Game:
             'spawn': (50, 640), 'exit': (2040, 150),
             'boss': None, 'flying_boss': None, 'world': 'normal'
         }
-        levels.append(level13)
 
+    def level_14(self, rng):
         # LEVEL 14 - Before the Boss: hardest normal level, everything at once
-        level14 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 160, 68),
                 pygame.Rect(200, 645, 90, 20), pygame.Rect(360, 595, 90, 20),
@@ -1489,10 +1510,10 @@ class Game:
             'spawn': (50, 640), 'exit': (1880, 115),
             'boss': None, 'flying_boss': None, 'world': 'normal'
         }
-        levels.append(level14)
-        
+
+    def level_15(self, rng):
         # LEVEL 15 - FINAL BOSS
-        level15 = {
+        return {
             'platforms': [
                 pygame.Rect(0, 700, 200, 68),
                 pygame.Rect(250, 660, 1000, 108),  # arena floor
@@ -1513,118 +1534,113 @@ class Game:
             'flying_boss': FlyingBoss(700, 300, health=8),
             'world': 'normal'
         }
-        levels.append(level15)
-        
+
+    def woods_level(self, i, rng):
         # WOODS WORLD - Levels 16-30 (VERY DIFFERENT!)
-        for i in range(16, 31):
-            platforms = [pygame.Rect(0, 700, 200, 68)]
-            x, y = 250, 650
-            num_platforms = 15 + (i - 16)
-            
-            # Different pattern for each level!
-            pattern = (i - 16) % 5
-            
-            for j in range(num_platforms):
-                platform_width = 120 if pattern != 2 else 80  # Narrower platforms on pattern 2
-                platforms.append(pygame.Rect(x, y, platform_width, 20))
-                
-                # Different movement patterns!
-                if pattern == 0:  # Stairs up
-                    x += 180
-                    y -= 60 if j % 2 == 0 else -20
-                elif pattern == 1:  # Zigzag
-                    x += 200
-                    y -= 70 if j % 3 == 0 else (-50 if j % 3 == 1 else 40)
-                elif pattern == 2:  # Narrow jumps
-                    x += 220
-                    y -= 50 if j % 2 == 0 else -30
-                elif pattern == 3:  # Wide gaps
-                    x += 240
-                    y -= 55 if j % 2 == 0 else -35
-                else:  # Pattern 4 - mixed
-                    x += 190 + (j % 3) * 10
-                    y -= 65 if j % 2 == 0 else -25
-                
-                # Keep in bounds
-                if y < 250: y = 350
-                if y > 650: y = 550
-            
-            platforms.append(pygame.Rect(x, y, 300, 768 - y))
-            
-            # More varied moving platforms!
-            moving_plats = []
-            if i % 3 == 1:
-                moving_plats.append(MovingPlatform(500, 500, 100, 15, move_x_range=150, speed=2))
-            if i % 4 == 2:
-                moving_plats.append(MovingPlatform(800, 400, 100, 15, move_y_range=200, speed=2))
-            
-            # More enemies in later levels — mix of types!
-            enemies_list = []
-            num_enemies = (i - 15) // 2 + 1
-            for k in range(num_enemies):
-                enemy_x = 300 + k * 350
-                enemy_y = 630 - (k % 4) * 80
-                # Rotate enemy types based on level and position
-                etype = (i + k) % 4
-                if etype == 0:   enemies_list.append(Enemy(enemy_x, enemy_y, 80))
-                elif etype == 1: enemies_list.append(FastEnemy(enemy_x, enemy_y, 100))
-                elif etype == 2: enemies_list.append(ShieldEnemy(enemy_x, enemy_y, 70))
-                else:            enemies_list.append(JumperEnemy(enemy_x, enemy_y, 90))
-            
-            # More coins!
-            coins_list = []
-            num_coins = min(10, i - 14)
-            for j in range(num_coins):
-                coin_x = 300 + j * 220
-                coin_y = 620 - (j % 5) * 60
-                coins_list.append(Coin(coin_x, coin_y))
-            
-            # Power-ups every 3 levels
-            power_ups_list = []
-            if i % 3 == 0:
-                power_ups_list.append(PowerUp(x - 400, y - 80, ['speed', 'invincible', 'mega_jump'][(i // 3) % 3]))
-            
-            # More spikes in later levels!
-            spikes_list = []
-            num_spike_groups = (i - 15) // 3
-            for k in range(num_spike_groups):
-                spike_x = 400 + k * 400
-                spikes_list.append(Spike(spike_x, 680))
-                spikes_list.append(Spike(spike_x + 20, 680))
-                if i > 25:  # Extra spikes in final levels
-                    spikes_list.append(Spike(spike_x + 40, 680))
-            
-            level = {
-                'platforms': platforms,
-                'moving_platforms': moving_plats,
-                'enemies': enemies_list,
-                'coins': coins_list,
-                'power_ups': power_ups_list,
-                'spikes': spikes_list,
-                'spawn': (50, 650),
-                'exit': (x + 100, y - 50),
-                'boss': None,
-                'flying_boss': None,
-                'world': 'woods'
-            }
-            levels.append(level)
-        
-        return levels
-        
-        return levels
+        platforms = [pygame.Rect(0, 700, 200, 68)]
+        x, y = 250, 650
+        num_platforms = 15 + (i - 16)
+
+        # Different pattern for each level!
+        pattern = (i - 16) % 5
+
+        for j in range(num_platforms):
+            platform_width = 120 if pattern != 2 else 80  # Narrower platforms on pattern 2
+            platforms.append(pygame.Rect(x, y, platform_width, 20))
+
+            # Different movement patterns!
+            if pattern == 0:  # Stairs up
+                x += 180
+                y -= 60 if j % 2 == 0 else -20
+            elif pattern == 1:  # Zigzag
+                x += 200
+                y -= 70 if j % 3 == 0 else (-50 if j % 3 == 1 else 40)
+            elif pattern == 2:  # Narrow jumps
+                x += 220
+                y -= 50 if j % 2 == 0 else -30
+            elif pattern == 3:  # Wide gaps
+                x += 240
+                y -= 55 if j % 2 == 0 else -35
+            else:  # Pattern 4 - mixed
+                x += 190 + (j % 3) * 10
+                y -= 65 if j % 2 == 0 else -25
+
+            # Keep in bounds
+            if y < 250: y = 350
+            if y > 650: y = 550
+
+        platforms.append(pygame.Rect(x, y, 300, 768 - y))
+
+        # More varied moving platforms!
+        moving_plats = []
+        if i % 3 == 1:
+            moving_plats.append(MovingPlatform(500, 500, 100, 15, move_x_range=150, speed=2))
+        if i % 4 == 2:
+            moving_plats.append(MovingPlatform(800, 400, 100, 15, move_y_range=200, speed=2))
+
+        # More enemies in later levels — mix of types!
+        enemies_list = []
+        num_enemies = (i - 15) // 2 + 1
+        for k in range(num_enemies):
+            enemy_x = 300 + k * 350
+            enemy_y = 630 - (k % 4) * 80
+            # Rotate enemy types based on level and position
+            etype = (i + k) % 4
+            if etype == 0:   enemies_list.append(Enemy(enemy_x, enemy_y, 80))
+            elif etype == 1: enemies_list.append(FastEnemy(enemy_x, enemy_y, 100))
+            elif etype == 2: enemies_list.append(ShieldEnemy(enemy_x, enemy_y, 70))
+            else:            enemies_list.append(JumperEnemy(enemy_x, enemy_y, 90, rng))
+
+        # More coins!
+        coins_list = []
+        num_coins = min(10, i - 14)
+        for j in range(num_coins):
+            coin_x = 300 + j * 220
+            coin_y = 620 - (j % 5) * 60
+            coins_list.append(Coin(coin_x, coin_y))
+
+        # Power-ups every 3 levels
+        power_ups_list = []
+        if i % 3 == 0:
+            power_ups_list.append(PowerUp(x - 400, y - 80, ['speed', 'invincible', 'mega_jump'][(i // 3) % 3]))
+
+        # More spikes in later levels!
+        spikes_list = []
+        num_spike_groups = (i - 15) // 3
+        for k in range(num_spike_groups):
+            spike_x = 400 + k * 400
+            spikes_list.append(Spike(spike_x, 680))
+            spikes_list.append(Spike(spike_x + 20, 680))
+            if i > 25:  # Extra spikes in final levels
+                spikes_list.append(Spike(spike_x + 40, 680))
+
+        return {
+            'platforms': platforms,
+            'moving_platforms': moving_plats,
+            'enemies': enemies_list,
+            'coins': coins_list,
+            'power_ups': power_ups_list,
+            'spikes': spikes_list,
+            'spawn': (50, 650),
+            'exit': (x + 100, y - 50),
+            'boss': None,
+            'flying_boss': None,
+            'world': 'woods'
+        }
     
     def load_level(self, level_index):
         if level_index >= len(self.levels):
             self.game_completed = True
             return
         level = self.levels[level_index]
-        self.platforms = level['platforms'] + level.get('moving_platforms', [])
+        self.reset_level_state(level)
         self.moving_platforms = level.get('moving_platforms', [])
+        self.platforms = PlatformGrid(level['platforms'], self.moving_platforms)
         self.enemies = level['enemies'][:]
         self.boss = level.get('boss')
         self.flying_boss = level.get('flying_boss')
         self.coins = level['coins'][:]
-        self.power_ups = level.get('power_ups', [])
+        self.power_ups = level.get('power_ups', [])[:]
         self.spikes = level['spikes'][:]
         self.player = Player(*level['spawn'])
         self.player.color = getattr(self, 'color_equipped', BLUE)
@@ -1634,6 +1650,7 @@ class Game:
         self.total_coins = len(self.coins)
         self.boss_defeated = False
         self.npcs = level.get('npcs', [])[:]
+        self.load_static_layer(level)
         # Level name banner
         self.level_banner_timer = 180
         self.level_banner_name  = self.LEVEL_NAMES.get(level_index, f"Level {level_index+1}")
@@ -1663,10 +1680,54 @@ class Game:
         if level_index % 3 == 0 and len(plats) > 3:
             gp = plats[len(plats)//2]
             self.gems.append(Gem(gp.x + gp.width//2 - 8, gp.y - 30, (level_index+2) % 4))
+        # Decode the cutscene that follows this level while it's being played
+        cutscene = CUTSCENES.get(level_index + 1)
+        if cutscene and cutscene not in self.cutscenes_seen:
+            self.audio.preload(f'cutscene{cutscene}')
+        self.audio.preload('cutscene1')  # ESC or the end of the run goes back to the intro
+        self.build_cull_index()
     
+    def add_floaty_text(self, x, y, vy, text, col, life):
+        """A label rising from world (x, y) that fades out over life ticks; rendered once, here."""
+        self.floaty_texts.spawn(FONTS.get(28).render(text, True, col), x, y, vy, life)
+
+    def begin_run(self, level_index, seed=None, player_health=None):
+        """Start a level from a known state: fresh level objects, reseeded RNG, no leftovers.
+
+        Level index -1 is the tutorial. Two runs begun with the same arguments
+        and fed the same TickInputs play out identically.
+        """
+        self.seed = seed if seed is not None else random.randrange(1 << 32)
+        self.rng.seed(self.seed)
+        self.particles.seed(self.seed)
+        self.particles.clear()
+        self.levels = self.create_levels()
+        self.tutorial_level = self.create_tutorial_level()
+        self.combo = 0; self.combo_timer = 0
+        self.dash_cd = 0; self.dash_timer = 0
+        self.shake_timer = 0; self.coin_magnet = 0
+        self.level_timer = 0
+        self.floaty_texts.clear()
+        self.weather.reset(self.seed)
+        self.paused = False
+        self.game_over = False; self.game_over_timer = 0
+        if level_index < 0:
+            self.current_level = 0  # Fixed, so the tutorial never depends on the last level played
+            self.load_tutorial_level()
+            self.state = 'tutorial'
+        else:
+            self.current_level = level_index
+            self.load_level(level_index)
+            self.state = 'playing'
+        if player_health is not None:
+            self.player_health = player_health
+        self.camera_x = 0; self.camera_y = 0
+
     def load_tutorial_level(self):
         level = self.tutorial_level
-        self.platforms = level['platforms']
+        self.reset_level_state(level)
+        self.moving_platforms = []
+        self.platforms = PlatformGrid(level['platforms'])
         self.enemies = level['enemies'][:]
         self.boss = level.get('boss')
         self.coins = level['coins'][:]
@@ -1676,14 +1737,103 @@ class Game:
         self.projectiles = []
         self.coins_collected = 0
         self.total_coins = len(self.coins)
+        # Nothing left over from whichever level was loaded before
+        self.flying_boss = None
+        self.power_ups = []
+        self.npcs = []
+        self.gems = []
+        self._sticker_rect = None
+        self.audio.preload('cutscene1')  # ESC goes back to the intro
+        self.load_static_layer(level)
+        self.build_cull_index()
+
+    def reset_level_state(self, level):
+        """Put a level's entities back the way they were built; the first load records that state."""
+        snapshot = level.get('snapshot')
+        if snapshot is None:
+            entities = (level['enemies'] + level['coins'] + level.get('power_ups', [])
+                        + level.get('moving_platforms', []) + level.get('npcs', []))
+            entities += [b for b in (level.get('boss'), level.get('flying_boss')) if b]
+            level['snapshot'] = LevelSnapshot(entities)
+        else:
+            snapshot.restore()
+
+    def load_static_layer(self, level):
+        """Reuse the baked tiles and mini-map when the same level is loaded again (retry after game over)."""
+        if getattr(self, 'static_layer_level', None) is not level:
+            self.static_layer = self.build_static_layer()
+            self.mini_map = self.build_mini_map()
+            self.static_layer_level = level
+        else:
+            self.mini_map.invalidate()  # Its last overlay shows the previous attempt
+
+    def build_cull_index(self):
+        """Grid up the things that (mostly) stay put, so drawing can skip the off-screen ones."""
+        self.coin_index = SpatialIndex(self.coins)
+        self.gem_index = SpatialIndex(getattr(self, 'gems', []))
+        self.power_up_index = SpatialIndex(getattr(self, 'power_ups', []))
+        self.npc_index = SpatialIndex(getattr(self, 'npcs', []))
+        self.culled = 0  # Entities skipped by the last frame's draw
+
+    def build_static_layer(self):
+        """Platforms, spikes and the exit, baked into tiles the first time they're on screen."""
+        layer = StaticLayer()
+        def draw_platform(surf, camera_x, camera_y, platform):
+            # Two fills rather than draw.rect(..., 2): a clipped outlined rect
+            # would grow a border along the tile edge. fill() mishandles rects
+            # hanging off the left/top, hence the explicit clip.
+            r = platform.move(-camera_x, -camera_y)
+            bounds = surf.get_rect()
+            surf.fill(GRAY, r.clip(bounds))
+            surf.fill(PLATFORM_COLOR, r.inflate(-4, -4).clip(bounds))
+        for platform in self.platforms.static:
+            layer.add(platform, lambda surf, cx, cy, p=platform: draw_platform(surf, cx, cy, p))
+        for spike in self.spikes:
+            layer.add(spike.rect, spike.draw)
+        exit_rect = self.exit_rect
+        layer.add(exit_rect, lambda surf, cx, cy: pygame.draw.rect(surf, GREEN, exit_rect.move(-cx, -cy)))
+        return layer
+
+    def build_mini_map(self):
+        """Mini-map bounds from where everything starts, with the static shapes painted in."""
+        things = list(self.platforms) + self.enemies + self.coins + self.spikes
+        if self.boss:
+            things.append(self.boss)
+        bounds = [(t.x, t.y, t.width, t.height) for t in things]
+        bounds.append((self.player.x, self.player.y, 20, 20))
+        bounds.append((self.exit_rect.x, self.exit_rect.y, 40, 40))
+        mini_map = MiniMap(MINI_MAP_SIZE, bounds, DARK_GRAY, WHITE)
+        for platform in self.platforms.static:
+            mini_map.paint(WHITE, platform.x, platform.y, platform.width, platform.height)
+        for spike in self.spikes:
+            mini_map.paint(GRAY, spike.x, spike.y, spike.width, spike.height)
+        mini_map.paint(GREEN, self.exit_rect.x, self.exit_rect.y, 40, 40)
+        return mini_map
     
     def update_camera(self):
-        target_x = self.player.x - SCREEN_WIDTH // 2 if self.state in ['playing', 'tutorial'] else self.camera_x
-        target_y = self.player.y - SCREEN_HEIGHT // 2 if self.state in ['playing', 'tutorial'] else self.camera_y
-        self.camera_x += (target_x - self.camera_x) * 0.1
-        self.camera_y += (target_y - self.camera_y) * 0.1
-        self.camera_y = max(self.camera_y, -200)
+        if self.state in ['playing', 'tutorial']:
+            self.camera_x = follow(self.camera_x, self.player.x - SCREEN_WIDTH // 2)
+            self.camera_y = follow(self.camera_y, self.player.y - SCREEN_HEIGHT // 2, low=-200)
+        else:
+            self.camera_y = max(self.camera_y, -200)
     
+    def draw_gradient(self, top_col, bot_col):
+        """Blit a full-screen vertical gradient, rendering it only once per size/colour pair."""
+        size = self.screen.get_size()
+        key = (size, tuple(top_col), tuple(bot_col))
+        surf = self.gradient_cache.get(key)
+        if surf is None:
+            w, h = size
+            surf = pygame.Surface(size).convert()
+            for y in range(h):
+                p = y / h
+                r = int(top_col[0] + (bot_col[0]-top_col[0])*p)
+                g = int(top_col[1] + (bot_col[1]-top_col[1])*p)
+                b = int(top_col[2] + (bot_col[2]-top_col[2])*p)
+                pygame.draw.line(surf, (r, g, b), (0, y), (w, y))
+            self.gradient_cache[key] = surf
+        self.screen.blit(surf, (0, 0))
+
     def draw_background(self):
         # Check if we're in grass world!
         is_grass_world = False
@@ -1692,12 +1842,7 @@ class Game:
         
         if is_grass_world:
             # WOODS WORLD - Brown/green forest theme!
-            for i in range(SCREEN_HEIGHT):
-                progress = i / SCREEN_HEIGHT
-                r = int(60 + progress * 30)
-                g = int(80 + progress * 60)
-                b = int(40 + progress * 20)
-                pygame.draw.line(self.screen, (r, g, b), (0, i), (SCREEN_WIDTH, i))
+            self.draw_gradient((60, 80, 40), (90, 140, 60))
             
             # Tree silhouettes
             for i in range(15):
@@ -1717,12 +1862,7 @@ class Game:
                                (int(particle_x), int(particle_y), 6, 4))
         else:
             # Normal world - Epic gradient sky
-            for i in range(SCREEN_HEIGHT):
-                progress = i / SCREEN_HEIGHT
-                r = int(20 + progress * 20)
-                g = int(20 + progress * 30)
-                b = int(60 + progress * 80)
-                pygame.draw.line(self.screen, (r, g, b), (0, i), (SCREEN_WIDTH, i))
+            self.draw_gradient((20, 20, 60), (40, 50, 140))
             
             # Distant stars (parallax effect)
             for i in range(50):
@@ -1761,103 +1901,22 @@ class Game:
             self.draw_clouds()
     
     def draw_mini_map(self):
-        level = {
-            'platforms': self.platforms,
-            'enemies': self.enemies,
-            'boss': self.boss,
-            'coins': self.coins,
-            'spikes': self.spikes,
-            'spawn': (self.player.x, self.player.y),
-            'exit': (self.exit_rect.x, self.exit_rect.y)
-        }
-        map_width = 200
-        map_height = 150
-        map_x = SCREEN_WIDTH - map_width - 10
-        map_y = SCREEN_HEIGHT - map_height - 10
-        
-        min_x = float('inf')
-        min_y = float('inf')
-        max_x = float('-inf')
-        max_y = float('-inf')
-        
-        if level['platforms']:
-            min_x = min(min_x, min(p.x for p in level['platforms']))
-            min_y = min(min_y, min(p.y for p in level['platforms']))
-            max_x = max(max_x, max(p.x + p.width for p in level['platforms']))
-            max_y = max(max_y, max(p.y + p.height for p in level['platforms']))
-        for enemy in level['enemies']:
-            min_x = min(min_x, enemy.x)
-            min_y = min(min_y, enemy.y)
-            max_x = max(max_x, enemy.x + enemy.width)
-            max_y = max(max_y, enemy.y + enemy.height)
-        if level['boss']:
-            min_x = min(min_x, level['boss'].x)
-            min_y = min(min_y, level['boss'].y)
-            max_x = max(max_x, level['boss'].x + level['boss'].width)
-            max_y = max(max_y, level['boss'].y + level['boss'].height)
-        for coin in level['coins']:
-            min_x = min(min_x, coin.x)
-            min_y = min(min_y, coin.y)
-            max_x = max(max_x, coin.x + coin.width)
-            max_y = max(max_y, coin.y + coin.height)
-        for spike in level['spikes']:
-            min_x = min(min_x, spike.x)
-            min_y = min(min_y, spike.y)
-            max_x = max(max_x, spike.x + spike.width)
-            max_y = max(max_y, spike.y + spike.height)
-        min_x = min(min_x, level['spawn'][0], level['exit'][0])
-        min_y = min(min_y, level['spawn'][1], level['exit'][1])
-        max_x = max(max_x, level['spawn'][0] + 20, level['exit'][0] + 40)
-        max_y = max(max_y, level['spawn'][1] + 20, level['exit'][1] + 40)
-        
-        if min_x == float('inf'):
-            min_x, min_y = 0, 0
-            max_x, max_y = SCREEN_WIDTH, SCREEN_HEIGHT
-        
-        padding = 50
-        min_x -= padding
-        min_y -= padding
-        max_x += padding
-        max_y += padding
-        
-        level_width = max_x - min_x
-        level_height = max_y - min_y
-        scale_x = map_width / level_width if level_width > 0 else 0.1
-        scale_y = map_height / level_height if level_height > 0 else 0.1
-        scale = min(scale_x, scale_y, 0.1)
-        
-        pygame.draw.rect(self.screen, DARK_GRAY, (map_x, map_y, map_width, map_height))
-        pygame.draw.rect(self.screen, WHITE, (map_x, map_y, map_width, map_height), 2)
-        for platform in level['platforms']:
-            scaled_x = map_x + (platform.x - min_x) * scale
-            scaled_y = map_y + (platform.y - min_y) * scale
-            scaled_w = platform.width * scale
-            scaled_h = platform.height * scale
-            pygame.draw.rect(self.screen, WHITE, (scaled_x, scaled_y, scaled_w, scaled_h))
-        for enemy in level['enemies']:
-            scaled_x = map_x + (enemy.x - min_x) * scale
-            scaled_y = map_y + (enemy.y - min_y) * scale
-            pygame.draw.rect(self.screen, RED, (scaled_x, scaled_y, enemy.width * scale, enemy.height * scale))
-        if level['boss']:
-            scaled_x = map_x + (level['boss'].x - min_x) * scale
-            scaled_y = map_y + (level['boss'].y - min_y) * scale
-            pygame.draw.rect(self.screen, PURPLE, (scaled_x, scaled_y, level['boss'].width * scale, level['boss'].height * scale))
-        for coin in level['coins']:
+        self.mini_map.draw(self.screen, (SCREEN_WIDTH - MINI_MAP_SIZE[0] - 10, SCREEN_HEIGHT - MINI_MAP_SIZE[1] - 10),
+                           self.mini_map_markers())
+
+    def mini_map_markers(self):
+        """What moves on the mini-map, as (colour, x, y, width, height)."""
+        for platform in self.platforms.dynamic:
+            yield WHITE, platform.x, platform.y, platform.width, platform.height
+        for enemy in self.enemies:
+            yield RED, enemy.x, enemy.y, enemy.width, enemy.height
+        if self.boss:
+            yield PURPLE, self.boss.x, self.boss.y, self.boss.width, self.boss.height
+        for coin in self.coins:
             if not coin.collected:
-                scaled_x = map_x + (coin.x - min_x) * scale
-                scaled_y = map_y + (coin.y - min_y) * scale
-                pygame.draw.rect(self.screen, YELLOW, (scaled_x, scaled_y, coin.width * scale, coin.height * scale))
-        for spike in level['spikes']:
-            scaled_x = map_x + (spike.x - min_x) * scale
-            scaled_y = map_y + (spike.y - min_y) * scale
-            pygame.draw.rect(self.screen, GRAY, (scaled_x, scaled_y, spike.width * scale, spike.height * scale))
-        scaled_x = map_x + (level['exit'][0] - min_x) * scale
-        scaled_y = map_y + (level['exit'][1] - min_y) * scale
-        pygame.draw.rect(self.screen, GREEN, (scaled_x, scaled_y, 40 * scale, 40 * scale))
-        scaled_x = map_x + (level['spawn'][0] - min_x) * scale
-        scaled_y = map_y + (level['spawn'][1] - min_y) * scale
-        pygame.draw.rect(self.screen, BLUE, (scaled_x, scaled_y, 20 * scale, 20 * scale))
-    
+                yield YELLOW, coin.x, coin.y, coin.width, coin.height
+        yield BLUE, self.player.x, self.player.y, 20, 20
+
     def draw_ui(self):
         t = pygame.time.get_ticks() * 0.001
 
@@ -1867,18 +1926,18 @@ class Game:
         self.screen.blit(panel, (8, 8))
         pygame.draw.rect(self.screen, (60, 80, 160), (8, 8, 260, 90), 2)
 
-        font_hud = pygame.font.Font(None, 28)
-        font_sm  = pygame.font.Font(None, 22)
+        font_hud = FONTS.get(28)
+        font_sm  = FONTS.get(22)
 
         world_name = "🌲 WOODS WORLD" if self.current_level >= 15 else "⭐ NORMAL WORLD"
         world_col  = GREEN if self.current_level >= 15 else CYAN
-        world_surf = font_hud.render(world_name, True, world_col)
+        world_surf = FONTS.render(font_hud, world_name, True, world_col)
         self.screen.blit(world_surf, (16, 15))
 
-        lv_surf = font_hud.render(f"Level  {self.current_level + 1} / 30", True, WHITE)
+        lv_surf = FONTS.render(font_hud, f"Level  {self.current_level + 1} / 30", True, WHITE)
         self.screen.blit(lv_surf, (16, 40))
 
-        coin_surf = font_hud.render(f"Coins  {self.coins_collected} / {self.total_coins}", True, YELLOW)
+        coin_surf = FONTS.render(font_hud, f"Coins  {self.coins_collected} / {self.total_coins}", True, YELLOW)
         self.screen.blit(coin_surf, (16, 65))
 
         # ── Power-up status bars ────────────────────────────────────────────
@@ -1897,11 +1956,11 @@ class Game:
             pygame.draw.rect(self.screen, col, (bar_x, bar_y, fill, 22))
             pygame.draw.rect(self.screen, WHITE, (bar_x, bar_y, bar_w, 22), 1)
             # Label
-            s = font_sm.render(label, True, WHITE)
+            s = FONTS.render(font_sm, label, True, WHITE)
             self.screen.blit(s, (bar_x + 4, bar_y + 4))
 
         # ── Controls reminder (bottom right) ───────────────────────────────
-        ctrl = font_sm.render("CTRL=Shoot  SPACE=Jump  P=Pause  J=Journal  ESC=Menu", True, (80, 80, 100))
+        ctrl = FONTS.render(font_sm, "CTRL=Shoot  SPACE=Jump  P=Pause  J=Journal  ESC=Menu", True, (80, 80, 100))
         self.screen.blit(ctrl, (SCREEN_WIDTH - ctrl.get_width() - 10, SCREEN_HEIGHT - 24))
 
         # ── Coin magnet indicator ────────────────────────────────────────────
@@ -1910,23 +1969,23 @@ class Game:
             pygame.draw.rect(self.screen, (20,20,40),(8,200,120,16))
             pygame.draw.rect(self.screen, (100,200,255),(8,200,int(120*pct),16))
             pygame.draw.rect(self.screen, WHITE,(8,200,120,16),1)
-            self.screen.blit(font_sm.render("🧲 MAGNET",True,CYAN),(8,182))
+            self.screen.blit(FONTS.render(font_sm,"🧲 MAGNET",True,CYAN),(8,182))
 
         # ── BOSS DEFEATED banner ────────────────────────────────────────────
         if self.boss_defeated:
             pulse = abs(math.sin(t * 4)) * 80 + 175
-            big_font = pygame.font.Font(None, 68)
+            big_font = FONTS.get(68)
             text = big_font.render("BOSS DEFEATED!", True, (0, int(pulse), 0))
-            shadow = big_font.render("BOSS DEFEATED!", True, BLACK)
+            shadow = FONTS.render(big_font, "BOSS DEFEATED!", True, BLACK)
             cx = SCREEN_WIDTH // 2 - text.get_width() // 2
             self.screen.blit(shadow, (cx + 3, 153))
             self.screen.blit(text,   (cx,     150))
-            med_font = pygame.font.Font(None, 36)
-            t2 = med_font.render("Head to the GREEN EXIT! ▶", True, YELLOW)
+            med_font = FONTS.get(36)
+            t2 = FONTS.render(med_font, "Head to the GREEN EXIT! ▶", True, YELLOW)
             self.screen.blit(t2, (SCREEN_WIDTH // 2 - t2.get_width() // 2, 225))
     
     def draw_tutorial_ui(self):
-        font = pygame.font.Font(None, 36)
+        font = FONTS.get(36)
         steps = [
             ("Use LEFT/RIGHT or A/D to move", self.player.x > 100),
             ("Press SPACE to jump", self.player.y < 600),
@@ -1937,7 +1996,7 @@ class Game:
         ]
         current_step = min(self.tutorial_step, len(steps) - 1)
         instruction, condition = steps[current_step]
-        text = font.render(instruction, True, YELLOW)
+        text = FONTS.render(font, instruction, True, YELLOW)
         pygame.draw.rect(self.screen, BLACK, (SCREEN_WIDTH // 2 - text.get_width() // 2 - 10, 
                                             50 - 10, text.get_width() + 20, text.get_height() + 20))
         self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, 50))
@@ -1961,31 +2020,31 @@ class Game:
             alpha = min(255, t * 4)
             
             # Glowing title
-            for glow in range(3, 0, -1):
-                font_big = pygame.font.Font(None, 72 + glow * 4)
+            for offset in range(3, 0, -1):
+                font_big = FONTS.get(72 + offset * 4)
                 glow_surf = font_big.render("MINIMAL PLATFORMER 4", True, (0, 0, min(255, alpha // 2)))
-                self.screen.blit(glow_surf, (SCREEN_WIDTH // 2 - glow_surf.get_width() // 2 + glow, 180 - drop + glow))
+                self.screen.blit(glow_surf, (SCREEN_WIDTH // 2 - glow_surf.get_width() // 2 + offset, 180 - drop + offset))
             
-            font_big = pygame.font.Font(None, 72)
+            font_big = FONTS.get(72)
             text = font_big.render("MINIMAL PLATFORMER 4", True, (alpha // 2, alpha // 2, alpha))
             self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, 180 - drop))
             
             if t > 30:
                 a2 = min(255, (t - 30) * 5)
-                font_sub = pygame.font.Font(None, 48)
+                font_sub = FONTS.get(48)
                 subtitle = font_sub.render("T H E   R E D   U P R I S I N G", True, (a2, a2 // 3, a2 // 3))
                 self.screen.blit(subtitle, (SCREEN_WIDTH // 2 - subtitle.get_width() // 2, 270))
             
             if t > 60:
                 a3 = min(255, (t - 60) * 4)
-                font_tiny = pygame.font.Font(None, 26)
+                font_tiny = FONTS.get(26)
                 press = font_tiny.render("press SPACE to skip", True, (a3 // 3, a3 // 3, a3 // 3))
                 self.screen.blit(press, (SCREEN_WIDTH // 2 - press.get_width() // 2, SCREEN_HEIGHT - 50))
 
         elif t < 240:
             # Scene 2: Animated story with characters
             local_t = t - 120
-            font = pygame.font.Font(None, 34)
+            font = FONTS.get(34)
             story_lines = [
                 ("Long ago, the world was full of color...", WHITE, 0),
                 ("Blue Guy and his friends lived in peace.", (100, 180, 255), 20),
@@ -2028,13 +2087,13 @@ class Game:
             local_t = t - 240
             alpha = min(255, local_t * 6)
 
-            font_big = pygame.font.Font(None, 64)
+            font_big = FONTS.get(64)
             text1 = font_big.render("Only BLUE GUY can save the world!", True, (alpha // 2, alpha // 2, alpha))
             self.screen.blit(text1, (SCREEN_WIDTH // 2 - text1.get_width() // 2, 200))
 
             if local_t > 30:
                 a2 = min(255, (local_t - 30) * 6)
-                font_med = pygame.font.Font(None, 40)
+                font_med = FONTS.get(40)
                 text2 = font_med.render("Defeat Red Guy! Restore the colors!", True, (a2, a2 // 3, a2 // 3))
                 self.screen.blit(text2, (SCREEN_WIDTH // 2 - text2.get_width() // 2, 280))
 
@@ -2052,22 +2111,19 @@ class Game:
 
             if local_t > 60:
                 a3 = min(255, (local_t - 60) * 8)
-                font_big2 = pygame.font.Font(None, 80)
+                font_big2 = FONTS.get(80)
                 text3 = font_big2.render("YOUR ADVENTURE BEGINS!", True, (a3, a3, 0))
                 self.screen.blit(text3, (SCREEN_WIDTH // 2 - text3.get_width() // 2, 380))
 
         # Falling star particles
         if t % 4 == 0:
-            self.particles.append(Particle(
+            self.particles.emit(
                 random.randint(0, SCREEN_WIDTH), -10,
                 random.uniform(-0.5, 0.5), random.uniform(1.5, 3.5),
-                (100, 150, 255) if random.random() > 0.4 else (255, 80, 80), 80
-            ))
-        for particle in self.particles[:]:
-            particle.update()
-            particle.draw(self.screen)
-            if particle.life <= 0:
-                self.particles.remove(particle)
+                (100, 150, 255) if random.random() > 0.4 else (255, 80, 80), 80, 'ambient'
+            )
+        self.particles.update()
+        self.particles.draw(self.screen)
     
     def draw_cutscene(self):
         """Draw mid-game cutscenes - fully animated!"""
@@ -2075,15 +2131,10 @@ class Game:
         s = self.screen
 
         def gradient(top_col, bot_col):
-            for y in range(SCREEN_HEIGHT):
-                p = y / SCREEN_HEIGHT
-                r = int(top_col[0] + (bot_col[0]-top_col[0])*p)
-                g = int(top_col[1] + (bot_col[1]-top_col[1])*p)
-                b = int(top_col[2] + (bot_col[2]-top_col[2])*p)
-                pygame.draw.line(s,(r,g,b),(0,y),(SCREEN_WIDTH,y))
+            self.draw_gradient(top_col, bot_col)
 
         def speech(text, x, y, col, bdr, w=420):
-            f = pygame.font.Font(None, 32)
+            f = FONTS.get(32)
             surf = f.render(text, True, col)
             bx = x - surf.get_width()//2 - 14
             pygame.draw.rect(s, bdr, (bx-2,y-12,surf.get_width()+32,42), 0, 10)
@@ -2142,7 +2193,7 @@ class Game:
             # Window reflection
             pygame.draw.line(s,WHITE,(563,423),(575,435),3)
             pygame.draw.line(s,WHITE,(563,430),(571,438),2)
-            fb = pygame.font.Font(None,38)
+            fb = FONTS.get(38)
             rb = fb.render("GAS STOP",True,WHITE)
             s.blit(rb,(SCREEN_WIDTH//2-rb.get_width()//2,341))
             # Blue guy walking in
@@ -2212,7 +2263,7 @@ class Game:
                 pygame.draw.rect(s,(120,80,40),(550,430,8,130))
                 pygame.draw.rect(s,(160,110,60),(480,420,140,44),0,6)
                 pygame.draw.rect(s,(100,70,30),(480,420,140,44),2,6)
-                fn2=pygame.font.Font(None,26)
+                fn2=FONTS.get(26)
                 s.blit(fn2.render("LONG ROAD",True,(40,20,10)),(492,430))
                 s.blit(fn2.render("→ 24 more lvls",True,(80,40,20)),(486,448))
             # Tumbleweeds rolling across
@@ -2265,13 +2316,13 @@ class Game:
                 s.blit(rg_surf,(SCREEN_WIDTH-80,490))
                 if t > 110:
                     fa=min(255,(t-110)*6)
-                    fev=pygame.font.Font(None,20)
+                    fev=FONTS.get(20)
                     ws=fev.render("???",True,(220,40,40))
                     ws.set_alpha(fa)
                     s.blit(ws,(SCREEN_WIDTH-72,478))
             # SPACE to skip hint
             if t > 100:
-                fsk=pygame.font.Font(None,24)
+                fsk=FONTS.get(24)
                 sk=fsk.render("SPACE to skip",True,(120,120,120))
                 s.blit(sk,(SCREEN_WIDTH//2-sk.get_width()//2,SCREEN_HEIGHT-30))
 
@@ -2305,7 +2356,7 @@ class Game:
             pygame.draw.rect(s,(130,190,230),(510,410,80,75),0,4)  # window
             pygame.draw.line(s,WHITE,(514,414),(526,428),3)
             pygame.draw.line(s,WHITE,(514,422),(522,430),2)
-            fb=pygame.font.Font(None,34)
+            fb=FONTS.get(34)
             rb=fb.render("GAS  STOP",True,WHITE)
             s.blit(rb,(SCREEN_WIDTH//2-rb.get_width()//2,330))
             # Fuel pump
@@ -2380,7 +2431,7 @@ class Game:
 
             # SPACE to skip
             if t > 80:
-                fsk=pygame.font.Font(None,24)
+                fsk=FONTS.get(24)
                 sk=fsk.render("SPACE to skip",True,(120,120,120))
                 s.blit(sk,(SCREEN_WIDTH//2-sk.get_width()//2,SCREEN_HEIGHT-30))
 
@@ -2420,7 +2471,7 @@ class Game:
                        700,380,(255,a2//3,a2//3),(60,10,10))
             if t>115:
                 a3=min(255,(t-115)*8)
-                fb2=pygame.font.Font(None,72)
+                fb2=FONTS.get(72)
                 fs2=fb2.render("FIGHT!",True,(255,a3,0))
                 s.blit(fs2,(SCREEN_WIDTH//2-fs2.get_width()//2,200))
                 # Shockwave
@@ -2532,7 +2583,7 @@ class Game:
             # Text
             if t>10:
                 a=min(255,(t-10)*5)
-                fb3=pygame.font.Font(None,76)
+                fb3=FONTS.get(76)
                 fts=fb3.render("FINAL BATTLE",True,(255,a//4,0))
                 s.blit(fts,(SCREEN_WIDTH//2-fts.get_width()//2,80))
             if t>50:
@@ -2546,20 +2597,30 @@ class Game:
                 speech("Blue Guy:  I don't think so!",280,310,(a4,a4,255),(20,20,60))
             if t>160:
                 a5=min(255,(t-160)*10)
-                fb4=pygame.font.Font(None,52)
+                fb4=FONTS.get(52)
                 fts2=fb4.render("USE YOUR GUN!  CTRL = SHOOT",True,(a5,a5,0))
                 s.blit(fts2,(SCREEN_WIDTH//2-fts2.get_width()//2,370))
 
         # Skip prompt
         if t > 100:
             pulse = int(abs(math.sin(t*0.06))*110+100)
-            fp=pygame.font.Font(None,26)
+            fp=FONTS.get(26)
             ps=fp.render("SPACE to skip",True,(pulse,pulse,pulse))
             s.blit(ps,(SCREEN_WIDTH//2-ps.get_width()//2,SCREEN_HEIGHT-45))
     
+    def bake_sprites(self):
+        """Pre-render character and hat frames (Player re-bakes itself if its colour changes)."""
+        Player.bake(self.color_equipped)
+        for cls in (Enemy, FastEnemy, ShieldEnemy, JumperEnemy, Boss, FlyingBoss):
+            cls.bake()
+        self.hat_sprites = SpriteSheet(self.paint_hat, HAT_BOUNDS, [(hat['key'],) for hat in self.HATS])
+
     def _draw_hat_at(self, hat_key, px, py):
         """Draw equipped hat above player."""
-        s = self.screen
+        self.hat_sprites.blit(self.screen, (hat_key,), px, py)
+
+    @staticmethod
+    def paint_hat(s, px, py, hat_key):
         if hat_key == 'party':
             pts = [(px+10, py-18), (px+2, py+2), (px+18, py+2)]
             pygame.draw.polygon(s, (255, 80, 200), pts)
@@ -2594,7 +2655,7 @@ class Game:
         t = pygame.time.get_ticks() * 0.001
 
         # Title
-        f = pygame.font.Font(None, 54)
+        f = FONTS.get(54)
         ts = f.render("WORLD MAP", True, WHITE)
         s.blit(ts, (SCREEN_WIDTH//2 - ts.get_width()//2, 18))
 
@@ -2603,8 +2664,8 @@ class Game:
             {'name':'Normal World','col':(60,80,160),'levels':range(0,15),'x':60,'y':80},
             {'name':'Woods World', 'col':(40,100,40),'levels':range(15,30),'x':540,'y':80},
         ]
-        fn = pygame.font.Font(None, 26)
-        fb = pygame.font.Font(None, 20)
+        fn = FONTS.get(26)
+        fb = FONTS.get(20)
 
         for w in worlds:
             # World panel
@@ -2636,7 +2697,7 @@ class Game:
                 if has_sticker:
                     emoji_idx = lv % len(self.sticker_names)
                     try:
-                        ef = pygame.font.SysFont('segoe ui emoji', 16)
+                        ef = FONTS.sys('segoe ui emoji', 16)
                         es = ef.render(self.sticker_names[emoji_idx], True, YELLOW)
                         s.blit(es, (nx + 16, ny - 30))
                     except Exception:
@@ -2646,7 +2707,7 @@ class Game:
                 if lv in (9, 14, 29):
                     bf = fb.render("👑BOSS", True, RED)
                     try:
-                        ef2 = pygame.font.SysFont('segoe ui emoji', 14)
+                        ef2 = FONTS.sys('segoe ui emoji', 14)
                         bf = ef2.render("👑BOSS", True, RED)
                     except Exception:
                         pass
@@ -2656,7 +2717,7 @@ class Game:
         stats_y = SCREEN_HEIGHT - 70
         pygame.draw.rect(s, (20,25,45), (0, stats_y, SCREEN_WIDTH, 70))
         pygame.draw.line(s, (60,80,130), (0, stats_y), (SCREEN_WIDTH, stats_y), 2)
-        fc = pygame.font.Font(None, 30)
+        fc = FONTS.get(30)
         beaten_pct = int(len(self.levels_beaten) / 30 * 100)
         sticker_pct = len(self.stickers_found)
         stats = [
@@ -2669,7 +2730,7 @@ class Game:
             s.blit(ss, (30 + i*340, stats_y + 20))
 
         # Close hint
-        ch = pygame.font.Font(None, 26).render("Press M or ESC to close", True, (100,100,130))
+        ch = FONTS.get(26).render("Press M or ESC to close", True, (100,100,130))
         s.blit(ch, (SCREEN_WIDTH//2 - ch.get_width()//2, stats_y + 44))
 
     def draw_shop(self):
@@ -2683,12 +2744,12 @@ class Game:
         pygame.draw.rect(s, (20, 25, 50), (panel_x, panel_y, panel_w, panel_h), 0, 16)
         pygame.draw.rect(s, (80, 100, 200), (panel_x, panel_y, panel_w, panel_h), 3, 16)
 
-        ft = pygame.font.Font(None, 52)
+        ft = FONTS.get(52)
         ts = ft.render("SHOP", True, YELLOW)
         s.blit(ts, (panel_x + panel_w//2 - ts.get_width()//2, panel_y + 14))
 
         # Coin balance
-        fc = pygame.font.Font(None, 32)
+        fc = FONTS.get(32)
         bal = fc.render(f"💰 {self.shop_coins} coins", True, YELLOW)
         s.blit(bal, (panel_x + panel_w - bal.get_width() - 20, panel_y + 18))
 
@@ -2704,8 +2765,8 @@ class Game:
             s.blit(ts2, (tx + 130 - ts2.get_width()//2, ty + 8))
 
         content_y = panel_y + 115
-        fn = pygame.font.Font(None, 28)
-        fs = pygame.font.Font(None, 22)
+        fn = FONTS.get(28)
+        fs = FONTS.get(22)
 
         if self.shop_tab == 0:
             # Clicker upgrades
@@ -2793,8 +2854,8 @@ class Game:
         pygame.draw.rect(s, (15, 18, 40), (cx, cy, cw, ch), 0, 14)
         pygame.draw.rect(s, (50, 70, 160), (cx, cy, cw, ch), 2, 14)
 
-        fn = pygame.font.Font(None, 24)
-        fs = pygame.font.Font(None, 20)
+        fn = FONTS.get(24)
+        fs = FONTS.get(20)
 
         # Title
         ts = fn.render("👆 CLICK ME!", True, CYAN)
@@ -2895,9 +2956,7 @@ class Game:
         # ── ROOM BACKGROUNDS ────────────────────────────────────────────
         if room == 'living':
             # Warm living room
-            for y in range(SCREEN_HEIGHT):
-                p = y/SCREEN_HEIGHT
-                pygame.draw.line(s,(int(180+p*20),int(140+p*15),int(100+p*10)),(0,y),(SCREEN_WIDTH,y))
+            self.draw_gradient((180,140,100),(200,155,110))
             # Floor
             pygame.draw.rect(s,(120,80,40),(0,580,SCREEN_WIDTH,190))
             # Floor boards
@@ -2939,7 +2998,7 @@ class Game:
                 # Different channels
                 if ch == 0:  # News
                     pygame.draw.rect(s,(0,50,180),(645,305,250,160))
-                    tf=pygame.font.Font(None,22)
+                    tf=FONTS.get(22)
                     ts=tf.render("📺 NEWS: Blue Guy saves world!",True,WHITE)
                     s.blit(ts,(648,350))
                     ts2=tf.render("Red Guy still at large",True,YELLOW)
@@ -2960,7 +3019,7 @@ class Game:
                         for py2 in range(305,465,4):
                             c=random.randint(0,2)*127
                             pygame.draw.rect(s,(c,c,c),(px2,py2,4,4))
-                tf2=pygame.font.Font(None,20)
+                tf2=FONTS.get(20)
                 ch_names=["📡 NEWS","🎨 CARTOONS","⚽ SPORTS","📡 STATIC"]
                 cs2=tf2.render(ch_names[ch],True,WHITE)
                 s.blit(cs2,(648,457))
@@ -2971,14 +3030,14 @@ class Game:
             else:
                 # TV off - reflection
                 pygame.draw.rect(s,(15,15,15),(645,305,250,160))
-                rf=pygame.font.Font(None,24)
+                rf=FONTS.get(24)
                 rs=rf.render("[ off ]",True,(40,40,40))
                 s.blit(rs,(755,375))
             # TV stand
             pygame.draw.rect(s,(50,40,30),(740,480,80,20))
             pygame.draw.rect(s,(50,40,30),(750,500,60,50))
             # TV buttons hint
-            bf=pygame.font.Font(None,20)
+            bf=FONTS.get(20)
             if not self.tv_on:
                 bs=bf.render("Click TV to turn on!",True,(120,100,80))
                 s.blit(bs,(645,510))
@@ -3012,20 +3071,18 @@ class Game:
                 for r2,ox2,oy2 in [(4,50,55),(6,60,42),(9,68,28)]:
                     pygame.draw.circle(s,WHITE,(bg_x+ox2,bg_y-oy2+10),r2)
                 pygame.draw.ellipse(s,WHITE,(bg_x+62,bg_y-65,70,40))
-                tf3=pygame.font.Font(None,18)
+                tf3=FONTS.get(18)
                 ts3=tf3.render("I need a",True,(40,40,80))
                 ts4=tf3.render("vacation...",True,(40,40,80))
                 s.blit(ts3,(bg_x+65,bg_y-62))
                 s.blit(ts4,(bg_x+65,bg_y-46))
             # Room label
-            lf=pygame.font.Font(None,28); ls=lf.render("Living Room",True,(80,50,30))
+            lf=FONTS.get(28); ls=lf.render("Living Room",True,(80,50,30))
             s.blit(ls,(12,16))
 
         elif room == 'bedroom':
             # Night bedroom
-            for y in range(SCREEN_HEIGHT):
-                p=y/SCREEN_HEIGHT
-                pygame.draw.line(s,(int(30+p*15),int(25+p*15),int(50+p*25)),(0,y),(SCREEN_WIDTH,y))
+            self.draw_gradient((30,25,50),(45,40,75))
             pygame.draw.rect(s,(70,55,40),(0,580,SCREEN_WIDTH,190))
             # Bed
             pygame.draw.rect(s,(100,80,60),(200,380,450,220),0,8)  # frame
@@ -3039,7 +3096,7 @@ class Game:
             pygame.draw.ellipse(s,getattr(self,'color_equipped',BLUE),(bg_sx,bg_sy,60,30))
             pygame.draw.circle(s,WHITE,(bg_sx+50,bg_sy+8),10)
             # ZZZ
-            zf=pygame.font.Font(None,28)
+            zf=FONTS.get(28)
             for i,z in enumerate(['z','Z','Z','Z']):
                 zx=bg_sx+55+int(math.sin(t*1.2+i)*5)+i*15
                 zy=bg_sy-20-i*14+int(math.sin(t+i)*3)
@@ -3055,31 +3112,29 @@ class Game:
             # Trophy shelf
             pygame.draw.rect(s,(80,55,35),(680,200,230,20))
             if len(self.levels_beaten) > 0:
-                tf4=pygame.font.Font(None,22)
+                tf4=FONTS.get(22)
                 ts5=tf4.render(f"🏆 x{len(self.levels_beaten)} levels",True,YELLOW)
                 s.blit(ts5,(688,172))
             pygame.draw.rect(s,(140,100,30),(720,160,30,44))  # trophy
             pygame.draw.circle(s,(180,140,40),(735,155),18)
             # Sticker collection wall
             if len(self.stickers_found)>0:
-                sf3=pygame.font.Font(None,22)
+                sf3=FONTS.get(22)
                 ss2=sf3.render(f"Sticker wall: {len(self.stickers_found)}/30",True,(200,200,220))
                 s.blit(ss2,(120,160))
                 for i,lv in enumerate(sorted(self.stickers_found)[:12]):
                     sx4=125+(i%6)*45; sy4=185+(i//6)*40
                     pygame.draw.circle(s,YELLOW,(sx4,sy4),14)
                     pygame.draw.circle(s,(255,240,100),(sx4,sy4),10)
-                    tf5=pygame.font.Font(None,16)
+                    tf5=FONTS.get(16)
                     ts6=tf5.render(str(lv+1),True,(80,60,0))
                     s.blit(ts6,(sx4-8,sy4-7))
-            lf2=pygame.font.Font(None,28); ls2=lf2.render("Bedroom  💤",True,(120,100,150))
+            lf2=FONTS.get(28); ls2=lf2.render("Bedroom  💤",True,(120,100,150))
             s.blit(ls2,(12,16))
 
         elif room == 'kitchen':
             # Bright kitchen
-            for y in range(SCREEN_HEIGHT):
-                p=y/SCREEN_HEIGHT
-                pygame.draw.line(s,(int(220+p*15),int(215+p*10),int(200+p*10)),(0,y),(SCREEN_WIDTH,y))
+            self.draw_gradient((220,215,200),(235,225,210))
             pygame.draw.rect(s,(180,160,120),(0,580,SCREEN_WIDTH,190))
             # Tiles
             for tx2 in range(0,SCREEN_WIDTH,40):
@@ -3126,13 +3181,13 @@ class Game:
             pygame.draw.line(s,GRAY,(bg_kx+20,bg_ky+15),(sx5,sy5),3)
             pygame.draw.circle(s,GRAY,(sx5,sy5),5)
             # Coins on counter (spendable)
-            cf2=pygame.font.Font(None,26)
+            cf2=FONTS.get(26)
             cs3=cf2.render(f"Pantry coins: {self.shop_coins}",True,(80,60,20))
             s.blit(cs3,(300,460))
             # Recipe on wall
             pygame.draw.rect(s,WHITE,(640,200,160,120),0,4)
             pygame.draw.rect(s,(180,160,100),(640,200,160,120),2,4)
-            rf2=pygame.font.Font(None,20)
+            rf2=FONTS.get(20)
             for i,line in enumerate(["📋 TODAY'S RECIPE","","• 1 cup courage","• 2 bullets","• defeat Red Guy"]):
                 rs2=rf2.render(line,True,(60,40,20))
                 s.blit(rs2,(648,208+i*20))
@@ -3143,10 +3198,10 @@ class Game:
                 hv=btn.collidepoint(mx2,my2)
                 pygame.draw.rect(s,(bc[0]+20,bc[1]+20,bc[2]+20) if hv else bc,btn,0,8)
                 pygame.draw.rect(s,WHITE,btn,1,8)
-                ls4=pygame.font.Font(None,26).render(lbl,True,WHITE)
+                ls4=FONTS.get(26).render(lbl,True,WHITE)
                 s.blit(ls4,(btn.centerx-ls4.get_width()//2,btn.centery-ls4.get_height()//2))
             self._mg1_rect=mg1; self._mg2_rect=mg2
-            lf3=pygame.font.Font(None,28); ls3=lf3.render("Kitchen  🍳",True,(80,60,20))
+            lf3=FONTS.get(28); ls3=lf3.render("Kitchen  🍳",True,(80,60,20))
             s.blit(ls3,(12,16))
 
         elif room == 'garden':
@@ -3160,18 +3215,18 @@ class Game:
                 tab=pygame.Rect(tx3,ty3,200,40)
                 pygame.draw.rect(s,bg,tab,0,8)
                 pygame.draw.rect(s,(140,100,60) if active else (80,60,40),tab,2,8)
-                tf6=pygame.font.Font(None,26); ts7=tf6.render(rname,True,WHITE if active else (160,130,100))
+                tf6=FONTS.get(26); ts7=tf6.render(rname,True,WHITE if active else (160,130,100))
                 s.blit(ts7,(tx3+100-ts7.get_width()//2,ty3+10))
                 setattr(self,f'_house_tab_{rid}',tab)
             # Close button
             cb=pygame.Rect(SCREEN_WIDTH-60,10,50,34)
             pygame.draw.rect(s,(120,40,40),cb,0,6)
             pygame.draw.rect(s,RED,cb,2,6)
-            cf=pygame.font.Font(None,26); cs3=cf.render("✕ ESC",True,WHITE)
+            cf=FONTS.get(26); cs3=cf.render("✕ ESC",True,WHITE)
             s.blit(cs3,(SCREEN_WIDTH-58,18))
             self._house_close_rect=cb
             # Coins display
-            fn_c=pygame.font.Font(None,26)
+            fn_c=FONTS.get(26)
             s.blit(fn_c.render(f"💰 {self.shop_coins}",True,YELLOW),(SCREEN_WIDTH-160,18))
             return
 
@@ -3185,7 +3240,7 @@ class Game:
             tab=pygame.Rect(tx3,ty3,200,40)
             pygame.draw.rect(s,bg,tab,0,8)
             pygame.draw.rect(s,(140,100,60) if active else (80,60,40),tab,2,8)
-            tf6=pygame.font.Font(None,26); ts7=tf6.render(rname,True,WHITE if active else (160,130,100))
+            tf6=FONTS.get(26); ts7=tf6.render(rname,True,WHITE if active else (160,130,100))
             s.blit(ts7,(tx3+100-ts7.get_width()//2,ty3+10))
             # Store tab rects
             setattr(self,f'_house_tab_{rid}',tab)
@@ -3197,11 +3252,11 @@ class Game:
         cb=pygame.Rect(SCREEN_WIDTH-60,10,50,34)
         pygame.draw.rect(s,(120,40,40),cb,0,6)
         pygame.draw.rect(s,RED,cb,2,6)
-        cf3=pygame.font.Font(None,26); cs4=cf3.render("✕ ESC",True,WHITE)
+        cf3=FONTS.get(26); cs4=cf3.render("✕ ESC",True,WHITE)
         s.blit(cs4,(SCREEN_WIDTH-58,18))
 
         # Coins display
-        cf4=pygame.font.Font(None,28); cs5=cf4.render(f"💰 {self.shop_coins}",True,YELLOW)
+        cf4=FONTS.get(28); cs5=cf4.render(f"💰 {self.shop_coins}",True,YELLOW)
         s.blit(cs5,(SCREEN_WIDTH-160,18))
 
     def unlock_achievement(self, aid):
@@ -3266,17 +3321,17 @@ class Game:
             s.blit(panel, (px, py))
             # Icon
             try:
-                ef = pygame.font.SysFont('segoe ui emoji', 28)
-                ic = ef.render(pop['icon'], True, WHITE)
+                ef = FONTS.sys('segoe ui emoji', 28)
+                ic = FONTS.render(ef, pop['icon'], True, WHITE)
                 s.blit(ic, (px + 8, py + 16))
             except Exception:
                 pass
             # Text
-            ft = pygame.font.Font(None, 22)
-            fh = pygame.font.Font(None, 18)
-            s.blit(ft.render("Achievement Unlocked!", True, (100, 220, 100)), (px + 44, py + 8))
-            s.blit(ft.render(pop['text'], True, WHITE), (px + 44, py + 26))
-            s.blit(fh.render(pop['desc'], True, (160, 160, 160)), (px + 44, py + 46))
+            ft = FONTS.get(22)
+            fh = FONTS.get(18)
+            s.blit(FONTS.render(ft, "Achievement Unlocked!", True, (100, 220, 100)), (px + 44, py + 8))
+            s.blit(FONTS.render(ft, pop['text'], True, WHITE), (px + 44, py + 26))
+            s.blit(FONTS.render(fh, pop['desc'], True, (160, 160, 160)), (px + 44, py + 46))
 
     def draw_achievements_screen(self):
         """Full achievements overlay."""
@@ -3284,11 +3339,11 @@ class Game:
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 210))
         s.blit(overlay, (0, 0))
-        ft = pygame.font.Font(None, 52)
+        ft = FONTS.get(52)
         ts = ft.render(f"ACHIEVEMENTS  {len(self.achievements_earned)}/{len(self.ACHIEVEMENTS)}", True, YELLOW)
         s.blit(ts, (SCREEN_WIDTH//2 - ts.get_width()//2, 20))
-        fn = pygame.font.Font(None, 26)
-        fd = pygame.font.Font(None, 20)
+        fn = FONTS.get(26)
+        fd = FONTS.get(20)
         cols = 2; col_w = SCREEN_WIDTH // cols
         for i, (aid, (name, desc, icon)) in enumerate(self.ACHIEVEMENTS.items()):
             col = i % cols; row = i // cols
@@ -3300,7 +3355,7 @@ class Game:
             pygame.draw.rect(s, bg,  (ax, ay, col_w - 20, 54), 0, 8)
             pygame.draw.rect(s, bdr, (ax, ay, col_w - 20, 54), 2, 8)
             try:
-                ef = pygame.font.SysFont('segoe ui emoji', 22)
+                ef = FONTS.sys('segoe ui emoji', 22)
                 ic = ef.render(icon if earned else '🔒', True, WHITE)
                 s.blit(ic, (ax + 8, ay + 14))
             except Exception:
@@ -3310,7 +3365,7 @@ class Game:
             s.blit(fd.render(desc if earned else 'Keep playing to unlock', True, (120,120,120) if not earned else (160,180,160)), (ax + 44, ay + 32))
             if earned:
                 s.blit(fd.render("+10 🪙", True, YELLOW), (ax + col_w - 80, ay + 18))
-        fh = pygame.font.Font(None, 24)
+        fh = FONTS.get(24)
         hs = fh.render("Press A or ESC to close", True, (80, 80, 100))
         s.blit(hs, (SCREEN_WIDTH//2 - hs.get_width()//2, SCREEN_HEIGHT - 36))
 
@@ -3324,8 +3379,8 @@ class Game:
         col = (50 + pulse, 30, 80 + pulse)
         pygame.draw.rect(s, col, (bx, by, 400, 52), 0, 10)
         pygame.draw.rect(s, PURPLE, (bx, by, 400, 52), 2, 10)
-        fn = pygame.font.Font(None, 26)
-        fd = pygame.font.Font(None, 20)
+        fn = FONTS.get(26)
+        fd = FONTS.get(20)
         goal_text = {'no_damage':'No deaths!','speed_run':'Beat in 15 sec!','all_coins':'Collect ALL coins!'}
         status = "✅ COMPLETED!" if self.daily_completed else f"Reward: {self.daily_reward}🪙"
         s.blit(fn.render(f"📅 DAILY: Level {self.daily_level+1} — {goal_text[self.daily_goal]}", True, WHITE), (bx+10, by+8))
@@ -3337,39 +3392,10 @@ class Game:
         if self.state not in ['playing']: return
         lv = self.current_level
         # Rain in woods levels (15-29), snow in late normal levels (10-14)
-        is_rain  = 15 <= lv <= 29
-        is_snow  = 10 <= lv <= 14
-        if not is_rain and not is_snow: return
-        self.weather_timer += 1
-        # Spawn
-        if is_rain and self.weather_timer % 2 == 0:
-            self.weather_particles.append({
-                'x': random.randint(0, SCREEN_WIDTH), 'y': -10,
-                'vx': -1, 'vy': 14, 'type': 'rain', 'life': 80
-            })
-        if is_snow and self.weather_timer % 4 == 0:
-            self.weather_particles.append({
-                'x': random.randint(0, SCREEN_WIDTH), 'y': -10,
-                'vx': random.uniform(-0.5, 0.5), 'vy': 2, 'type': 'snow', 'life': 200
-            })
-        # Update and draw
-        for wp in self.weather_particles[:]:
-            wp['x'] += wp['vx']; wp['y'] += wp['vy']; wp['life'] -= 1
-            if wp['life'] <= 0 or wp['y'] > SCREEN_HEIGHT:
-                self.weather_particles.remove(wp)
-                continue
-            if wp['type'] == 'rain':
-                a = min(180, wp['life'] * 3)
-                pygame.draw.line(self.screen, (120, 160, 220),
-                    (int(wp['x']), int(wp['y'])),
-                    (int(wp['x']) + 2, int(wp['y']) + 8), 1)
-            else:
-                r = random.randint(2, 4)
-                pygame.draw.circle(self.screen, (220, 230, 255),
-                    (int(wp['x']), int(wp['y'])), r)
-        # Cap particles
-        if len(self.weather_particles) > 300:
-            self.weather_particles = self.weather_particles[-300:]
+        kind = 'rain' if 15 <= lv <= 29 else 'snow' if 10 <= lv <= 14 else None
+        self.weather.set(kind, WEATHER_DROPS.get(kind, 0))
+        self.weather.update(self.camera_x, self.camera_y)
+        self.weather.draw(self.screen)
 
     def handle_cheat_codes(self, key):
         """Check if cheat code has been entered."""
@@ -3380,16 +3406,13 @@ class Game:
             if self.cheat_buffer[-len(seq):] == seq:
                 if name == 'godmode':
                     self.cheat_active['godmode'] = 600
-                    self.floaty_texts.append({'x': SCREEN_WIDTH//2-80, 'y': 300,
-                        'vy': -1, 'text': '😎 GOD MODE ON!', 'col': YELLOW, 'life': 120, 'maxlife': 120})
+                    self.add_floaty_text(SCREEN_WIDTH//2-80, 300, -1, '😎 GOD MODE ON!', YELLOW, 120)
                 elif name == 'coins100':
                     self.shop_coins += 100; self.bank_coins += 100
-                    self.floaty_texts.append({'x': SCREEN_WIDTH//2-80, 'y': 300,
-                        'vy': -1, 'text': '+100 COINS! 💰', 'col': YELLOW, 'life': 120, 'maxlife': 120})
+                    self.add_floaty_text(SCREEN_WIDTH//2-80, 300, -1, '+100 COINS! 💰', YELLOW, 120)
                 elif name == 'allhats':
                     for h in self.HATS: self.hats_owned.add(h['key'])
-                    self.floaty_texts.append({'x': SCREEN_WIDTH//2-80, 'y': 300,
-                        'vy': -1, 'text': '🎩 ALL HATS!', 'col': CYAN, 'life': 120, 'maxlife': 120})
+                    self.add_floaty_text(SCREEN_WIDTH//2-80, 300, -1, '🎩 ALL HATS!', CYAN, 120)
                 self.cheat_buffer.clear()
 
     def draw_garden(self):
@@ -3397,9 +3420,7 @@ class Game:
         s = self.screen
         t = pygame.time.get_ticks() * 0.001
         # Sky
-        for y in range(SCREEN_HEIGHT):
-            p = y/SCREEN_HEIGHT
-            pygame.draw.line(s,(int(100+p*60),int(160+p*40),int(220-p*40)),(0,y),(SCREEN_WIDTH,y))
+        self.draw_gradient((100,160,220),(160,200,180))
         # Ground
         pygame.draw.rect(s,(80,140,60),(0,560,SCREEN_WIDTH,210))
         for gx in range(0,SCREEN_WIDTH,20):
@@ -3412,7 +3433,9 @@ class Game:
                 (SCREEN_WIDTH-120+int(math.cos(a)*52),80+int(math.sin(a)*52)),
                 (SCREEN_WIDTH-120+int(math.cos(a)*68),80+int(math.sin(a)*68)),3)
         # Flowers
-        for i, (fx,fy,fc) in enumerate([(150,520),(280,510),(420,530),(600,515),(750,525),(900,510),(1050,520)]):
+        petal_cols = [(255,110,160),(200,120,255),(255,160,60),(110,180,255)]
+        for i, (fx,fy) in enumerate([(150,520),(280,510),(420,530),(600,515),(750,525),(900,510),(1050,520)]):
+            fc = petal_cols[i % len(petal_cols)]
             sway = math.sin(t*1.2+i*0.8)*4
             # Stem
             pygame.draw.line(s,(60,140,40),(fx,fy+30),(fx+int(sway),fy-40+int(sway)),3)
@@ -3432,7 +3455,7 @@ class Game:
             pygame.draw.ellipse(s,(220,40,40),(vx-12,vy-15,24,20))  # tomato
         # Sticker garden (stickers you own become flowers)
         if len(self.stickers_found) > 0:
-            fn = pygame.font.Font(None,22)
+            fn = FONTS.get(22)
             gs = fn.render(f"🌸 Garden Stickers: {len(self.stickers_found)}/30",True,(40,80,20))
             s.blit(gs,(600,430))
         # Pond
@@ -3460,14 +3483,14 @@ class Game:
         for i in range(3):
             pygame.draw.circle(s,(100,170,220),(bgx+68+i*5,bgy+3+i*4),2)
         # Coins from gardening
-        fn2=pygame.font.Font(None,22)
+        fn2=FONTS.get(22)
         cs2=fn2.render("Gardening earns 2 coins/visit!",True,(40,80,20))
         s.blit(cs2,(200,380))
         # Fence
         for fx2 in range(0,SCREEN_WIDTH,50):
             pygame.draw.rect(s,(160,110,60),(fx2+2,530,8,40),0,3)
             pygame.draw.rect(s,(140,90,40),(0,545,SCREEN_WIDTH,8))
-        fn3=pygame.font.Font(None,28); ls=fn3.render("Garden 🌻",True,(40,80,20))
+        fn3=FONTS.get(28); ls=fn3.render("Garden 🌻",True,(40,80,20))
         s.blit(ls,(12,16))
 
     def draw_journal(self):
@@ -3482,12 +3505,12 @@ class Game:
         # Spine
         pygame.draw.rect(s,(140,100,60),(100,60,40,SCREEN_HEIGHT-120),0,16)
         # Title
-        ft=pygame.font.Font(None,52)
+        ft=FONTS.get(52)
         ts=ft.render("📓 Blue Guy's Journal",True,(80,50,20))
         s.blit(ts,(SCREEN_WIDTH//2-ts.get_width()//2,78))
         pygame.draw.line(s,(140,100,60),(160,128),(SCREEN_WIDTH-120,128),2)
         # Entries
-        fn=pygame.font.Font(None,28); fd=pygame.font.Font(None,22)
+        fn=FONTS.get(28); fd=FONTS.get(22)
         unlocked = [(lv,title,text) for lv,(title,text) in self.JOURNAL_ENTRIES.items()
                     if lv in self.levels_beaten or lv==0]
         locked_count = len(self.JOURNAL_ENTRIES) - len(unlocked)
@@ -3507,7 +3530,7 @@ class Game:
             ls=fd.render(f"🔒 {locked_count} more entries unlock as you beat levels...",True,(120,90,60))
             s.blit(ls,(165,148+len(unlocked)*90+10))
         # Close hint
-        ch=pygame.font.Font(None,24).render("Press J or ESC to close",True,(100,70,40))
+        ch=FONTS.get(24).render("Press J or ESC to close",True,(100,70,40))
         s.blit(ch,(SCREEN_WIDTH//2-ch.get_width()//2,SCREEN_HEIGHT-74))
 
     def draw_minigame(self):
@@ -3519,7 +3542,7 @@ class Game:
         s.blit(overlay,(0,0))
         pygame.draw.rect(s,(30,25,50),(200,100,SCREEN_WIDTH-400,SCREEN_HEIGHT-200),0,16)
         pygame.draw.rect(s,(80,60,140),(200,100,SCREEN_WIDTH-400,SCREEN_HEIGHT-200),3,16)
-        ft=pygame.font.Font(None,42); fn=pygame.font.Font(None,28); fd=pygame.font.Font(None,22)
+        ft=FONTS.get(42); fn=FONTS.get(28); fd=FONTS.get(22)
 
         if self.minigame_active == 'shell':
             s.blit(ft.render("🐚 Shell Game  — Cost: 5 coins",True,WHITE),(220,115))
@@ -3553,7 +3576,7 @@ class Game:
             s.blit(fd.render(f"Guess 1-10. Win 20 coins!  Attempts left: {self.guess_attempts}",True,GRAY),(220,155))
             pygame.draw.rect(s,(40,30,70),(300,280,600,80),0,10)
             pygame.draw.rect(s,(80,60,140),(300,280,600,80),2,10)
-            fs2=pygame.font.Font(None,52)
+            fs2=FONTS.get(52)
             input_text=self.guess_input if self.guess_input else '_'
             s.blit(fs2.render(input_text,True,CYAN),(590,292))
             hint_text=""
@@ -3566,7 +3589,7 @@ class Game:
                 s.blit(fn.render(hint_text,True,col),(220,390))
             s.blit(fd.render("Type a number and press ENTER. ESC to leave.",True,GRAY),(220,440))
 
-        ch=pygame.font.Font(None,22).render("ESC to exit mini-game",True,(100,80,140))
+        ch=FONTS.get(22).render("ESC to exit mini-game",True,(100,80,140))
         s.blit(ch,(SCREEN_WIDTH//2-ch.get_width()//2,SCREEN_HEIGHT-116))
 
     def draw_credits(self):
@@ -3618,20 +3641,20 @@ class Game:
             y = start_y + i * 48
             if y < -50 or y > SCREEN_HEIGHT + 50: continue
             if style=='title':
-                f=pygame.font.Font(None,72); c=YELLOW
+                f=FONTS.get(72); c=YELLOW
             elif style=='head':
-                f=pygame.font.Font(None,42); c=CYAN
+                f=FONTS.get(42); c=CYAN
             elif style=='end':
-                f=pygame.font.Font(None,56); c=(int(abs(math.sin(t))*255),200,100)
+                f=FONTS.get(56); c=(int(abs(math.sin(t))*255),200,100)
             else:
-                f=pygame.font.Font(None,30); c=(200,200,200)
+                f=FONTS.get(30); c=(200,200,200)
             if not text: continue
             ts=f.render(text,True,c)
             s.blit(ts,(SCREEN_WIDTH//2-ts.get_width()//2,int(y)))
         if start_y + len(lines)*48 < 0:
             self.credits_scroll = 0  # loop
         # Close hint
-        ch=pygame.font.Font(None,22).render("ESC to close credits",True,(80,80,100))
+        ch=FONTS.get(22).render("ESC to close credits",True,(80,80,100))
         s.blit(ch,(SCREEN_WIDTH//2-ch.get_width()//2,SCREEN_HEIGHT-30))
 
     def draw_big_boss_healthbar(self):
@@ -3660,13 +3683,13 @@ class Game:
         pygame.draw.rect(s,(200,50,50),(bx-4,by-4,bw+8,bh+8),2,8)
         # Label
         boss_name = "👑 FLYING BOSS" if getattr(self,'flying_boss',None) else "👑 BOSS"
-        fn=pygame.font.Font(None,22)
-        ns=fn.render(f"{boss_name}  {hp}/{max_hp} HP",True,WHITE)
+        fn=FONTS.get(22)
+        ns=FONTS.render(fn,f"{boss_name}  {hp}/{max_hp} HP",True,WHITE)
         s.blit(ns,(SCREEN_WIDTH//2-ns.get_width()//2,by+4))
         # Warning flash on last HP
         if hp == 1:
             if int(t*4)%2==0:
-                ws=pygame.font.Font(None,26).render("⚠️ LAST HP!",True,RED)
+                ws=FONTS.render(FONTS.get(26),"⚠️ LAST HP!",True,RED)
                 s.blit(ws,(SCREEN_WIDTH//2-ws.get_width()//2,by+bh+8))
 
     def draw_level_transition(self):
@@ -3735,14 +3758,14 @@ class Game:
         bg.fill((0, 0, 0, int(alpha * 0.6)))
         bx = SCREEN_WIDTH//2 - 350 + ox
         s.blit(bg, (bx, SCREEN_HEIGHT//2 - 35))
-        fb = pygame.font.Font(None, 52)
+        fb = FONTS.get(52)
         ts2 = fb.render(self.level_banner_name, True, YELLOW)
         ts2.set_alpha(alpha)
         s.blit(ts2, (SCREEN_WIDTH//2 - ts2.get_width()//2 + ox, SCREEN_HEIGHT//2 - ts2.get_height()//2))
         # Subtitle: daily challenge reminder
         if self.current_level == self.daily_level and not self.daily_completed:
             goal_text = {'no_damage':'★ Daily: No Deaths!','speed_run':'★ Daily: Beat in 15 sec!','all_coins':'★ Daily: All Coins!'}
-            fd = pygame.font.Font(None, 26)
+            fd = FONTS.get(26)
             ds = fd.render(goal_text[self.daily_goal], True, (255, 200, 100))
             ds.set_alpha(alpha)
             s.blit(ds, (SCREEN_WIDTH//2 - ds.get_width()//2 + ox, SCREEN_HEIGHT//2 + 22))
@@ -3754,11 +3777,11 @@ class Game:
         overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
         overlay.fill((0, 0, 0, 180))
         s.blit(overlay, (0,0))
-        ft = pygame.font.Font(None, 72)
+        ft = FONTS.get(72)
         ps = ft.render("⏸ PAUSED", True, WHITE)
         s.blit(ps, (SCREEN_WIDTH//2 - ps.get_width()//2, 120))
         # Stats
-        fn = pygame.font.Font(None, 30)
+        fn = FONTS.get(30)
         stats = [
             f"Level: {self.current_level+1} — {self.LEVEL_NAMES.get(self.current_level,'')}",
             f"Health: {'♥'*self.player_health}{'♡'*(self.player_max_health-self.player_health)}",
@@ -3776,7 +3799,7 @@ class Game:
             active = i == self.pause_option
             col = YELLOW if active else (140,140,160)
             size = 36 if active else 28
-            fo = pygame.font.Font(None, size)
+            fo = FONTS.get(size)
             os2 = fo.render(opt, True, col)
             s.blit(os2, (SCREEN_WIDTH//2 - os2.get_width()//2, 440 + i*52))
             if active:
@@ -3789,20 +3812,18 @@ class Game:
         s = self.screen
         t = pygame.time.get_ticks() * 0.001
         self.game_over_timer += 1
-        for y in range(SCREEN_HEIGHT):
-            p = y/SCREEN_HEIGHT
-            pygame.draw.line(s,(int(40+p*20),0,int(10+p*10)),(0,y),(SCREEN_WIDTH,y))
+        self.draw_gradient((40,0,10),(60,0,20))
         # Falling particles
         for i in range(30):
             px2 = (i*173 + int(t*40))%SCREEN_WIDTH
             py2 = (i*97  + int(t*60))%SCREEN_HEIGHT
             pygame.draw.circle(s,(200,20,20),(px2,py2),2)
-        ft = pygame.font.Font(None, 96)
+        ft = FONTS.get(96)
         fade = min(255, self.game_over_timer*5)
         ts2 = ft.render("GAME OVER", True, RED)
         ts2.set_alpha(fade)
         s.blit(ts2,(SCREEN_WIDTH//2-ts2.get_width()//2, 160))
-        fn = pygame.font.Font(None,36)
+        fn = FONTS.get(36)
         lines = [
             f"Level reached: {self.current_level+1}",
             f"Total coins earned: {self.bank_coins}",
@@ -3814,7 +3835,7 @@ class Game:
             ls2.set_alpha(fade)
             s.blit(ls2,(SCREEN_WIDTH//2-ls2.get_width()//2, 300+i*44))
         if self.game_over_timer > 60:
-            fp = pygame.font.Font(None, 30)
+            fp = FONTS.get(30)
             pulse = int(abs(math.sin(t*3))*100+155)
             ps2 = fp.render("Press SPACE to try again   ESC to menu", True,(pulse,pulse,pulse))
             s.blit(ps2,(SCREEN_WIDTH//2-ps2.get_width()//2, 520))
@@ -3846,7 +3867,7 @@ class Game:
             sx2=cx2+int(math.cos(a3)*14); sy2=cy2+int(math.sin(a3)*14)
             pygame.draw.line(s,(100,255,150),(int(cx2),int(cy2)),(sx2,sy2),1)
         # "EXIT" label
-        fe=pygame.font.Font(None,20)
+        fe=FONTS.get(20)
         es2=fe.render("EXIT",True,WHITE)
         s.blit(es2,(int(cx2)-es2.get_width()//2, int(ey2)-38))
 
@@ -3856,9 +3877,7 @@ class Game:
         t = pygame.time.get_ticks() * 0.001
 
         # ── Background sky + ground ──────────────────────────────────────
-        for y in range(SCREEN_HEIGHT):
-            p = y/SCREEN_HEIGHT
-            pygame.draw.line(s,(int(80+p*40),int(120+p*60),int(200-p*60)),(0,y),(SCREEN_WIDTH,y))
+        self.draw_gradient((80,120,200),(120,180,140))
         pygame.draw.rect(s,(80,160,60),(0,520,SCREEN_WIDTH,260))
         # Track
         pygame.draw.rect(s,(60,60,70),(0,460,SCREEN_WIDTH,80))
@@ -3883,7 +3902,7 @@ class Game:
             for fy in range(460,540,16):
                 col = WHITE if (fy//16)%2==0 else BLACK
                 pygame.draw.rect(s,col,(int(fx),fy,16,16))
-            ff=pygame.font.Font(None,28)
+            ff=FONTS.get(28)
             fs2=ff.render("FINISH",True,WHITE)
             s.blit(fs2,(int(fx)-fs2.get_width()//2+8,440))
 
@@ -3934,21 +3953,21 @@ class Game:
         pygame.draw.rect(s,col,(42,22,pp2,14),0,4)
         pygame.draw.rect(s,RED,(42,22+7,cp2,7),0,4)
         pygame.draw.rect(s,WHITE,(40,20,SCREEN_WIDTH-80,18),1,6)
-        s.blit(pygame.font.Font(None,18).render("YOU",True,WHITE),(42,6))
-        s.blit(pygame.font.Font(None,18).render("CPU",True,(220,80,80)),(42,36))
+        s.blit(FONTS.get(18).render("YOU",True,WHITE),(42,6))
+        s.blit(FONTS.get(18).render("CPU",True,(220,80,80)),(42,36))
         # Finish flag on bar
-        s.blit(pygame.font.Font(None,18).render("🏁",True,WHITE),(SCREEN_WIDTH-46,18))
+        s.blit(FONTS.get(18).render("🏁",True,WHITE),(SCREEN_WIDTH-46,18))
 
         # ── Speedometer ──────────────────────────────────────────────────
         spd = int(self.race_player_vel*10)
-        sf=pygame.font.Font(None,36)
+        sf=FONTS.get(36)
         s.blit(sf.render(f"⚡ {spd} km/h",True,CYAN),(20,560))
 
         # ── Timer ─────────────────────────────────────────────────────────
         if self.race_state=='racing':
             self.race_timer += 1
             elapsed = self.race_timer/60
-            s.blit(pygame.font.Font(None,32).render(f"⏱ {elapsed:.2f}s",True,WHITE),(SCREEN_WIDTH//2-50,560))
+            s.blit(FONTS.get(32).render(f"⏱ {elapsed:.2f}s",True,WHITE),(SCREEN_WIDTH//2-50,560))
 
         # ── Countdown ────────────────────────────────────────────────────
         if self.race_state=='ready':
@@ -3964,7 +3983,7 @@ class Game:
                 txt="GO!"; col2=YELLOW
                 self.race_state='racing'
             scale=max(0.3,min(1.0,1-(60-(cd%60))/80.0) if cd%60<40 else 1.0)
-            fc=pygame.font.Font(None,int(160*max(0.4,scale)))
+            fc=FONTS.get(int(160*max(0.4,scale)))
             cs3=fc.render(txt,True,col2)
             s.blit(cs3,(SCREEN_WIDTH//2-cs3.get_width()//2,SCREEN_HEIGHT//2-80))
 
@@ -4011,27 +4030,27 @@ class Game:
                 msg="💨 CPU WINS!  Try again!"; col3=RED
             else:
                 msg="🤝 TIE!  So close!"; col3=CYAN
-            fr=pygame.font.Font(None,72)
+            fr=FONTS.get(72)
             rs=fr.render(msg,True,col3)
             s.blit(rs,(SCREEN_WIDTH//2-rs.get_width()//2,200))
             pt=self.race_player_time/60 if self.race_player_time else self.race_timer/60
             ct=self.race_cpu_time/60 if self.race_cpu_time else self.race_timer/60
-            fn2=pygame.font.Font(None,32)
+            fn2=FONTS.get(32)
             s.blit(fn2.render(f"Your time: {pt:.2f}s   CPU time: {ct:.2f}s",True,WHITE),(SCREEN_WIDTH//2-200,290))
             if self.race_best:
                 s.blit(fn2.render(f"Best time: {self.race_best/60:.2f}s",True,YELLOW),(SCREEN_WIDTH//2-100,330))
-            fp=pygame.font.Font(None,28)
+            fp=FONTS.get(28)
             s.blit(fp.render("SPACE = race again   ESC = back to menu",True,(180,180,180)),(SCREEN_WIDTH//2-200,400))
 
         # ── Instruction banner ────────────────────────────────────────────
         if self.race_state in ('ready','racing'):
-            fi=pygame.font.Font(None,26)
+            fi=FONTS.get(26)
             s.blit(fi.render("Hold RIGHT / D  to run!",True,(200,200,100)),(SCREEN_WIDTH//2-110,590))
         if self.race_best:
-            s.blit(pygame.font.Font(None,22).render(f"Best: {self.race_best/60:.2f}s",True,YELLOW),(SCREEN_WIDTH-130,560))
+            s.blit(FONTS.get(22).render(f"Best: {self.race_best/60:.2f}s",True,YELLOW),(SCREEN_WIDTH-130,560))
 
         # ── ESC hint ──────────────────────────────────────────────────────
-        s.blit(pygame.font.Font(None,20).render("ESC = back",True,(100,100,120)),(SCREEN_WIDTH-100,SCREEN_HEIGHT-24))
+        s.blit(FONTS.get(20).render("ESC = back",True,(100,100,120)),(SCREEN_WIDTH-100,SCREEN_HEIGHT-24))
 
     def draw_menu(self):
         t = pygame.time.get_ticks() * 0.001
@@ -4059,16 +4078,13 @@ class Game:
         # Floating particles
         if random.random() < 0.15:
             col = YELLOW if random.random() > 0.5 else BLUE
-            self.particles.append(Particle(
+            self.particles.emit(
                 random.randint(0, SCREEN_WIDTH), SCREEN_HEIGHT,
                 random.uniform(-0.8, 0.8), random.uniform(-2.5, -1),
-                col, 140
-            ))
-        for particle in self.particles[:]:
-            particle.update()
-            particle.draw(self.screen)
-            if particle.life <= 0:
-                self.particles.remove(particle)
+                col, 140, 'ambient'
+            )
+        self.particles.update()
+        self.particles.draw(self.screen)
 
         # Animated Blue Guy on menu
         bounce = math.sin(t * 2.5) * 8
@@ -4082,16 +4098,16 @@ class Game:
 
         # Big title with glow layers
         for glow_size in [76, 74, 72]:
-            font_title = pygame.font.Font(None, glow_size)
+            font_title = FONTS.get(glow_size)
             glow_surf = font_title.render("MINIMAL PLATFORMER 4", True,
                 (0, 0, int(60 + math.sin(t) * 40)))
             self.screen.blit(glow_surf, (SCREEN_WIDTH // 2 - glow_surf.get_width() // 2 + (76 - glow_size) // 2,
                                          100 + (76 - glow_size) // 2))
-        font_title = pygame.font.Font(None, 72)
+        font_title = FONTS.get(72)
         title_surf = font_title.render("MINIMAL PLATFORMER 4", True, WHITE)
         self.screen.blit(title_surf, (SCREEN_WIDTH // 2 - title_surf.get_width() // 2, 100))
 
-        font_sub = pygame.font.Font(None, 42)
+        font_sub = FONTS.get(42)
         r_pulse = int(200 + math.sin(t * 1.5) * 55)
         sub_surf = font_sub.render("T H E   R E D   U P R I S I N G", True, (r_pulse, 40, 40))
         self.screen.blit(sub_surf, (SCREEN_WIDTH // 2 - sub_surf.get_width() // 2, 180))
@@ -4106,8 +4122,8 @@ class Game:
         if self.selected_option == 1 and self.start_level != 'T':
             world_hint = "🌲 WOODS WORLD" if isinstance(self.start_level, int) and self.start_level > 15 else "⭐ NORMAL WORLD"
 
-        font_opt = pygame.font.Font(None, 50)
-        font_hint = pygame.font.Font(None, 26)
+        font_opt = FONTS.get(50)
+        font_hint = FONTS.get(26)
         for i, option in enumerate(options):
             is_sel = (i == self.selected_option)
             y_pos = 360 + i * 80
@@ -4127,7 +4143,7 @@ class Game:
                 col = (160, 160, 180)
                 size = 44
 
-            font_opt = pygame.font.Font(None, size)
+            font_opt = FONTS.get(size)
             text_surf = font_opt.render(option, True, col)
             self.screen.blit(text_surf, (SCREEN_WIDTH // 2 - text_surf.get_width() // 2, y_pos))
 
@@ -4137,14 +4153,14 @@ class Game:
             self.screen.blit(hint_surf, (SCREEN_WIDTH // 2 - hint_surf.get_width() // 2, 445))
 
         # Controls at bottom
-        font_ctrl = pygame.font.Font(None, 26)
+        font_ctrl = FONTS.get(26)
         ctrl_text = "UP/DOWN: Select   ENTER: Confirm   LEFT/RIGHT: Change Level"
 
         # ── Player stats sidebar on menu ──────────────────────────────────
         sx = 40; sy = 220
         pygame.draw.rect(self.screen,(10,10,30,0),(sx-6,sy-6,230,280),0,8)
         pygame.draw.rect(self.screen,(50,50,80),(sx-6,sy-6,230,280),1,8)
-        fn2 = pygame.font.Font(None, 22)
+        fn2 = FONTS.get(22)
         stat_lines = [
             ("📊 YOUR STATS", CYAN),
             (f"Levels beaten: {len(self.levels_beaten)}/30", WHITE),
@@ -4176,7 +4192,7 @@ class Game:
         ]
         tip_idx = int(t * 0.15) % len(tips)
         tip_off = (t * 0.15 - int(t * 0.15))
-        tp = pygame.font.Font(None, 22)
+        tp = FONTS.get(22)
         tip_s = tp.render(tips[tip_idx], True, (120,120,160))
         tip_s.set_alpha(int(min(255, min(tip_off, 1-tip_off)*8*255)))
         self.screen.blit(tip_s,(SCREEN_WIDTH//2-tip_s.get_width()//2, SCREEN_HEIGHT-90))
@@ -4190,9 +4206,7 @@ class Game:
         # Save notification
         if self.save_notif > 0:
             a = min(255, self.save_notif * 4)
-            sf2 = pygame.font.Font(None, 38)
-            ss = sf2.render("💾 SAVED!", True, GREEN)
-            ss.set_alpha(a)
+            ss = self.menu_save_banner.render("💾 SAVED!", GREEN, a)
             self.screen.blit(ss, (SCREEN_WIDTH//2 - ss.get_width()//2, SCREEN_HEIGHT - 110))
     
     def get_save_path(self):
@@ -4225,10 +4239,11 @@ class Game:
             'high_score':      self.high_score,
             'runs_completed':  self.runs_completed,
         }
+        if self.headless:
+            return False
+        # Serialise now so the snapshot can't change while the writer thread has it
         try:
-            with open(self.get_save_path(), 'w') as f:
-                json.dump(data, f, indent=2)
-            return True
+            return self.saver.request(json.dumps(data, indent=2))
         except Exception as e:
             print(f"❌ Save failed: {e}")
             return False
@@ -4271,28 +4286,653 @@ class Game:
             print(f"❌ Load failed: {e}")
             return False
 
+    def step(self, inputs):
+        """Advance gameplay by one fixed tick without drawing anything.
+
+        inputs is a TickInput - run() builds one from the keyboard every tick
+        and the headless runner builds them from a script, so the same code
+        drives both.
+        """
+        if self.state not in ['playing', 'tutorial']:
+            return
+        if pygame.K_SPACE in inputs.pressed:
+            if self.game_over:
+                # Restart from same level
+                self.game_over = False; self.game_over_timer = 0
+                self.player_health = self.player_max_health
+                if self.state == 'tutorial':
+                    self.load_tutorial_level()
+                else:
+                    self.load_level(self.current_level)
+            elif not self.paused:
+                self.player.jump()
+                if 'jump' in self.sfx:
+                    try: self.sfx['jump'].play()
+                    except: pass
+
+        # ── DASH (SHIFT key) ──────────────────────────────────────
+        if not self.paused and not self.game_over:
+            self.dash_cd = max(0, self.dash_cd - 1)
+            # Decay invincibility frames
+            if self.invincibility_frames > 0:
+                self.invincibility_frames -= 1
+                # Flash player when invincible after hit
+                if self.invincibility_frames % 8 < 4:
+                    self.player.invincible = 4
+        self.dash_timer = max(0, self.dash_timer - 1)
+        if (inputs[pygame.K_LSHIFT] or inputs[pygame.K_RSHIFT]) and self.dash_cd == 0:
+            self.dash_cd = 40
+            self.dash_timer = 8
+            self.dash_dir = -1 if (inputs[pygame.K_LEFT] or inputs[pygame.K_a]) else 1
+            self.player.vel_x = self.dash_dir * 16
+            self.player.invincible = max(self.player.invincible, 8)
+            self.particles.burst(
+                self.player.x + 10, self.player.y + 10,
+                6, CYAN, 15, (-self.dash_dir * 2, -self.dash_dir * 5), (-1, 1), 'dash'
+            )
+
+        # ── COMBO DECAY ───────────────────────────────────────────
+        if self.combo_timer > 0:
+            self.combo_timer -= 1
+            if self.combo_timer == 0:
+                self.combo = 0
+
+        # ── COIN MAGNET DECAY ─────────────────────────────────────
+        self.coin_magnet = max(0, self.coin_magnet - 1)
+
+        # ── LEVEL TIMER ───────────────────────────────────────────
+        if self.state == 'playing':
+            self.level_timer += 1
+
+        # ── SCREEN SHAKE ──────────────────────────────────────────
+        if self.shake_timer > 0:
+            self.shake_timer -= 1
+
+        # ── FLOATY TEXT UPDATE ────────────────────────────────────
+        self.floaty_texts.update()
+
+        # ── PARTICLES (capped by PARTICLE_BUDGET) ─────────────────
+        if not self.paused:
+            self.particles.update()
+
+        self.profiler.start('step.entities')
+        if not self.paused and not self.game_over:
+         self.player.update(self.platforms, self.projectiles, inputs)
+        
+         # Update moving platforms in place!
+         self.platforms.update()
+        
+         for enemy in self.enemies:
+            enemy.update(self.platforms)
+         if self.boss:
+            self.boss.update(self.platforms, self.player, self.projectiles)
+        
+         if getattr(self, 'flying_boss', None):
+            self.flying_boss.update(self.player, self.rng)
+        self.profiler.stop('step.entities')
+        
+        self.profiler.start('step.collisions')
+        for projectile in self.projectiles[:]:
+            projectile.update()
+            if not (0 <= projectile.x <= 3000 and 0 <= projectile.y <= 1000):
+                self.projectiles.remove(projectile)
+                continue
+            
+            if projectile.is_player_bullet:
+                for enemy in self.enemies[:]:
+                    if projectile.rect.colliderect(enemy.rect):
+                        # ShieldEnemy takes 2 hits!
+                        if isinstance(enemy, ShieldEnemy):
+                            enemy.health -= 1
+                            enemy.hit_flash = 10
+                            if projectile in self.projectiles:
+                                self.projectiles.remove(projectile)
+                            if enemy.health <= 0:
+                                self.enemies.remove(enemy)
+                            else:
+                                break
+                        else:
+                            self.enemies.remove(enemy)
+                            if projectile in self.projectiles:
+                                self.projectiles.remove(projectile)
+                        self.session_kills += 1
+                        self.unlock_achievement('first_blood')
+                        # Death sparks!
+                        self.particles.burst(
+                            enemy.x+10, enemy.y+10,
+                            12, (255,100,50), 20, (-4, 4), (-4, 0), 'sparks'
+                        )
+                        # COMBO SYSTEM!
+                        self.combo += 1
+                        self.combo_timer = 120
+                        self.max_combo = max(self.max_combo, self.combo)
+                        bonus = self.combo * 2
+                        self.shop_coins += bonus
+                        self.bank_coins += bonus
+                        # Floaty combo text!
+                        label = f"+{bonus}" if self.combo < 3 else f"x{self.combo} COMBO! +{bonus}"
+                        col = YELLOW if self.combo < 3 else (ORANGE if self.combo < 6 else RED)
+                        self.add_floaty_text(enemy.x, enemy.y, -2, label, col, 50)
+                        # Screen shake on big combos
+                        if self.combo >= 3:
+                            self.shake_timer = 8
+                            self.shake_intensity = min(self.combo, 8)
+                        # Epic particles!
+                        self.particles.burst(
+                            enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
+                            10, RED, 30, (-4, 4), emitter='sparks'
+                        )
+                        break
+                # Check boss hits
+                if self.boss and projectile.rect.colliderect(self.boss.rect):
+                    self.boss.health -= 1
+                    self.shake_timer = 6; self.shake_intensity = 4
+                    self.add_floaty_text(self.boss.x+25, self.boss.y, -2, f'-1 HP ({self.boss.health} left)', RED, 45)
+                    if projectile in self.projectiles:
+                        self.projectiles.remove(projectile)
+                    if self.boss.health <= 0:
+                        self.boss = None
+                        self.boss_defeated = True
+                        self.shake_timer = 25; self.shake_intensity = 10
+                        self.add_floaty_text(SCREEN_WIDTH//2-60, 300, -1, 'BOSS DOWN!!!', GREEN, 120)
+                        self.particles.burst(
+                            self.player.x + 10, self.player.y + 10,
+                            20, [RED, YELLOW], 50, (-4, 4), emitter='boss'
+                        )
+                # Check flying boss hits
+                if getattr(self, 'flying_boss', None) and projectile.rect.colliderect(self.flying_boss.rect):
+                    self.flying_boss.health -= 1
+                    if projectile in self.projectiles:
+                        self.projectiles.remove(projectile)
+                    self.particles.burst(
+                        self.flying_boss.x + 30, self.flying_boss.y + 30,
+                        5, RED, 20, (-2, 2), emitter='boss'
+                    )
+                    if self.flying_boss.health <= 0:
+                        self.flying_boss = None
+            # Enemy bullets hit player
+            elif projectile.rect.colliderect(self.player.rect):
+                if not getattr(self.player, 'invincible', 0) and self.invincibility_frames <= 0:
+                    self.player_health -= 1
+                    self.level_no_death = False
+                    self.invincibility_frames = 90  # 1.5 sec invincible after hit
+                    try: self.sfx.get('hit',None) and self.sfx['hit'].play()
+                    except: pass
+                    # Shake
+                    self.shake_timer = 12; self.shake_intensity = 5
+                    if self.player_health <= 0:
+                        self.player_health = 0
+                        self.total_deaths += 1
+                        self.game_over = True
+                        self.game_over_timer = 0
+                        try: self.sfx.get('death',None) and self.sfx['death'].play()
+                        except: pass
+                    else:
+                        # Respawn at start, keep health
+                        self.player.x, self.player.y = self.levels[self.current_level]['spawn'] if self.state == 'playing' else self.tutorial_level['spawn']
+                        self.player.vel_x = 0; self.player.vel_y = 0
+                        self.total_deaths += 1
+                if projectile in self.projectiles:
+                    self.projectiles.remove(projectile)
+        
+        for coin in self.coins:
+            if not coin.collected:
+                # Coin magnet - coins fly toward player!
+                if self.coin_magnet > 0:
+                    dx = self.player.x - coin.x
+                    dy = self.player.y - coin.y
+                    dist = max(1, math.sqrt(dx*dx+dy*dy))
+                    if dist < 250:
+                        coin.x += dx/dist * 8
+                        coin.y += dy/dist * 8
+                        coin.rect.x = int(coin.x)
+                        coin.rect.y = int(coin.y)
+                        self.coin_index.move(coin)
+                if self.player.rect.colliderect(coin.rect):
+                    coin.collected = True
+                    self.coins_collected += 1
+                    self.bank_coins  += 1
+                    self.shop_coins  += 1
+                    self.clicker_coins += 1
+                    self.run_coins   += 1
+                    try:
+                        freq, dur, vol, wave = SFX_TONES['coin']
+                        note = COIN_NOTES[(self.coins_collected - 1) % len(COIN_NOTES)]
+                        self.synth and self.synth.sound(freq * 2 ** (note / 12), dur, vol, wave).play()
+                    except: pass
+
+        # Sticker collection (hidden sparkle in each level)!
+        if self.current_level not in self.stickers_found:
+            if getattr(self, '_sticker_rect', None) and self.player.rect.colliderect(self._sticker_rect):
+                self.stickers_found.add(self.current_level)
+                self.shop_coins += 5  # bonus coins for sticker!
+        
+        # Power-up collection!
+        for power_up in getattr(self, 'power_ups', []):
+            if not power_up.collected and self.player.rect.colliderect(power_up.rect):
+                power_up.collected = True
+                try: self.sfx.get('powerup') and self.sfx['powerup'].play()
+                except: pass
+                # Apply power-up effect!
+                if power_up.power_type == 'speed':
+                    self.player.speed_boost = 300
+                elif power_up.power_type == 'invincible':
+                    self.player.invincible = 300
+                elif power_up.power_type == 'mega_jump':
+                    self.player.mega_jump = 300
+                elif power_up.power_type == 'magnet':
+                    self.coin_magnet = 300  # 5 seconds coin magnet!
+                # Epic particles!
+                self.particles.burst(
+                    power_up.x + 12, power_up.y + 12,
+                    20, power_up.colors[power_up.power_type], 40, (-4, 4), emitter='power_up'
+                )
+        
+        for spike in self.spikes:
+            if self.player.rect.colliderect(spike.rect):
+                self.player.x, self.player.y = self.levels[self.current_level]['spawn'] if self.state == 'playing' else self.tutorial_level['spawn']
+                self.player.vel_x = 0
+                self.player.vel_y = 0
+        for enemy in self.enemies:
+            if self.player.rect.colliderect(enemy.rect):
+                self.player.x, self.player.y = self.levels[self.current_level]['spawn'] if self.state == 'playing' else self.tutorial_level['spawn']
+                self.player.vel_x = 0
+                self.player.vel_y = 0
+        if self.boss and self.player.rect.colliderect(self.boss.rect):
+            if self.player.vel_y > 0 and self.player.rect.bottom <= self.boss.rect.top + 10:
+                self.boss.health -= 1
+                self.player.vel_y = JUMP_STRENGTH
+                if self.boss.health <= 0:
+                    self.boss = None
+                    self.boss_defeated = True
+                    if self.current_level == 29:
+                        self.unlock_achievement('wowy')
+                self.player.x, self.player.y = self.levels[self.current_level]['spawn']
+                self.player.vel_x = 0
+                self.player.vel_y = 0
+        
+        # Flying boss collision - JUMP ON RED GUY!
+        if getattr(self, 'flying_boss', None) and self.player.rect.colliderect(self.flying_boss.rect):
+            if self.player.vel_y > 0 and self.player.rect.bottom <= self.flying_boss.rect.top + 15:
+                self.flying_boss.health -= 1
+                self.player.vel_y = JUMP_STRENGTH  # Bounce!
+                # Epic particles!
+                self.particles.burst(
+                    self.flying_boss.x + self.flying_boss.width // 2,
+                    self.flying_boss.y + self.flying_boss.height // 2,
+                    10, RED, 30, (-3, 3), emitter='boss'
+                )
+                if self.flying_boss.health <= 0:
+                    self.flying_boss = None
+                    self.boss_defeated = True  # Track boss is dead!
+                    if self.current_level == 29:
+                        self.unlock_achievement('wowy')
+                    # EPIC EXPLOSION!
+                    self.particles.burst(
+                        self.player.x + 10, self.player.y + 10,
+                        30, [RED, YELLOW], 60, (-5, 5), emitter='boss'
+                    )
+            else:
+                # Hit from side = death!
+                self.player.x, self.player.y = self.levels[self.current_level]['spawn']
+                self.player.vel_x = 0
+                self.player.vel_y = 0
+        
+        if self.player.rect.colliderect(self.exit_rect):
+            # Can only exit if no boss or boss is defeated!
+            can_exit = True
+            if self.boss is not None:
+                can_exit = False  # Boss still alive!
+            if getattr(self, 'flying_boss', None) is not None:
+                can_exit = False  # Flying boss still alive!
+            
+            if can_exit and self.state == 'playing':
+                # Save best time for this level!
+                if self.current_level not in self.best_times or self.level_timer < self.best_times[self.current_level]:
+                    self.best_times[self.current_level] = self.level_timer
+                # Speed run achievement (under 15 seconds = 900 frames)
+                if self.level_timer < 900:
+                    self.unlock_achievement('speed_run')
+                # No damage achievement
+                if self.level_no_death:
+                    self.unlock_achievement('no_damage')
+                # All coins achievement
+                if self.coins_collected == self.total_coins and self.total_coins > 0:
+                    self.unlock_achievement('all_coins_1')
+                # Daily challenge check
+                if self.current_level == self.daily_level and not self.daily_completed:
+                    goal = self.daily_goal
+                    if goal == 'no_damage' and self.level_no_death:
+                        self.daily_completed = True
+                        self.shop_coins += self.daily_reward
+                        self.add_floaty_text(SCREEN_WIDTH//2-80, 250, -1, f'📅 DAILY DONE! +{self.daily_reward}🪙', PURPLE, 180)
+                    elif goal == 'speed_run' and self.level_timer < 900:
+                        self.daily_completed = True
+                        self.shop_coins += self.daily_reward
+                        self.add_floaty_text(SCREEN_WIDTH//2-80, 250, -1, f'📅 DAILY DONE! +{self.daily_reward}🪙', PURPLE, 180)
+                    elif goal == 'all_coins' and self.coins_collected == self.total_coins:
+                        self.daily_completed = True
+                        self.shop_coins += self.daily_reward
+                        self.add_floaty_text(SCREEN_WIDTH//2-80, 250, -1, f'📅 DAILY DONE! +{self.daily_reward}🪙', PURPLE, 180)
+                self.level_no_death = True  # reset for next level
+                self.level_timer = 0
+                # Mark this level as beaten!
+                self.levels_beaten.add(self.current_level)
+                # Update high score
+                if self.run_coins > self.high_score:
+                    self.high_score = self.run_coins
+                # AUTO-SAVE!
+                self.save_game()
+                self.save_notif = 120
+                next_level = self.current_level + 1
+                
+                # TRIGGER CUTSCENES!
+                cutscene_to_show = CUTSCENES.get(next_level)
+                if cutscene_to_show in self.cutscenes_seen:
+                    cutscene_to_show = None
+                elif cutscene_to_show:
+                    self.cutscenes_seen.add(cutscene_to_show)
+                    if cutscene_to_show == 4:
+                        self.unlock_achievement('gotta_drink')
+                
+                if cutscene_to_show:
+                    self.cutscene_mode = cutscene_to_show
+                    self.cutscene_timer = 0
+                    self.cutscene_next_level = next_level  # remember where to go after!
+                    self.state = 'cutscene'
+                    # Play cutscene music
+                    self.audio.play(f'cutscene{cutscene_to_show}')
+                else:
+                    self.current_level = next_level
+                    if self.current_level < len(self.levels):
+                        self.load_level(self.current_level)
+                    else:
+                        self.game_completed = True
+                        self.state = 'intro'
+                        self.intro_timer = 0
+                        self.particles.clear()
+                        # 1 Sitting — completed whole game from level 0 without restarting
+                        if self.session_started_level == 0:
+                            self.unlock_achievement('1_sitting')
+            else:
+                self.state = 'intro'
+                self.intro_timer = 0
+                self.particles.clear()
+        # Check for falling off screen
+        if self.player.y > 1000 and not self.game_over:
+            self.player_health -= 1
+            self.level_no_death = False
+            self.invincibility_frames = 60
+            self.shake_timer = 10; self.shake_intensity = 6
+            try: self.sfx.get('hit') and self.sfx['hit'].play()
+            except: pass
+            if self.player_health <= 0:
+                self.player_health = 0
+                self.total_deaths += 1
+                self.game_over = True
+                self.game_over_timer = 0
+            else:
+                self.total_deaths += 1
+                spawn = self.levels[self.current_level]['spawn'] if self.state=='playing' else self.tutorial_level['spawn']
+                self.player.x, self.player.y = spawn
+                self.player.vel_x = 0; self.player.vel_y = 0
+        self.profiler.stop('step.collisions')
+        
+        self.update_camera()
+
+        # NPCs notice the player
+        for npc in getattr(self, 'npcs', []):
+            npc.update(self.player.rect)
+
+        # Gem pickups
+        for gem in getattr(self, 'gems', []):
+            if not gem.collected and self.player.rect.colliderect(gem.rect):
+                gem.collected = True
+                self.gems_collected += 1
+                self.shop_coins += 5; self.bank_coins += 5; self.run_coins += 5
+                self.add_floaty_text(gem.x, gem.y, -2, '💎 +5', (150,200,255), 55)
+                try: self.sfx.get('gem') and self.sfx['gem'].play()
+                except: pass
+
+        if self.save_notif > 0:
+            self.save_notif -= 1
+        self.check_achievements()
+
+    def set_profiling(self, on):
+        """Time every draw_* method, PROFILED_METHODS and text rendering, or stop timing them."""
+        if on:
+            self.profiler.enable([(self, 'draw_', PROFILED_METHODS, None),
+                                  (FONTS, None, ('render',), 'fonts')])
+        else:
+            self.profiler.disable()
+
+    def start_recording(self):
+        """Restart the level just entered from a clean seeded state and log every tick's input."""
+        from replay import InputRecorder
+        level = -1 if self.state == 'tutorial' else self.current_level
+        health = getattr(self, 'player_health', self.player_max_health)
+        self.begin_run(level, player_health=health)
+        self.recorder = InputRecorder(GAME_KEYS, self.seed, level, health, self.player_max_health,
+                                      self.current_level)
+
+    def stop_recording(self):
+        try:
+            self.recorder.save(self.record_path, self)
+            print(f"🎥 Recorded {self.recorder.ticks} ticks to {self.record_path}")
+        except Exception as e:
+            print(f"Recording save failed: {e}")
+        self.recorder = None
+
+    def capture_motion(self):
+        """Remember where everything that moves is before a tick, for interpolated drawing."""
+        interp = self.interp
+        interp.clear()
+        interp.capture([self.player, self.boss, getattr(self, 'flying_boss', None)])
+        interp.capture(self.enemies)
+        interp.capture(self.projectiles)
+        interp.capture(self.platforms.dynamic)
+        interp.capture([self], ('camera_x', 'camera_y'))
+
+    def draw_gameplay(self):
+        """Draw the level, entities and HUD for the current tick."""
+        # ── SCREEN SHAKE ──────────────────────────────────────────
+        shake_x = random.randint(-self.shake_intensity, self.shake_intensity) if self.shake_timer > 0 else 0
+        shake_y = random.randint(-self.shake_intensity, self.shake_intensity) if self.shake_timer > 0 else 0
+        self.camera_x += shake_x
+        self.camera_y += shake_y
+        self.draw_background()
+        self.draw_weather()
+        
+        # Regular platforms (BLACK!), spikes and the exit come pre-baked
+        self.static_layer.draw(self.screen, self.camera_x, self.camera_y)
+        
+        # Draw moving platforms separately with their draw method
+        for moving_plat in self.platforms.dynamic:
+            moving_plat.draw(self.screen, self.camera_x, self.camera_y)
+        
+        # ── VIEW CULLING ──────────────────────────────────────────
+        # Pickups and NPCs come from their grids; enemies and bullets move
+        # every tick, so a straight rect test is cheaper than re-indexing them
+        view = pygame.Rect(int(self.camera_x) - CULL_MARGIN, int(self.camera_y) - CULL_MARGIN,
+                           SCREEN_WIDTH + CULL_MARGIN * 2, SCREEN_HEIGHT + CULL_MARGIN * 2)
+        enemies = [e for e in self.enemies if e.rect.colliderect(view)]
+        projectiles = [p for p in self.projectiles if p.rect.colliderect(view)]
+        npcs = self.npc_index.query(view.inflate(400, 200))  # Speech bubbles hang well off the body
+        coins = [c for c in self.coin_index.query(view) if not c.collected]
+        gems = [g for g in self.gem_index.query(view) if not g.collected]
+        power_ups = self.power_up_index.query(view)
+        # Collected pickups would never be drawn anyway, so they don't count as culled
+        coins_left = self.total_coins - self.coins_collected
+        gems_left = sum(1 for g in self.gems if not g.collected)
+        self.culled = (len(self.enemies) - len(enemies) + len(self.projectiles) - len(projectiles)
+                       + len(self.npc_index) - len(npcs) + coins_left - len(coins)
+                       + gems_left - len(gems) + len(self.power_up_index) - len(power_ups))
+
+        for enemy in enemies:
+            enemy.draw(self.screen, self.camera_x, self.camera_y)
+        if self.boss:
+            self.boss.draw(self.screen, self.camera_x, self.camera_y)
+        
+        if getattr(self, 'flying_boss', None):
+            self.flying_boss.draw(self.screen, self.camera_x, self.camera_y)
+
+        # Draw NPCs
+        for npc in npcs:
+            npc.draw(self.screen, self.camera_x, self.camera_y)
+        
+        for coin in coins:
+            coin.draw(self.screen, self.camera_x, self.camera_y)
+
+        # Draw gems!
+        for gem in gems:
+            gem.draw(self.screen, self.camera_x, self.camera_y)
+        for power_up in power_ups:
+            power_up.draw(self.screen, self.camera_x, self.camera_y)
+        
+        for projectile in projectiles:
+            projectile.draw(self.screen, self.camera_x, self.camera_y)
+        self.particles.draw(self.screen, self.camera_x, self.camera_y)
+
+        # Draw sticker - BIG visible spinning star with bouncing arrow
+        if self.current_level not in self.stickers_found and getattr(self, '_sticker_rect', None):
+            self._sticker_anim += 0.06
+            sr = self._sticker_rect
+            cx2 = sr.x + sr.w // 2 - self.camera_x
+            cy2 = sr.y + sr.h // 2 - self.camera_y
+            bob = math.sin(self._sticker_anim * 2) * 6
+            cy2 += bob
+
+            # Big outer glow
+            for r, alpha in [(28, 30), (20, 60), (14, 100)]:
+                glow.blit_circle(self.screen, cx2, cy2, r, (255, 220, 0), alpha)
+
+            # Spinning 8-point star
+            spin = self._sticker_anim * 60
+            for angle in range(0, 360, 45):
+                a = math.radians(angle + spin)
+                r_len = 18 if angle % 90 == 0 else 11
+                ex2 = cx2 + math.cos(a) * r_len
+                ey2 = cy2 + math.sin(a) * r_len
+                pygame.draw.line(self.screen, YELLOW, (int(cx2), int(cy2)), (int(ex2), int(ey2)), 3)
+            pygame.draw.circle(self.screen, WHITE, (int(cx2), int(cy2)), 7)
+            pygame.draw.circle(self.screen, YELLOW, (int(cx2), int(cy2)), 5)
+
+            # Bouncing "⭐" label above it
+            sf = FONTS.get(22)
+            slbl = FONTS.render(sf, "STICKER!", True, YELLOW)
+            self.screen.blit(slbl, (cx2 - slbl.get_width()//2, cy2 - 38))
+
+            # Downward arrow pointing at it
+            arr_y = cy2 - 50 + math.sin(self._sticker_anim * 3) * 5
+            pygame.draw.polygon(self.screen, YELLOW, [
+                (cx2, arr_y + 14), (cx2 - 7, arr_y), (cx2 + 7, arr_y)
+            ])
+
+        self.player.draw(self.screen, self.camera_x, self.camera_y)
+        # Draw equipped hat on player in-game!
+        hat = getattr(self, 'hat_equipped', None)
+        if hat:
+            self._draw_hat_at(hat,
+                int(self.player.x - self.camera_x + 2),
+                int(self.player.y - self.camera_y - 2))
+
+        # Draw hat on top of player!
+        hat = getattr(self, 'hat_equipped', None)
+        if hat:
+            px = self.player.rect.x - self.camera_x
+            py = self.player.rect.y - self.camera_y
+            self._draw_hat_at(hat, px + 10, py - 2)
+
+        self.draw_mini_map()
+        if self.state == 'playing':
+            self.draw_ui()
+            self.draw_health()
+            self.draw_big_boss_healthbar()
+            self.draw_exit_portal()
+        elif self.state == 'tutorial':
+            self.draw_tutorial_ui()
+
+        # ── FLOATY TEXTS (world space) ─────────────────────────────
+        self.floaty_texts.draw(self.screen, self.camera_x, self.camera_y)
+
+        # ── COMBO DISPLAY ──────────────────────────────────────────
+        if self.combo >= 2 and self.combo_timer > 0:
+            fade = min(255, self.combo_timer * 4)
+            combo_col = (255, max(0,255-self.combo*20), 0)
+            cs = self.combo_banner.render(f"x{self.combo} COMBO!", combo_col, fade)
+            self.screen.blit(cs, (SCREEN_WIDTH//2 - cs.get_width()//2, 80))
+
+        # ── DASH COOLDOWN BAR ──────────────────────────────────────
+        if self.dash_cd > 0:
+            df = FONTS.get(20)
+            ds = FONTS.render(df, "DASH", True, CYAN)
+            self.screen.blit(ds, (SCREEN_WIDTH - 90, SCREEN_HEIGHT - 50))
+            pygame.draw.rect(self.screen, DARK_GRAY, (SCREEN_WIDTH-90, SCREEN_HEIGHT-34, 80, 8))
+            fill = int(80 * (1 - self.dash_cd / 40))
+            pygame.draw.rect(self.screen, CYAN, (SCREEN_WIDTH-90, SCREEN_HEIGHT-34, fill, 8))
+        else:
+            df = FONTS.get(20)
+            ds = FONTS.render(df, "DASH ready!", True, CYAN)
+            self.screen.blit(ds, (SCREEN_WIDTH - 100, SCREEN_HEIGHT - 50))
+
+        # ── SAVE NOTIFICATION ─────────────────────────────────────
+        if self.save_notif > 0:
+            a = min(255, self.save_notif * 4)
+            ss = self.save_banner.render("💾 SAVED!", GREEN, a)
+            self.screen.blit(ss, (SCREEN_WIDTH//2 - ss.get_width()//2, 40))
+
+        self.draw_achievement_popups()
+        self.draw_level_transition()
+        # Gem count HUD
+        gems_left = sum(1 for g in getattr(self,'gems',[]) if not g.collected)
+        if gems_left > 0:
+            gf=FONTS.get(22)
+            gt=FONTS.render(gf,f"💎 {gems_left} gem{'s' if gems_left>1 else ''} left",True,(150,200,255))
+            self.screen.blit(gt,(SCREEN_WIDTH-gt.get_width()-12,SCREEN_HEIGHT-72))
+        if self.state == 'playing':
+            secs = self.level_timer // 60
+            best = self.best_times.get(self.current_level)
+            tf = FONTS.get(22)
+            tcol = GREEN if best and self.level_timer < best else WHITE
+            ts2 = FONTS.render(tf, f"⏱ {secs}s" + (f"  best:{best//60}s" if best else ""), True, tcol)
+            self.screen.blit(ts2, (SCREEN_WIDTH//2 - ts2.get_width()//2, SCREEN_HEIGHT - 24))
+
+        # Journal overlay during gameplay
+        if self.journal_open:
+            self.draw_journal()
+
+        # Level name banner (first ~3 seconds of level)
+        if self.state == 'playing':
+            self.draw_level_banner()
+
+        # Pause screen
+        if self.paused:
+            self.draw_pause()
+
+        # Game over screen
+        if self.game_over:
+            self.draw_game_over()
+
     def run(self):
         running = True
+        carry = []  # Keys pressed on a frame that ran no tick wait for the next one
         while running:
+            self.profiler.begin_frame()
+            self.profiler.start('events')
+            pressed, carry = carry, []
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
                     running = False
                 elif event.type == pygame.KEYDOWN:
-                    if event.key == pygame.K_SPACE and self.state in ['playing', 'tutorial']:
-                        if self.game_over:
-                            # Restart from same level
-                            self.game_over = False; self.game_over_timer = 0
-                            self.player_health = self.player_max_health
-                            self.load_level(self.current_level)
-                        elif not self.paused:
-                            self.player.jump()
-                            if 'jump' in self.sfx:
-                                try: self.sfx['jump'].play()
-                                except: pass
-                    elif event.key == pygame.K_p and self.state in ['playing','tutorial']:
+                    pressed.append(event.key)
+                    # SPACE (jump / restart) reaches step() through the tick input
+                    if event.key == pygame.K_p and self.state in ['playing','tutorial']:
                         if not self.game_over:
                             self.paused = not self.paused
                             self.pause_option = 0
+                    elif event.key == pygame.K_F3:
+                        self.show_profiler = not self.show_profiler
+                        self.set_profiling(self.show_profiler or self.profiler.export_file is not None)
                     elif event.key == pygame.K_ESCAPE:
                         if self.state in ['playing', 'tutorial']:
                             if self.journal_open:
@@ -4302,7 +4942,7 @@ class Game:
                             else:
                                 self.state = 'intro'
                                 self.intro_timer = 0
-                                self.particles = []
+                                self.particles.clear()
                                 self.paused = False
                         elif self.state == 'menu':
                             if getattr(self, 'shop_open', False):
@@ -4388,21 +5028,21 @@ class Game:
                                 self.load_level(self.current_level)
                                 self.state = 'playing'
                                 self.game_completed = False
-                                self.particles = []
+                                self.particles.clear()
                                 self.session_started_level = 0  # track for 1 Sitting
                             elif self.selected_option == 1:  # Start Level
                                 if self.start_level == 'T':
                                     self.tutorial_step = 0
                                     self.load_tutorial_level()
                                     self.state = 'tutorial'
-                                    self.particles = []
+                                    self.particles.clear()
                                     self.session_started_level = None
                                 else:
                                     self.current_level = self.start_level - 1
                                     self.load_level(self.current_level)
                                     self.state = 'playing'
                                     self.game_completed = False
-                                    self.particles = []
+                                    self.particles.clear()
                                     self.session_started_level = None  # not a fresh run
                             elif self.selected_option == 2:  # Exit
                                 running = False
@@ -4593,44 +5233,33 @@ class Game:
                                     self.race_cpu_time = 0
                                     self.race_result = None
                                     self.race_player_vel = 0.0
+            self.profiler.stop('events')
             
             if self.state == 'intro':
                 # Play cutscene music based on intro scene - use flags not exact frames!
                 if self.intro_timer == 0:
-                    pygame.mixer.stop()
-                    self.current_music = None
                     # Play cutscene 1 audio RIGHT when intro starts!
-                    if self.cutscene1_music:
-                        self.cutscene1_music.play()
-                        self.current_music = 'cutscene1'
+                    self.audio.play('cutscene1')
+                    self.audio.preload('cutscene2')
+                    self.audio.preload('cutscene3')
                 
-                if self.intro_timer == 120 and self.cutscene2_music:
-                    pygame.mixer.stop()
-                    self.cutscene2_music.play()
-                    self.current_music = 'cutscene2'
-                elif self.intro_timer == 240 and self.cutscene3_music:
-                    pygame.mixer.stop()
-                    self.cutscene3_music.play()
-                    self.current_music = 'cutscene3'
+                if self.intro_timer == 120 and self.audio.has('cutscene2'):
+                    self.audio.play('cutscene2')
+                elif self.intro_timer == 240 and self.audio.has('cutscene3'):
+                    self.audio.play('cutscene3')
                 
                 self.intro_timer += 1
                 self.draw_intro()
                 if self.intro_timer > 360:  # Extended for epic story!
                     self.state = 'menu'
                     self.intro_timer = 0
-                    self.particles = []
+                    self.particles.clear()
                     # Stop cutscene music, start menu music
-                    pygame.mixer.stop()
-                    if self.menu_music and self.current_music != 'menu':
-                        self.menu_music.play(loops=-1)  # Loop forever!
-                        self.current_music = 'menu'
+                    self.audio.play('menu', loops=-1)  # Loop forever!
             
             elif self.state == 'menu':
                 # Play menu music if not already playing
-                if self.menu_music and self.current_music != 'menu':
-                    pygame.mixer.stop()
-                    self.menu_music.play(loops=-1)
-                    self.current_music = 'menu'
+                self.audio.ensure('menu')
                 self.draw_menu()
                 self.draw_daily_challenge()
                 self.draw_clicker()
@@ -4671,10 +5300,7 @@ class Game:
                         self.load_level(self.current_level)
                         self.state = 'playing'
                         self.game_completed = False  # make sure not set mid-game!
-                        pygame.mixer.stop()
-                        if self.menu_music:
-                            self.menu_music.play(loops=-1)
-                            self.current_music = 'menu'
+                        self.audio.play('menu', loops=-1)
                     else:
                         # Only truly done if we've beaten ALL 30 levels
                         self.game_completed = True
@@ -4682,621 +5308,63 @@ class Game:
             
             elif self.state in ['playing', 'tutorial']:
                 # Keep menu music playing during gameplay (it's also gameplay music!)
-                if self.menu_music and self.current_music != 'menu':
-                    pygame.mixer.stop()
-                    self.menu_music.play(loops=-1)
-                    self.current_music = 'menu'
-
-                # ── DASH (SHIFT key) ──────────────────────────────────────
-                if not self.paused and not self.game_over:
-                    self.dash_cd = max(0, self.dash_cd - 1)
-                    # Decay invincibility frames
-                    if self.invincibility_frames > 0:
-                        self.invincibility_frames -= 1
-                        # Flash player when invincible after hit
-                        if self.invincibility_frames % 8 < 4:
-                            self.player.invincible = 4
-                self.dash_timer = max(0, self.dash_timer - 1)
-                dash_keys = pygame.key.get_pressed()
-                if (dash_keys[pygame.K_LSHIFT] or dash_keys[pygame.K_RSHIFT]) and self.dash_cd == 0:
-                    self.dash_cd = 40
-                    self.dash_timer = 8
-                    self.dash_dir = -1 if (dash_keys[pygame.K_LEFT] or dash_keys[pygame.K_a]) else 1
-                    self.player.vel_x = self.dash_dir * 16
-                    self.player.invincible = max(self.player.invincible, 8)
-                    for _ in range(6):
-                        self.particles.append(Particle(
-                            self.player.x + 10, self.player.y + 10,
-                            -self.dash_dir * random.uniform(2, 5), random.uniform(-1, 1),
-                            CYAN, 15))
-
-                # ── COMBO DECAY ───────────────────────────────────────────
-                if self.combo_timer > 0:
-                    self.combo_timer -= 1
-                    if self.combo_timer == 0:
-                        self.combo = 0
-
-                # ── COIN MAGNET DECAY ─────────────────────────────────────
-                self.coin_magnet = max(0, self.coin_magnet - 1)
-
-                # ── LEVEL TIMER ───────────────────────────────────────────
-                if self.state == 'playing':
-                    self.level_timer += 1
-
-                # ── SCREEN SHAKE ──────────────────────────────────────────
-                if self.shake_timer > 0:
-                    self.shake_timer -= 1
-
-                # ── FLOATY TEXT UPDATE ────────────────────────────────────
-                for ft in self.floaty_texts[:]:
-                    ft['y'] += ft['vy']
-                    ft['life'] -= 1
-                    if ft['life'] <= 0:
-                        self.floaty_texts.remove(ft)
-
-                if not self.paused and not self.game_over:
-                 self.player.update(self.platforms, self.projectiles)
-                
-                 # Update moving platforms!
-                 for moving_plat in getattr(self, 'moving_platforms', []):
-                    moving_plat.update()
-                    self.platforms = self.levels[self.current_level if self.state == 'playing' else 0]['platforms'] + getattr(self, 'moving_platforms', [])
-                
-                 for enemy in self.enemies:
-                    enemy.update(self.platforms)
-                 if self.boss:
-                    self.boss.update(self.platforms, self.player, self.projectiles)
-                
-                 if getattr(self, 'flying_boss', None):
-                    self.flying_boss.update(self.player)
-                
-                for projectile in self.projectiles[:]:
-                    projectile.update()
-                    if not (0 <= projectile.x <= 3000 and 0 <= projectile.y <= 1000):
-                        self.projectiles.remove(projectile)
-                        continue
-                    
-                    if projectile.is_player_bullet:
-                        for enemy in self.enemies[:]:
-                            if projectile.rect.colliderect(enemy.rect):
-                                # ShieldEnemy takes 2 hits!
-                                if isinstance(enemy, ShieldEnemy):
-                                    enemy.health -= 1
-                                    enemy.hit_flash = 10
-                                    if projectile in self.projectiles:
-                                        self.projectiles.remove(projectile)
-                                    if enemy.health <= 0:
-                                        self.enemies.remove(enemy)
-                                    else:
-                                        break
-                                else:
-                                    self.enemies.remove(enemy)
-                                    if projectile in self.projectiles:
-                                        self.projectiles.remove(projectile)
-                                self.session_kills += 1
-                                self.unlock_achievement('first_blood')
-                                # Death sparks!
-                                for _ in range(12):
-                                    self.particles.append(Particle(
-                                        enemy.x+10, enemy.y+10,
-                                        random.uniform(-4,4), random.uniform(-4,0),
-                                        (255,100,50), 20))
-                                # COMBO SYSTEM!
-                                self.combo += 1
-                                self.combo_timer = 120
-                                self.max_combo = max(self.max_combo, self.combo)
-                                bonus = self.combo * 2
-                                self.shop_coins += bonus
-                                self.bank_coins += bonus
-                                # Floaty combo text!
-                                label = f"+{bonus}" if self.combo < 3 else f"x{self.combo} COMBO! +{bonus}"
-                                col = YELLOW if self.combo < 3 else (ORANGE if self.combo < 6 else RED)
-                                self.floaty_texts.append({'x': enemy.x, 'y': enemy.y,
-                                    'vy': -2, 'text': label, 'col': col, 'life': 50, 'maxlife': 50})
-                                # Screen shake on big combos
-                                if self.combo >= 3:
-                                    self.shake_timer = 8
-                                    self.shake_intensity = min(self.combo, 8)
-                                # Epic particles!
-                                for _ in range(10):
-                                    self.particles.append(Particle(
-                                        enemy.x + enemy.width // 2, enemy.y + enemy.height // 2,
-                                        random.uniform(-4, 4), random.uniform(-4, 4),
-                                        RED, 30
-                                    ))
-                                break
-                        # Check boss hits
-                        if self.boss and projectile.rect.colliderect(self.boss.rect):
-                            self.boss.health -= 1
-                            self.shake_timer = 6; self.shake_intensity = 4
-                            self.floaty_texts.append({'x': self.boss.x+25, 'y': self.boss.y,
-                                'vy': -2, 'text': f'-1 HP ({self.boss.health} left)', 'col': RED, 'life': 45, 'maxlife': 45})
-                            if projectile in self.projectiles:
-                                self.projectiles.remove(projectile)
-                            if self.boss.health <= 0:
-                                self.boss = None
-                                self.boss_defeated = True
-                                self.shake_timer = 25; self.shake_intensity = 10
-                                self.floaty_texts.append({'x': SCREEN_WIDTH//2-60, 'y': 300,
-                                    'vy': -1, 'text': 'BOSS DOWN!!!', 'col': GREEN, 'life': 120, 'maxlife': 120})
-                                for _ in range(20):
-                                    self.particles.append(Particle(
-                                        self.player.x + 10, self.player.y + 10,
-                                        random.uniform(-4, 4), random.uniform(-4, 4),
-                                        RED if random.random() > 0.5 else YELLOW, 50
-                                    ))
-                        # Check flying boss hits
-                        if getattr(self, 'flying_boss', None) and projectile.rect.colliderect(self.flying_boss.rect):
-                            self.flying_boss.health -= 1
-                            if projectile in self.projectiles:
-                                self.projectiles.remove(projectile)
-                            for _ in range(5):
-                                self.particles.append(Particle(
-                                    self.flying_boss.x + 30, self.flying_boss.y + 30,
-                                    random.uniform(-2, 2), random.uniform(-2, 2),
-                                    RED, 20
-                                ))
-                            if self.flying_boss.health <= 0:
-                                self.flying_boss = None
-                    # Enemy bullets hit player
-                    elif projectile.rect.colliderect(self.player.rect):
-                        if not getattr(self.player, 'invincible', 0) and self.invincibility_frames <= 0:
-                            self.player_health -= 1
-                            self.level_no_death = False
-                            self.invincibility_frames = 90  # 1.5 sec invincible after hit
-                            try: self.sfx.get('hit',None) and self.sfx['hit'].play()
-                            except: pass
-                            # Shake
-                            self.shake_timer = 12; self.shake_intensity = 5
-                            if self.player_health <= 0:
-                                self.player_health = 0
-                                self.total_deaths += 1
-                                self.game_over = True
-                                self.game_over_timer = 0
-                                try: self.sfx.get('death',None) and self.sfx['death'].play()
-                                except: pass
-                            else:
-                                # Respawn at start, keep health
-                                self.player.x, self.player.y = self.levels[self.current_level]['spawn'] if self.state == 'playing' else self.tutorial_level['spawn']
-                                self.player.vel_x = 0; self.player.vel_y = 0
-                                self.total_deaths += 1
-                        if projectile in self.projectiles:
-                            self.projectiles.remove(projectile)
-                
-                for coin in self.coins:
-                    if not coin.collected:
-                        # Coin magnet - coins fly toward player!
-                        if self.coin_magnet > 0:
-                            dx = self.player.x - coin.x
-                            dy = self.player.y - coin.y
-                            dist = max(1, math.sqrt(dx*dx+dy*dy))
-                            if dist < 250:
-                                coin.x += dx/dist * 8
-                                coin.y += dy/dist * 8
-                                coin.rect.x = int(coin.x)
-                                coin.rect.y = int(coin.y)
-                        if self.player.rect.colliderect(coin.rect):
-                            coin.collected = True
-                            self.coins_collected += 1
-                            self.bank_coins  += 1
-                            self.shop_coins  += 1
-                            self.clicker_coins += 1
-                            self.run_coins   += 1
-                            try: self.sfx.get('coin') and self.sfx['coin'].play()
-                            except: pass
-
-                # Sticker collection (hidden sparkle in each level)!
-                if self.current_level not in self.stickers_found:
-                    if hasattr(self, '_sticker_rect') and self.player.rect.colliderect(self._sticker_rect):
-                        self.stickers_found.add(self.current_level)
-                        self.shop_coins += 5  # bonus coins for sticker!
-                
-                # Power-up collection!
-                for power_up in getattr(self, 'power_ups', []):
-                    if not power_up.collected and self.player.rect.colliderect(power_up.rect):
-                        power_up.collected = True
-                        try: self.sfx.get('powerup') and self.sfx['powerup'].play()
-                        except: pass
-                        # Apply power-up effect!
-                        if power_up.power_type == 'speed':
-                            self.player.speed_boost = 300
-                        elif power_up.power_type == 'invincible':
-                            self.player.invincible = 300
-                        elif power_up.power_type == 'mega_jump':
-                            self.player.mega_jump = 300
-                        elif power_up.power_type == 'magnet':
-                            self.coin_magnet = 300  # 5 seconds coin magnet!
-                        # Epic particles!
-                        for _ in range(20):
-                            self.particles.append(Particle(
-                                power_up.x + 12, power_up.y + 12,
-                                random.uniform(-4, 4), random.uniform(-4, 4),
-                                power_up.colors[power_up.power_type], 40
-                            ))
-                
-                for spike in self.spikes:
-                    if self.player.rect.colliderect(spike.rect):
-                        self.player.x, self.player.y = self.levels[self.current_level]['spawn'] if self.state == 'playing' else self.tutorial_level['spawn']
-                        self.player.vel_x = 0
-                        self.player.vel_y = 0
-                for enemy in self.enemies:
-                    if self.player.rect.colliderect(enemy.rect):
-                        self.player.x, self.player.y = self.levels[self.current_level]['spawn'] if self.state == 'playing' else self.tutorial_level['spawn']
-                        self.player.vel_x = 0
-                        self.player.vel_y = 0
-                if self.boss and self.player.rect.colliderect(self.boss.rect):
-                    if self.player.vel_y > 0 and self.player.rect.bottom <= self.boss.rect.top + 10:
-                        self.boss.health -= 1
-                        self.player.vel_y = JUMP_STRENGTH
-                        if self.boss.health <= 0:
-                            self.boss = None
-                            self.boss_defeated = True
-                            if self.current_level == 29:
-                                self.unlock_achievement('wowy')
-                        self.player.x, self.player.y = self.levels[self.current_level]['spawn']
-                        self.player.vel_x = 0
-                        self.player.vel_y = 0
-                
-                # Flying boss collision - JUMP ON RED GUY!
-                if getattr(self, 'flying_boss', None) and self.player.rect.colliderect(self.flying_boss.rect):
-                    if self.player.vel_y > 0 and self.player.rect.bottom <= self.flying_boss.rect.top + 15:
-                        self.flying_boss.health -= 1
-                        self.player.vel_y = JUMP_STRENGTH  # Bounce!
-                        # Epic particles!
-                        for _ in range(10):
-                            self.particles.append(Particle(
-                                self.flying_boss.x + self.flying_boss.width // 2,
-                                self.flying_boss.y + self.flying_boss.height // 2,
-                                random.uniform(-3, 3), random.uniform(-3, 3),
-                                RED, 30
-                            ))
-                        if self.flying_boss.health <= 0:
-                            self.flying_boss = None
-                            self.boss_defeated = True  # Track boss is dead!
-                            if self.current_level == 29:
-                                self.unlock_achievement('wowy')
-                            # EPIC EXPLOSION!
-                            for _ in range(30):
-                                self.particles.append(Particle(
-                                    self.player.x + 10, self.player.y + 10,
-                                    random.uniform(-5, 5), random.uniform(-5, 5),
-                                    RED if random.random() > 0.5 else YELLOW, 60
-                                ))
-                    else:
-                        # Hit from side = death!
-                        self.player.x, self.player.y = self.levels[self.current_level]['spawn']
-                        self.player.vel_x = 0
-                        self.player.vel_y = 0
-                
-                if self.player.rect.colliderect(self.exit_rect):
-                    # Can only exit if no boss or boss is defeated!
-                    can_exit = True
-                    if self.boss is not None:
-                        can_exit = False  # Boss still alive!
-                    if getattr(self, 'flying_boss', None) is not None:
-                        can_exit = False  # Flying boss still alive!
-                    
-                    if can_exit and self.state == 'playing':
-                        # Save best time for this level!
-                        if self.current_level not in self.best_times or self.level_timer < self.best_times[self.current_level]:
-                            self.best_times[self.current_level] = self.level_timer
-                        # Speed run achievement (under 15 seconds = 900 frames)
-                        if self.level_timer < 900:
-                            self.unlock_achievement('speed_run')
-                        # No damage achievement
-                        if self.level_no_death:
-                            self.unlock_achievement('no_damage')
-                        # All coins achievement
-                        if self.coins_collected == self.total_coins and self.total_coins > 0:
-                            self.unlock_achievement('all_coins_1')
-                        # Daily challenge check
-                        if self.current_level == self.daily_level and not self.daily_completed:
-                            goal = self.daily_goal
-                            if goal == 'no_damage' and self.level_no_death:
-                                self.daily_completed = True
-                                self.shop_coins += self.daily_reward
-                                self.floaty_texts.append({'x':SCREEN_WIDTH//2-80,'y':250,
-                                    'vy':-1,'text':f'📅 DAILY DONE! +{self.daily_reward}🪙','col':PURPLE,'life':180,'maxlife':180})
-                            elif goal == 'speed_run' and self.level_timer < 900:
-                                self.daily_completed = True
-                                self.shop_coins += self.daily_reward
-                                self.floaty_texts.append({'x':SCREEN_WIDTH//2-80,'y':250,
-                                    'vy':-1,'text':f'📅 DAILY DONE! +{self.daily_reward}🪙','col':PURPLE,'life':180,'maxlife':180})
-                            elif goal == 'all_coins' and self.coins_collected == self.total_coins:
-                                self.daily_completed = True
-                                self.shop_coins += self.daily_reward
-                                self.floaty_texts.append({'x':SCREEN_WIDTH//2-80,'y':250,
-                                    'vy':-1,'text':f'📅 DAILY DONE! +{self.daily_reward}🪙','col':PURPLE,'life':180,'maxlife':180})
-                        self.level_no_death = True  # reset for next level
-                        self.level_timer = 0
-                        # Mark this level as beaten!
-                        self.levels_beaten.add(self.current_level)
-                        # Update high score
-                        if self.run_coins > self.high_score:
-                            self.high_score = self.run_coins
-                        # AUTO-SAVE!
-                        self.save_game()
-                        self.save_notif = 120
-                        next_level = self.current_level + 1
-                        
-                        # TRIGGER CUTSCENES!
-                        cutscene_to_show = None
-                        if next_level == 5 and 4 not in self.cutscenes_seen:  # After level 5 flying boss
-                            cutscene_to_show = 4  # Gas station
-                            self.cutscenes_seen.add(4)
-                            self.unlock_achievement('gotta_drink')
-                        elif next_level == 6 and 8 not in self.cutscenes_seen:  # After level 6 long road
-                            cutscene_to_show = 8  # The Long Road cutscene
-                            self.cutscenes_seen.add(8)
-                        elif next_level == 8 and 9 not in self.cutscenes_seen:  # After level 8, desert gas station
-                            cutscene_to_show = 9  # Desert gas station
-                            self.cutscenes_seen.add(9)
-                        elif next_level == 10 and 5 not in self.cutscenes_seen:  # After level 10 boss
-                            cutscene_to_show = 5  # Confrontation
-                            self.cutscenes_seen.add(5)
-                        elif next_level == 15 and 6 not in self.cutscenes_seen:  # After level 15, entering woods
-                            cutscene_to_show = 6  # Enter the Woods
-                            self.cutscenes_seen.add(6)
-                        elif next_level == 29 and 7 not in self.cutscenes_seen:  # Before level 30
-                            cutscene_to_show = 7  # Final boss
-                            self.cutscenes_seen.add(7)
-                        
-                        if cutscene_to_show:
-                            self.cutscene_mode = cutscene_to_show
-                            self.cutscene_timer = 0
-                            self.cutscene_next_level = next_level  # remember where to go after!
-                            self.state = 'cutscene'
-                            # Play cutscene music
-                            pygame.mixer.stop()
-                            cutscene_music = getattr(self, f'cutscene{cutscene_to_show}_music', None)
-                            if cutscene_music:
-                                cutscene_music.play()
-                        else:
-                            self.current_level = next_level
-                            if self.current_level < len(self.levels):
-                                self.load_level(self.current_level)
-                            else:
-                                self.game_completed = True
-                                self.state = 'intro'
-                                self.intro_timer = 0
-                                self.particles = []
-                                # 1 Sitting — completed whole game from level 0 without restarting
-                                if self.session_started_level == 0:
-                                    self.unlock_achievement('1_sitting')
-                    else:
-                        self.state = 'intro'
-                        self.intro_timer = 0
-                        self.particles = []
-                # Check for falling off screen
-                if self.player.y > 1000 and not self.game_over:
-                    self.player_health -= 1
-                    self.level_no_death = False
-                    self.invincibility_frames = 60
-                    self.shake_timer = 10; self.shake_intensity = 6
-                    try: self.sfx.get('hit') and self.sfx['hit'].play()
-                    except: pass
-                    if self.player_health <= 0:
-                        self.player_health = 0
-                        self.total_deaths += 1
-                        self.game_over = True
-                        self.game_over_timer = 0
-                    else:
-                        self.total_deaths += 1
-                        spawn = self.levels[self.current_level]['spawn'] if self.state=='playing' else self.tutorial_level['spawn']
-                        self.player.x, self.player.y = spawn
-                        self.player.vel_x = 0; self.player.vel_y = 0
-                
-                self.update_camera()
-                # ── SCREEN SHAKE ──────────────────────────────────────────
-                shake_x = random.randint(-self.shake_intensity, self.shake_intensity) if self.shake_timer > 0 else 0
-                shake_y = random.randint(-self.shake_intensity, self.shake_intensity) if self.shake_timer > 0 else 0
-                self.camera_x += shake_x
-                self.camera_y += shake_y
-                self.draw_background()
-                self.draw_weather()
-                
-                # Draw regular platforms (BLACK!)
-                for platform in self.platforms:
-                    if not isinstance(platform, MovingPlatform):  # Regular platforms
-                        pygame.draw.rect(self.screen, PLATFORM_COLOR, 
-                                        (platform.x - self.camera_x, platform.y - self.camera_y, 
-                                         platform.width, platform.height))
-                        pygame.draw.rect(self.screen, GRAY, 
-                                        (platform.x - self.camera_x, platform.y - self.camera_y, 
-                                         platform.width, platform.height), 2)
-                
-                # Draw moving platforms separately with their draw method
-                for moving_plat in getattr(self, 'moving_platforms', []):
-                    moving_plat.draw(self.screen, self.camera_x, self.camera_y)
-                
-                for enemy in self.enemies:
-                    enemy.draw(self.screen, self.camera_x, self.camera_y)
-                if self.boss:
-                    self.boss.draw(self.screen, self.camera_x, self.camera_y)
-                
-                if getattr(self, 'flying_boss', None):
-                    self.flying_boss.draw(self.screen, self.camera_x, self.camera_y)
-
-                # Update and draw NPCs
-                for npc in getattr(self, 'npcs', []):
-                    npc.update(self.player.rect)
-                    npc.draw(self.screen, self.camera_x, self.camera_y)
-                
-                for coin in self.coins:
-                    coin.draw(self.screen, self.camera_x, self.camera_y)
-
-                # Draw gems!
-                for gem in getattr(self, 'gems', []):
-                    gem.draw(self.screen, self.camera_x, self.camera_y)
-                    if not gem.collected and self.player.rect.colliderect(gem.rect):
-                        gem.collected = True
-                        self.gems_collected += 1
-                        self.shop_coins += 5; self.bank_coins += 5; self.run_coins += 5
-                        self.floaty_texts.append({'x': gem.x, 'y': gem.y,
-                            'vy': -2, 'text': '💎 +5', 'col': (150,200,255), 'life': 55, 'maxlife': 55})
-                        try: self.sfx.get('gem') and self.sfx['gem'].play()
-                        except: pass
-                for power_up in getattr(self, 'power_ups', []):
-                    power_up.draw(self.screen, self.camera_x, self.camera_y)
-                
-                for spike in self.spikes:
-                    spike.draw(self.screen, self.camera_x, self.camera_y)
-                for projectile in self.projectiles:
-                    projectile.draw(self.screen, self.camera_x, self.camera_y)
-
-                # Draw sticker - BIG visible spinning star with bouncing arrow
-                if self.current_level not in self.stickers_found and hasattr(self, '_sticker_rect'):
-                    self._sticker_anim += 0.06
-                    sr = self._sticker_rect
-                    cx2 = sr.x + sr.w // 2 - self.camera_x
-                    cy2 = sr.y + sr.h // 2 - self.camera_y
-                    bob = math.sin(self._sticker_anim * 2) * 6
-                    cy2 += bob
-
-                    # Big outer glow
-                    for r, alpha in [(28, 30), (20, 60), (14, 100)]:
-                        gs = pygame.Surface((r*2, r*2), pygame.SRCALPHA)
-                        pygame.draw.circle(gs, (255, 220, 0, alpha), (r, r), r)
-                        self.screen.blit(gs, (cx2 - r, cy2 - r))
-
-                    # Spinning 8-point star
-                    spin = self._sticker_anim * 60
-                    for angle in range(0, 360, 45):
-                        a = math.radians(angle + spin)
-                        r_len = 18 if angle % 90 == 0 else 11
-                        ex2 = cx2 + math.cos(a) * r_len
-                        ey2 = cy2 + math.sin(a) * r_len
-                        pygame.draw.line(self.screen, YELLOW, (int(cx2), int(cy2)), (int(ex2), int(ey2)), 3)
-                    pygame.draw.circle(self.screen, WHITE, (int(cx2), int(cy2)), 7)
-                    pygame.draw.circle(self.screen, YELLOW, (int(cx2), int(cy2)), 5)
-
-                    # Bouncing "⭐" label above it
-                    sf = pygame.font.Font(None, 22)
-                    slbl = sf.render("STICKER!", True, YELLOW)
-                    self.screen.blit(slbl, (cx2 - slbl.get_width()//2, cy2 - 38))
-
-                    # Downward arrow pointing at it
-                    arr_y = cy2 - 50 + math.sin(self._sticker_anim * 3) * 5
-                    pygame.draw.polygon(self.screen, YELLOW, [
-                        (cx2, arr_y + 14), (cx2 - 7, arr_y), (cx2 + 7, arr_y)
-                    ])
-
-                self.player.draw(self.screen, self.camera_x, self.camera_y)
-                # Draw equipped hat on player in-game!
-                hat = getattr(self, 'hat_equipped', None)
-                if hat:
-                    self._draw_hat_at(hat,
-                        int(self.player.x - self.camera_x + 2),
-                        int(self.player.y - self.camera_y - 2))
-
-                # Draw hat on top of player!
-                hat = getattr(self, 'hat_equipped', None)
-                if hat:
-                    px = self.player.rect.x - self.camera_x
-                    py = self.player.rect.y - self.camera_y
-                    self._draw_hat_at(hat, px + 10, py - 2)
-
-                pygame.draw.rect(self.screen, GREEN,
-                                (self.exit_rect.x - self.camera_x, self.exit_rect.y - self.camera_y,
-                                 self.exit_rect.width, self.exit_rect.height))
-                self.draw_mini_map()
-                if self.state == 'playing':
-                    self.draw_ui()
-                    self.draw_health()
-                    self.draw_big_boss_healthbar()
-                    self.draw_exit_portal()
-                elif self.state == 'tutorial':
-                    self.draw_tutorial_ui()
-
-                # ── FLOATY TEXTS (world space) ─────────────────────────────
-                ff = pygame.font.Font(None, 28)
-                for ft in self.floaty_texts:
-                    a = int(255 * ft['life'] / ft['maxlife'])
-                    col = (*ft['col'][:3],) if len(ft['col']) == 3 else ft['col']
-                    surf = ff.render(ft['text'], True, col)
-                    surf.set_alpha(a)
-                    self.screen.blit(surf, (ft['x'] - self.camera_x, ft['y'] - self.camera_y))
-
-                # ── COMBO DISPLAY ──────────────────────────────────────────
-                if self.combo >= 2 and self.combo_timer > 0:
-                    cf = pygame.font.Font(None, 52)
-                    fade = min(255, self.combo_timer * 4)
-                    combo_col = (255, max(0,255-self.combo*20), 0)
-                    cs = cf.render(f"x{self.combo} COMBO!", True, combo_col)
-                    cs.set_alpha(fade)
-                    self.screen.blit(cs, (SCREEN_WIDTH//2 - cs.get_width()//2, 80))
-
-                # ── DASH COOLDOWN BAR ──────────────────────────────────────
-                if self.dash_cd > 0:
-                    df = pygame.font.Font(None, 20)
-                    ds = df.render("DASH", True, CYAN)
-                    self.screen.blit(ds, (SCREEN_WIDTH - 90, SCREEN_HEIGHT - 50))
-                    pygame.draw.rect(self.screen, DARK_GRAY, (SCREEN_WIDTH-90, SCREEN_HEIGHT-34, 80, 8))
-                    fill = int(80 * (1 - self.dash_cd / 40))
-                    pygame.draw.rect(self.screen, CYAN, (SCREEN_WIDTH-90, SCREEN_HEIGHT-34, fill, 8))
-                else:
-                    df = pygame.font.Font(None, 20)
-                    ds = df.render("DASH ready!", True, CYAN)
-                    self.screen.blit(ds, (SCREEN_WIDTH - 100, SCREEN_HEIGHT - 50))
-
-                # ── SAVE NOTIFICATION ─────────────────────────────────────
-                if self.save_notif > 0:
-                    self.save_notif -= 1
-                    a = min(255, self.save_notif * 4)
-                    sf2 = pygame.font.Font(None, 36)
-                    ss = sf2.render("💾 SAVED!", True, GREEN)
-                    ss.set_alpha(a)
-                    self.screen.blit(ss, (SCREEN_WIDTH//2 - ss.get_width()//2, 40))
-
-                self.draw_achievement_popups()
-                self.check_achievements()
-                self.draw_level_transition()
-                # Gem count HUD
-                gems_left = sum(1 for g in getattr(self,'gems',[]) if not g.collected)
-                if gems_left > 0:
-                    gf=pygame.font.Font(None,22)
-                    gt=gf.render(f"💎 {gems_left} gem{'s' if gems_left>1 else ''} left",True,(150,200,255))
-                    self.screen.blit(gt,(SCREEN_WIDTH-gt.get_width()-12,SCREEN_HEIGHT-72))
-                if self.state == 'playing':
-                    secs = self.level_timer // 60
-                    best = self.best_times.get(self.current_level)
-                    tf = pygame.font.Font(None, 22)
-                    tcol = GREEN if best and self.level_timer < best else WHITE
-                    ts2 = tf.render(f"⏱ {secs}s" + (f"  best:{best//60}s" if best else ""), True, tcol)
-                    self.screen.blit(ts2, (SCREEN_WIDTH//2 - ts2.get_width()//2, SCREEN_HEIGHT - 24))
-
-                # Journal overlay during gameplay
-                if self.journal_open:
-                    self.draw_journal()
-
-                # Level name banner (first ~3 seconds of level)
-                if self.state == 'playing':
-                    self.draw_level_banner()
-
-                # Pause screen
-                if self.paused:
-                    self.draw_pause()
-
-                # Game over screen
-                if self.game_over:
-                    self.draw_game_over()
+                self.audio.ensure('menu')
+
+                if self.record_path and self.recorder is None:
+                    self.start_recording()
+                steps = self.timestep.advance()
+                self.profiler.start('simulation')
+                for _ in range(steps):
+                    self.capture_motion()
+                    tick_input = TickInput.capture(pressed)
+                    if self.recorder:
+                        self.recorder.record(tick_input)
+                    self.step(tick_input)
+                    pressed = []
+                self.profiler.stop('simulation')
+                if not steps:
+                    carry = pressed
+                with self.interp.blend(self.timestep.alpha):
+                    self.draw_gameplay()
+            
+            if self.state not in ['playing', 'tutorial']:
+                self.timestep.reset()
+                if self.recorder and self.state != 'cutscene':
+                    self.stop_recording()
             
             if self.game_completed and self.state not in ['playing','tutorial','cutscene','intro']:
                 self.screen.fill(BLACK)
-                font = pygame.font.Font(None, 64)
+                font = FONTS.get(64)
                 text = font.render("🎉 YOU WIN! 🎉", True, YELLOW)
                 self.screen.blit(text, (SCREEN_WIDTH // 2 - text.get_width() // 2, SCREEN_HEIGHT // 2 - 60))
-                font2 = pygame.font.Font(None, 36)
+                font2 = FONTS.get(36)
                 text2 = font2.render(f"Levels beaten: {len(self.levels_beaten)} / 30   Stickers: {len(self.stickers_found)} / 30", True, WHITE)
                 self.screen.blit(text2, (SCREEN_WIDTH // 2 - text2.get_width() // 2, SCREEN_HEIGHT // 2 + 10))
                 text3 = font2.render("Press ESC to return to menu", True, GRAY)
                 self.screen.blit(text3, (SCREEN_WIDTH // 2 - text3.get_width() // 2, SCREEN_HEIGHT // 2 + 60))
             
-            pygame.display.flip()
+            if self.show_profiler:
+                self.profiler.draw(self.screen, FONTS.get(18), notes=[f"culled  {self.culled}", FONTS.summary()])
+            with self.profiler.section('flip'):
+                pygame.display.flip()
+            self.profiler.end_frame()
             self.clock.tick(FPS)
         
+        if self.recorder:
+            self.stop_recording()
+        if self.profiler.export_file:
+            print(FONTS.report())  # --profile runs get the totals for sizing the text budget
+        self.profiler.stop_export()
+        self.saver.flush()
         pygame.quit()
 
 if __name__ == "__main__":
+    import sys
     game = Game()
+    if '--record' in sys.argv:
+        game.record_path = sys.argv[sys.argv.index('--record') + 1]
+    if '--profile' in sys.argv:
+        # Per-frame section timings to a .csv or .jsonl file
+        game.profiler.start_export(sys.argv[sys.argv.index('--profile') + 1])
+        game.set_profiling(True)
     game.run()
@@ -0,0 +1,116 @@
+"""Per-level collision world, shared by c2.py, c2x.py and c4.py.
+
+The world has two layers. Static platforms are bucketed into a uniform grid
+once when a level loads, so an entity only tests the platforms in the cells it
+overlaps instead of every platform in the level. Moving platforms are few and
+change cells every frame, so they live in a small dynamic layer that every
+query includes and that update() moves in place - the world object itself is
+never rebuilt, so anything holding on to it always sees the current layout.
+
+SpatialIndex uses the same grid for draw culling: pickups and NPCs are
+bucketed once per level so only the ones near the camera get drawn.
+"""
+
+
+def grid_cells(rect, cell_size):
+    """Every (cx, cy) grid cell that rect overlaps."""
+    cs = cell_size
+    x0, x1 = rect.left // cs, max(rect.left, rect.right - 1) // cs
+    y0, y1 = rect.top // cs, max(rect.top, rect.bottom - 1) // cs
+    for cx in range(x0, x1 + 1):
+        for cy in range(y0, y1 + 1):
+            yield cx, cy
+
+
+class PlatformGrid:
+    def __init__(self, static, dynamic=(), cell_size=256):
+        self.cell_size = cell_size
+        self.static = list(static)
+        self.dynamic = list(dynamic)
+        self.cells = {}
+        for i, rect in enumerate(self.static):
+            for key in self._cells(rect):
+                self.cells.setdefault(key, []).append(i)
+
+    def __iter__(self):
+        yield from self.static
+        yield from self.dynamic
+
+    def __len__(self):
+        return len(self.static) + len(self.dynamic)
+
+    def update(self):
+        """Advance every moving platform; their rects change in place."""
+        for platform in self.dynamic:
+            platform.update()
+
+    def _cells(self, rect):
+        return grid_cells(rect, self.cell_size)
+
+    def near(self, rect, margin=0):
+        """Platforms that might touch rect (grown by margin on every side).
+
+        Static platforms come back in level order followed by the moving ones,
+        the same order the old full-list scans used, so collision resolution
+        is unchanged.
+        """
+        if margin:
+            rect = rect.inflate(margin * 2, margin * 2)
+        cells = self.cells
+        found = set()
+        for key in self._cells(rect):
+            bucket = cells.get(key)
+            if bucket:
+                found.update(bucket)
+        static = self.static
+        result = [static[i] for i in sorted(found)]
+        result.extend(self.dynamic)
+        return result
+
+
+class SpatialIndex:
+    """Grid of entities (anything with a .rect) for finding the ones in view.
+
+    Entities that can move call move() after their rect changes so they get
+    re-bucketed. query() returns hits in the order they were added, so
+    culled draw loops keep their original layering.
+    """
+    def __init__(self, items=(), cell_size=256):
+        self.cell_size = cell_size
+        self.items = []
+        self.cells = {}
+        self.where = {}  # id(item) -> (position in items, cells it's in)
+        for item in items:
+            self.add(item)
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, item):
+        i = len(self.items)
+        self.items.append(item)
+        keys = tuple(grid_cells(item.rect, self.cell_size))
+        for key in keys:
+            self.cells.setdefault(key, []).append(i)
+        self.where[id(item)] = (i, keys)
+
+    def move(self, item):
+        i, old = self.where[id(item)]
+        keys = tuple(grid_cells(item.rect, self.cell_size))
+        if keys == old:
+            return
+        for key in old:
+            self.cells[key].remove(i)
+        for key in keys:
+            self.cells.setdefault(key, []).append(i)
+        self.where[id(item)] = (i, keys)
+
+    def query(self, rect):
+        found = set()
+        cells = self.cells
+        for key in grid_cells(rect, self.cell_size):
+            bucket = cells.get(key)
+            if bucket:
+                found.update(bucket)
+        items = self.items
+        return [items[i] for i in sorted(found) if items[i].rect.colliderect(rect)]
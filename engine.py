@@ -0,0 +1,143 @@
+"""Entity base classes and camera shared by c2.py, c2x.py and c4.py.
+
+The three games grew their own copies of the same movement code - the
+player's two-pass platform collision, the patrolling enemy that turns at the
+end of its beat or at a wall, straight-line projectiles, the eased camera -
+and a fix to one copy rarely reached the others. The hot paths live here
+once. Each game subclasses these for its own sizes, speeds, drawing and
+extras (dashes, shields, power-ups), and tunes the rest through class
+attributes and arguments (fall speed cap, camera clamps).
+
+Collision goes through collision.PlatformGrid, so every game gets the
+broadphase. The statements are the ones the games already ran, in the same
+order, with one deliberate change: move_and_collide first brings the rect
+back to x/y. Respawns only set x/y, and the old per-game copies then
+collided one tick from the stale rect (the spot the player died), so any
+run with a respawn now plays out differently. c4 recordings made before
+this are replay.py version 1 and are refused on load.
+"""
+import pygame
+
+
+class Entity:
+    """Anything with a float position and a pygame.Rect hitbox."""
+    def __init__(self, x, y, width, height):
+        self.x = x
+        self.y = y
+        self.width = width
+        self.height = height
+        self.rect = pygame.Rect(x, y, width, height)
+
+
+class Body(Entity):
+    """An Entity with velocity that falls and is stopped by platforms."""
+    max_fall = None   # Terminal fall speed; None for no cap
+
+    def __init__(self, x, y, width, height):
+        super().__init__(x, y, width, height)
+        self.vel_x = 0
+        self.vel_y = 0
+        self.on_ground = False
+
+    def fall(self, gravity):
+        self.vel_y += gravity
+        if self.max_fall is not None and self.vel_y > self.max_fall:
+            self.vel_y = self.max_fall
+
+    def move_and_collide(self, platforms, solid_x=True):
+        """Move by the velocity, resolving platform hits one axis at a time.
+
+        One broadphase query covering the whole move is reused for both axes.
+        With solid_x off, platforms only stop vertical movement.
+        """
+        # x/y may have been set directly (respawns); the query must start there
+        self.rect.x = self.x
+        self.rect.y = self.y
+        nearby = platforms.near(self.rect.union(self.rect.move(self.vel_x, self.vel_y)), self.width)
+        self.x += self.vel_x
+        self.rect.x = self.x
+        if solid_x:
+            for platform in nearby:
+                if self.rect.colliderect(platform):
+                    if self.vel_x > 0:
+                        self.rect.right = platform.left
+                        self.x = self.rect.x
+                    elif self.vel_x < 0:
+                        self.rect.left = platform.right
+                        self.x = self.rect.x
+                    self.vel_x = 0
+        self.y += self.vel_y
+        self.rect.y = self.y
+        self.on_ground = False
+        for platform in nearby:
+            if self.rect.colliderect(platform):
+                if self.vel_y > 0:
+                    self.rect.bottom = platform.top
+                    self.y = self.rect.y
+                    self.vel_y = 0
+                    self.on_ground = True
+                    self.landed()
+                elif self.vel_y < 0:
+                    self.rect.top = platform.bottom
+                    self.y = self.rect.y
+                    self.vel_y = 0
+
+    def landed(self):
+        """Called each time a downward move ends on a platform."""
+
+
+class Patroller(Entity):
+    """Walks back and forth up to patrol_distance from where it started."""
+    truncate_x = False   # Hitbox x truncated from the float x rather than rounded (pygame's default)
+
+    def __init__(self, x, y, width, height, patrol_distance):
+        super().__init__(x, y, width, height)
+        self.start_x = x
+        self.patrol_distance = patrol_distance
+        self.direction = 1
+
+    def patrol(self, speed):
+        self.x += speed * self.direction
+        if abs(self.x - self.start_x) >= self.patrol_distance:
+            self.direction *= -1
+        self.rect.x = int(self.x) if self.truncate_x else self.x
+
+    def bounce_off(self, platforms, margin=0):
+        """Step back out of any platform walked into and turn around."""
+        for platform in platforms.near(self.rect, margin):
+            if self.rect.colliderect(platform):
+                if self.direction > 0:
+                    self.rect.right = platform.left
+                    self.x = self.rect.x
+                else:
+                    self.rect.left = platform.right
+                    self.x = self.rect.x
+                self.direction *= -1
+
+    def blocked(self, platforms, margin=0):
+        """Whether the hitbox overlaps a platform."""
+        return any(self.rect.colliderect(p) for p in platforms.near(self.rect, margin))
+
+
+class Bullet(Entity):
+    """Flies in a straight line at a fixed velocity."""
+    def __init__(self, x, y, width, height, vel_x, vel_y=0):
+        super().__init__(x, y, width, height)
+        self.vel_x = vel_x
+        self.vel_y = vel_y
+
+    def update(self):
+        self.x += self.vel_x
+        self.y += self.vel_y
+        self.rect.x = self.x
+        self.rect.y = self.y
+
+
+def follow(camera, target, ease=0.1, low=None, high=None):
+    """One axis of a camera moved ease of the way to target, then clamped."""
+    camera += (target - camera) * ease
+    if low is not None and camera < low:
+        camera = low
+    if high is not None and camera > high:
+        camera = high
+    return camera
@@ -0,0 +1,50 @@
+"""Glow and halo sprites shared by c2.py, c2x.py and c4.py.
+
+Glows used to be drawn by allocating a fresh SRCALPHA Surface, drawing one
+translucent circle or rect on it and blitting it, every frame, for every gem,
+bullet, pickup and shield on screen. Here each distinct sprite, keyed by
+(shape, size, colour, alpha), is drawn once and kept. Pulsing glows pick
+their alpha from a small integer range, so the set of sprites stays bounded
+and every frame after the first few allocates nothing.
+
+circle() sprites are 2r x 2r with the circle centred; rect() sprites are
+exactly the given size. Both are what the old per-frame code drew, so
+blitting them at the same spot gives the same pixels.
+"""
+import pygame
+
+_sprites = {}   # (shape, size, rgb, alpha) -> Surface
+
+
+def circle(radius, color, alpha=255):
+    """A 2r x 2r sprite holding a filled circle of colour at alpha."""
+    key = ('circle', radius, tuple(color[:3]), alpha)
+    sprite = _sprites.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(sprite, (*color[:3], alpha), (radius, radius), radius)
+        sprite = _store(key, sprite)
+    return sprite
+
+
+def rect(width, height, color, alpha=255, border_radius=0):
+    """A width x height sprite filled with colour at alpha (rounded corners optional)."""
+    key = ('rect', (width, height, border_radius), tuple(color[:3]), alpha)
+    sprite = _sprites.get(key)
+    if sprite is None:
+        sprite = pygame.Surface((width, height), pygame.SRCALPHA)
+        pygame.draw.rect(sprite, (*color[:3], alpha), (0, 0, width, height), 0, border_radius)
+        sprite = _store(key, sprite)
+    return sprite
+
+
+def _store(key, sprite):
+    if pygame.display.get_surface() is not None:
+        sprite = sprite.convert_alpha()   # Same pixels, in the format that blits fastest
+    _sprites[key] = sprite
+    return sprite
+
+
+def blit_circle(screen, cx, cy, radius, color, alpha=255):
+    """Blit circle() so that it's centred on (cx, cy)."""
+    screen.blit(circle(radius, color, alpha), (cx - radius, cy - radius))
@@ -0,0 +1,65 @@
+"""Run c4's gameplay simulation with no window, no audio and no frame cap.
+
+    python headless.py --level 3 --ticks 5000
+
+Game.step() is driven from a scripted input (hold RIGHT, jump on a fixed
+beat) as fast as the CPU allows, and ticks/s is printed at the end. Cutscenes
+are skipped straight to the level they lead to, and the save file is never
+touched.
+"""
+import argparse
+import os
+import time
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+os.environ.setdefault('SDL_AUDIODRIVER', 'dummy')
+
+import pygame
+from c4 import Game, TickInput
+
+
+def scripted_input(tick, jump_every=30):
+    """Run right and tap jump every jump_every ticks."""
+    pressed = [pygame.K_SPACE] if tick % jump_every == 0 else []
+    return TickInput([pygame.K_RIGHT], pressed)
+
+
+def advance(game, tick_input):
+    """Run one tick, skipping any cutscene it triggers. False once the run is over."""
+    game.step(tick_input)
+    if game.state == 'cutscene':
+        next_level = getattr(game, 'cutscene_next_level', game.current_level + 1)
+        if next_level >= len(game.levels):
+            return False
+        game.current_level = next_level
+        game.load_level(next_level)
+        game.state = 'playing'
+    return game.state in ['playing', 'tutorial']
+
+
+def run(level=0, ticks=3600, jump_every=30, seed=None):
+    game = Game(headless=True)
+    game.begin_run(level, seed)
+
+    start = time.perf_counter()
+    done = 0
+    for done in range(1, ticks + 1):
+        if not advance(game, scripted_input(done, jump_every)):
+            break
+    elapsed = time.perf_counter() - start
+
+    rate = done / elapsed if elapsed else float('inf')
+    print(f"{done} ticks in {elapsed:.2f}s  ->  {rate:.0f} ticks/s "
+          f"(level {game.current_level}, state {game.state})")
+    pygame.quit()
+    return rate
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--level', type=int, default=0, help="level index, -1 for the tutorial")
+    parser.add_argument('--ticks', type=int, default=3600, help="ticks to simulate")
+    parser.add_argument('--jump-every', type=int, default=30, help="ticks between jumps")
+    parser.add_argument('--seed', type=int, help="RNG seed (random if omitted)")
+    args = parser.parse_args()
+    run(args.level, args.ticks, args.jump_every, args.seed)
@@ -0,0 +1,98 @@
+"""Floating text labels and faded banners for c4.py.
+
+Floaty texts ("+6", "x3 COMBO! +6", "💎 +5", ...) used to be dicts in a list.
+Each one was re-rendered with font.render every frame it was on screen and
+removed with list.remove on a copy of the list. A LabelPool renders a
+label's text once, when it's spawned. From then on only its position and
+alpha change. Labels live in a fixed set of slots that are handed out from
+a free list and given back by swapping with the last live label, so spawning
+and expiring are O(1) and a combo burst allocates nothing after its first
+frame.
+
+A Banner is the same idea for the one-line HUD messages that fade out in
+place (combo count, "SAVED!"): it keeps its last render and only rasterises
+again when the text or colour changes.
+"""
+
+
+class Label:
+    __slots__ = ('surface', 'x', 'y', 'vy', 'life', 'max_life')
+
+    def __init__(self):
+        self.surface = None
+
+
+class LabelPool:
+    def __init__(self, capacity=64):
+        self.capacity = capacity
+        self.active = []                                    # Live labels, in no particular order
+        self.free = [Label() for _ in range(capacity)]
+
+    def __len__(self):
+        return len(self.active)
+
+    def __iter__(self):
+        return iter(self.active)
+
+    def spawn(self, surface, x, y, vy, life):
+        """Show surface at world (x, y), drifting vy per tick and fading out over life ticks.
+
+        When every slot is taken, the label closest to expiring makes way.
+        """
+        if self.free:
+            label = self.free.pop()
+            self.active.append(label)
+        else:
+            label = min(self.active, key=lambda l: l.life)
+        label.surface = surface
+        label.x = x
+        label.y = y
+        label.vy = vy
+        label.life = label.max_life = life
+        return label
+
+    def update(self):
+        """Drift every label one tick and recycle the ones that have run out."""
+        active = self.active
+        i = 0
+        while i < len(active):
+            label = active[i]
+            label.y += label.vy
+            label.life -= 1
+            if label.life <= 0:
+                active[i] = active[-1]   # The last label moves into this slot and is updated next
+                active.pop()
+                label.surface = None
+                self.free.append(label)
+            else:
+                i += 1
+
+    def clear(self):
+        for label in self.active:
+            label.surface = None
+        self.free.extend(self.active)
+        self.active.clear()
+
+    def draw(self, screen, camera_x, camera_y):
+        blits = []
+        for label in self.active:
+            label.surface.set_alpha(int(255 * label.life / label.max_life))
+            blits.append((label.surface, (label.x - camera_x, label.y - camera_y)))
+        screen.blits(blits, doreturn=False)
+
+
+class Banner:
+    """A line of text faded in place, rendered again only when it changes."""
+    def __init__(self, font):
+        self.font = font
+        self.key = None
+        self.surface = None
+
+    def render(self, text, color, alpha):
+        """The banner's surface for text in color at alpha; it belongs to this banner."""
+        key = (text, tuple(color))
+        if key != self.key:
+            self.surface = self.font.render(text, True, color)
+            self.key = key
+        self.surface.set_alpha(alpha)
+        return self.surface
@@ -0,0 +1,66 @@
+"""The corner mini-map for c4.py, split into a static layer and a marker overlay.
+
+draw_mini_map used to rebuild the map from nothing every frame: it worked out
+the level's bounds with min/max over every platform, enemy, coin and spike,
+then scaled and drew every platform again. Once a level is loaded its shape
+doesn't change, so a MiniMap fixes the bounds and scale when it's built and
+paints the frame, platforms, spikes and exit once. The things that move
+(player, enemies, boss, moving platforms, coins still to collect) go on top
+of a copy of that, and only every few frames; in between, the last composed
+map is blitted as it is.
+"""
+import pygame
+
+PADDING = 50      # World pixels of margin around the level
+MAX_SCALE = 0.1   # Small levels aren't blown up past this
+
+
+class MiniMap:
+    def __init__(self, size, bounds, background, border, refresh_every=4):
+        """bounds is a list of (x, y, width, height) that the map must cover."""
+        self.width, self.height = size
+        if bounds:
+            min_x = min(b[0] for b in bounds)
+            min_y = min(b[1] for b in bounds)
+            max_x = max(b[0] + b[2] for b in bounds)
+            max_y = max(b[1] + b[3] for b in bounds)
+        else:
+            min_x, min_y, max_x, max_y = 0, 0, self.width, self.height
+        self.min_x = min_x - PADDING
+        self.min_y = min_y - PADDING
+        level_width = max_x + PADDING - self.min_x
+        level_height = max_y + PADDING - self.min_y
+        scale_x = self.width / level_width if level_width > 0 else MAX_SCALE
+        scale_y = self.height / level_height if level_height > 0 else MAX_SCALE
+        self.scale = min(scale_x, scale_y, MAX_SCALE)
+
+        self.static = pygame.Surface(size)
+        self.static.fill(background)
+        pygame.draw.rect(self.static, border, (0, 0, self.width, self.height), 2)
+        self.surface = pygame.Surface(size)
+        self.refresh_every = refresh_every
+        self.frames = 0
+
+    def project(self, x, y, width, height):
+        """A world rect scaled down into map coordinates."""
+        s = self.scale
+        return ((x - self.min_x) * s, (y - self.min_y) * s, width * s, height * s)
+
+    def paint(self, color, x, y, width, height):
+        """Paint onto the static layer; call before the first draw()."""
+        pygame.draw.rect(self.static, color, self.project(x, y, width, height))
+
+    def invalidate(self):
+        """Redraw the markers on the next draw() (the level was reloaded)."""
+        self.frames = 0
+
+    def draw(self, screen, pos, markers):
+        """Blit the map at pos; markers yields (colour, x, y, width, height) and is
+        only read on the frames the overlay is redrawn."""
+        if self.frames % self.refresh_every == 0:
+            surface = self.surface
+            surface.blit(self.static, (0, 0))
+            for color, x, y, width, height in markers:
+                pygame.draw.rect(surface, color, self.project(x, y, width, height))
+        self.frames += 1
+        screen.blit(self.surface, pos)
@@ -0,0 +1,202 @@
+"""Array-backed particle system shared by c2.py, c2x.py and c4.py.
+
+Every particle is a slot in a handful of preallocated NumPy arrays rather
+than its own object, so a frame's worth of particles moves in one vectorised
+step and dead ones are compacted away instead of list.remove()'d one by one.
+Drawing blits small alpha sprites that are baked once per colour/size/alpha
+bucket, so nothing allocates a Surface per particle per frame.
+
+capacity is a hard budget. By default emissions past it are dropped; with
+evict_oldest the oldest live particles make room instead, so a long fight
+keeps its freshest effects. Bursts can also name an emitter, and caps
+limits how many live particles each emitter may own, so one noisy source
+can't crowd out the rest.
+"""
+import numpy as np
+import pygame
+
+
+class ParticleSystem:
+    def __init__(self, capacity=20000, gravity=0.0, radius=3, min_radius=1,
+                 shrink=True, centered=True, alpha_buckets=16, evict_oldest=False, caps=None):
+        self.capacity = capacity
+        self.evict_oldest = evict_oldest
+        self.caps = dict(caps or {})  # Emitter name -> most live particles it may own
+        self.gravity = gravity
+        self.radius = radius          # Radius of a fresh particle
+        self.min_radius = min_radius  # Particles that shrink below this are skipped
+        self.shrink = shrink          # Shrink with remaining life (c2/c2x) or stay fixed (c4)
+        self.centered = centered      # Blit centred on (x, y) or with (x, y) as top-left
+        self.alpha_buckets = alpha_buckets
+        self.rng = np.random.default_rng()
+
+        self.count = 0
+        self.x = np.zeros(capacity, np.float32)
+        self.y = np.zeros(capacity, np.float32)
+        self.vel_x = np.zeros(capacity, np.float32)
+        self.vel_y = np.zeros(capacity, np.float32)
+        self.life = np.zeros(capacity, np.float32)
+        self.max_life = np.ones(capacity, np.float32)
+        self.color = np.zeros(capacity, np.int32)  # Index into self.palette
+        self.source = np.full(capacity, -1, np.int16)  # Index into self.emitters, -1 for none
+        self._arrays = (self.x, self.y, self.vel_x, self.vel_y,
+                        self.life, self.max_life, self.color, self.source)
+        self.emitters = []
+        self.evicted = 0   # Old particles pushed out by the budget
+        self.dropped = 0   # New particles refused by the budget or an emitter cap
+
+        self.palette = []
+        self._palette_index = {}
+        self.sprites = {}
+
+    def __len__(self):
+        return self.count
+
+    def clear(self):
+        self.count = 0
+
+    def seed(self, seed):
+        """Restart the random stream used by burst(), for reproducible runs."""
+        self.rng = np.random.default_rng(seed)
+
+    def _color_id(self, color):
+        color = tuple(color[:3])
+        cid = self._palette_index.get(color)
+        if cid is None:
+            cid = len(self.palette)
+            self.palette.append(color)
+            self._palette_index[color] = cid
+        return cid
+
+    def _reserve(self, n, emitter=None):
+        """Claim up to n slots for emitter, applying its cap and the global budget.
+
+        Particles are kept in emission order, so the oldest are at the front
+        and evicting them is a single shift of every array.
+        """
+        wanted = n
+        sid = -1
+        if emitter is not None:
+            if emitter not in self.emitters:
+                self.emitters.append(emitter)
+            sid = self.emitters.index(emitter)
+            cap = self.caps.get(emitter)
+            if cap is not None:
+                live = int(np.count_nonzero(self.source[:self.count] == sid))
+                n = max(0, min(n, cap - live))
+        n = min(n, self.capacity)
+        start = self.count
+        if self.evict_oldest and start + n > self.capacity:
+            k = start + n - self.capacity
+            for arr in self._arrays:
+                arr[:start - k] = arr[k:start]
+            start -= k
+            self.evicted += k
+        end = min(self.capacity, start + n)
+        self.count = end
+        self.source[start:end] = sid
+        self.dropped += wanted - (end - start)
+        return start, end
+
+    def emit(self, x, y, vel_x, vel_y, color, life, emitter=None):
+        """Add one particle - same arguments as the old Particle class."""
+        i, end = self._reserve(1, emitter)
+        if i == end:
+            return
+        self.x[i] = x
+        self.y[i] = y
+        self.vel_x[i] = vel_x
+        self.vel_y[i] = vel_y
+        self.life[i] = life
+        self.max_life[i] = life
+        self.color[i] = self._color_id(color)
+
+    def burst(self, x, y, count, color, life, vel_x=(-3, 3), vel_y=None, emitter=None):
+        """Emit count particles at (x, y) with velocities drawn uniformly from the given ranges.
+
+        vel_y defaults to the same range as vel_x, which covers the usual
+        random.uniform(-n, n), random.uniform(-n, n) spark bursts. color may
+        also be a list, in which case each particle picks one at random.
+        emitter names the source for the per-emitter caps.
+        """
+        if vel_y is None:
+            vel_y = vel_x
+        a, b = self._reserve(count, emitter)
+        n = b - a
+        if n <= 0:
+            return
+        self.x[a:b] = x
+        self.y[a:b] = y
+        self.vel_x[a:b] = self.rng.uniform(min(vel_x), max(vel_x), n)
+        self.vel_y[a:b] = self.rng.uniform(min(vel_y), max(vel_y), n)
+        self.life[a:b] = life
+        self.max_life[a:b] = life
+        if isinstance(color, list):
+            ids = np.array([self._color_id(c) for c in color], np.int32)
+            self.color[a:b] = ids[self.rng.integers(len(ids), size=n)]
+        else:
+            self.color[a:b] = self._color_id(color)
+
+    def update(self, kill_below=None):
+        n = self.count
+        if not n:
+            return
+        self.x[:n] += self.vel_x[:n]
+        self.y[:n] += self.vel_y[:n]
+        if self.gravity:
+            self.vel_y[:n] += self.gravity
+        self.life[:n] -= 1
+
+        alive = self.life[:n] > 0
+        if kill_below is not None:
+            alive &= self.y[:n] <= kill_below
+        keep = int(np.count_nonzero(alive))
+        if keep != n:
+            for arr in self._arrays:
+                arr[:keep] = arr[:n][alive]
+            self.count = keep
+
+    def _bake(self, key):
+        buckets = self.alpha_buckets
+        bucket = key % buckets
+        radius = (key // buckets) % (self.radius + 1)
+        cid = key // (buckets * (self.radius + 1))
+        alpha = int(255 * (bucket + 1) / buckets)
+        surf = pygame.Surface((radius * 2, radius * 2), pygame.SRCALPHA)
+        pygame.draw.circle(surf, (*self.palette[cid], alpha), (radius, radius), radius)
+        self.sprites[key] = surf
+        return surf
+
+    def draw(self, screen, camera_x=0, camera_y=0):
+        n = self.count
+        if not n:
+            return
+        frac = self.life[:n] / self.max_life[:n]
+        if self.shrink:
+            radius = (frac * self.radius).astype(np.int32)
+            if self.min_radius:
+                np.maximum(radius, self.min_radius, out=radius)
+        else:
+            radius = np.full(n, self.radius, np.int32)
+        bucket = np.minimum((frac * self.alpha_buckets).astype(np.int32), self.alpha_buckets - 1)
+
+        px = (self.x[:n] - camera_x).astype(np.int32)
+        py = (self.y[:n] - camera_y).astype(np.int32)
+        if self.centered:
+            px -= radius
+            py -= radius
+        w, h = screen.get_size()
+        size = radius * 2
+        visible = ((radius > 0) & (px < w) & (py < h) & (px + size > 0) & (py + size > 0))
+        idx = np.flatnonzero(visible)
+        if not idx.size:
+            return
+
+        keys = (self.color[idx] * (self.radius + 1) + radius[idx]) * self.alpha_buckets + bucket[idx]
+        unique, inverse = np.unique(keys, return_inverse=True)
+        lookup = np.empty(len(unique), object)
+        for i, key in enumerate(unique.tolist()):
+            surf = self.sprites.get(key)
+            lookup[i] = surf if surf is not None else self._bake(key)
+        positions = np.stack((px[idx], py[idx]), axis=1).tolist()
+        screen.blits(zip(lookup[inverse].tolist(), positions), doreturn=False)
@@ -0,0 +1,242 @@
+"""Frame profiler for c4.py: section timers, an on-screen overlay and export.
+
+Time a block with ``with profiler.section('name'):``, a function with the
+``@profiler.timed()`` decorator, a span that doesn't nest neatly with
+start()/stop(), or every ``draw_*`` method of an object at once with
+instrument(). While the profiler is off, section() hands back a shared no-op
+context and instrumented methods are unwrapped again, so the hooks cost next
+to nothing in normal play.
+
+Each section's total per frame is kept for the last `window` frames. The
+overlay shows rolling average, p95 and p99 per section plus a graph of frame
+times. start_export() streams every frame to a .csv (frame, section, ms) or
+.jsonl (one object per frame) file for offline analysis.
+"""
+import contextlib
+import csv
+import functools
+import json
+import time
+from collections import deque
+
+import pygame
+
+_OFF = contextlib.nullcontext()
+
+
+class _Section:
+    __slots__ = ('profiler', 'name', 't0')
+
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+
+    def __exit__(self, *exc):
+        self.profiler.add(self.name, time.perf_counter() - self.t0)
+
+
+class Profiler:
+    def __init__(self, window=240, budget_ms=1000 / 60):
+        self.enabled = False
+        self.window = window
+        self.budget_ms = budget_ms      # Frame time the graph marks as the limit
+        self.frame = {}                 # Section -> ms so far this frame
+        self.history = {}               # Section -> deque of ms, one per frame it ran
+        self.frame_times = deque(maxlen=window)
+        self.frames = 0
+        self.open = {}                  # Section -> start time, for start()/stop()
+        self.frame_start = None
+        self.instrumented = []          # (obj, names) wrapped by instrument()
+        self.export_file = None
+        self.export_csv = None
+
+    # ── timers ────────────────────────────────────────────────────────
+    def add(self, name, seconds):
+        self.frame[name] = self.frame.get(name, 0.0) + seconds * 1000
+
+    def section(self, name):
+        """Context manager timing its block; a shared no-op while disabled."""
+        if not self.enabled:
+            return _OFF
+        return _Section(self, name)
+
+    def start(self, name):
+        if self.enabled:
+            self.open[name] = time.perf_counter()
+
+    def stop(self, name):
+        t0 = self.open.pop(name, None)
+        if t0 is not None:
+            self.add(name, time.perf_counter() - t0)
+
+    def timed(self, name=None):
+        """Decorator timing every call of a function (checks enabled per call)."""
+        def decorate(func):
+            label = name or func.__name__
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                t0 = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.add(label, time.perf_counter() - t0)
+            return wrapper
+        return decorate
+
+    def instrument(self, obj, prefix='draw_', names=(), label=None):
+        """Time obj's methods starting with prefix (plus names) until disable().
+
+        The timing wrappers are set as instance attributes and deleted again when
+        the profiler is turned off, leaving the plain methods behind.
+        """
+        wanted = [n for n in dir(type(obj)) if prefix and n.startswith(prefix)]
+        wanted += [n for n in names if n not in wanted]
+        wrapped = []
+        for n in wanted:
+            method = getattr(obj, n, None)
+            if not callable(method) or n in vars(obj):
+                continue
+            setattr(obj, n, self._wrap(method, f"{label}.{n}" if label else n))
+            wrapped.append(n)
+        self.instrumented.append((obj, wrapped))
+
+    def _wrap(self, method, name):
+        add = self.add
+        perf_counter = time.perf_counter
+        @functools.wraps(method)
+        def wrapper(*args, **kwargs):
+            t0 = perf_counter()
+            try:
+                return method(*args, **kwargs)
+            finally:
+                add(name, perf_counter() - t0)
+        return wrapper
+
+    def enable(self, targets=()):
+        """Turn timing on; targets are (obj, prefix, names, label) tuples to instrument."""
+        if self.enabled:
+            return
+        self.enabled = True
+        for obj, prefix, names, label in targets:
+            self.instrument(obj, prefix, names, label)
+
+    def disable(self):
+        self.enabled = False
+        for obj, names in self.instrumented:
+            for n in names:
+                vars(obj).pop(n, None)
+        self.instrumented = []
+        self.open.clear()
+        self.frame.clear()
+        self.frame_start = None
+
+    # ── frames ────────────────────────────────────────────────────────
+    def begin_frame(self):
+        if self.enabled:
+            self.frame_start = time.perf_counter()
+
+    def end_frame(self):
+        """Close the frame: fold its sections into the history and export them."""
+        if not self.enabled or self.frame_start is None:
+            self.frame.clear()   # Profiling was switched on mid-frame; start clean next frame
+            return
+        frame_ms = (time.perf_counter() - self.frame_start) * 1000
+        self.frame_times.append(frame_ms)
+        for name, ms in self.frame.items():
+            hist = self.history.get(name)
+            if hist is None:
+                hist = self.history[name] = deque(maxlen=self.window)
+            hist.append(ms)
+        if self.export_file:
+            self._export(frame_ms)
+        self.frames += 1
+        self.frame = {}
+
+    def stats(self):
+        """{section: (avg, p95, p99)} in ms over the window, plus 'frame' for the whole frame."""
+        out = {}
+        for name, hist in [('frame', self.frame_times)] + list(self.history.items()):
+            if not hist:
+                continue
+            ordered = sorted(hist)
+            last = len(ordered) - 1
+            out[name] = (sum(ordered) / len(ordered),
+                         ordered[round(last * 0.95)], ordered[round(last * 0.99)])
+        return out
+
+    # ── export ────────────────────────────────────────────────────────
+    def start_export(self, path):
+        """Write every following frame to path (.csv, otherwise JSON lines)."""
+        self.stop_export()
+        self.export_file = open(path, 'w', newline='')
+        if path.endswith('.csv'):
+            self.export_csv = csv.writer(self.export_file)
+            self.export_csv.writerow(['frame', 'section', 'ms'])
+
+    def _export(self, frame_ms):
+        if self.export_csv:
+            self.export_csv.writerow([self.frames, 'frame', f"{frame_ms:.4f}"])
+            for name, ms in self.frame.items():
+                self.export_csv.writerow([self.frames, name, f"{ms:.4f}"])
+        else:
+            self.export_file.write(json.dumps({
+                'frame': self.frames, 'frame_ms': round(frame_ms, 4),
+                'sections': {k: round(v, 4) for k, v in self.frame.items()}}) + '\n')
+
+    def stop_export(self):
+        if self.export_file:
+            self.export_file.close()
+        self.export_file = None
+        self.export_csv = None
+
+    # ── overlay ───────────────────────────────────────────────────────
+    def draw(self, screen, font, rows=14, notes=()):
+        """Stats table for the slowest sections and a frame-time graph, top-left.
+
+        notes are extra lines of text (counters and the like) shown under the table.
+        """
+        stats = self.stats()
+        if not stats:
+            return
+        frame = stats.pop('frame')
+        ranked = sorted(stats.items(), key=lambda kv: kv[1][0], reverse=True)[:rows]
+        line_h = font.get_linesize()
+        graph_h = 60
+        width = 380
+        height = line_h * (len(ranked) + len(notes) + 2) + graph_h + 16
+        panel = pygame.Surface((width, height), pygame.SRCALPHA)
+        panel.fill((0, 0, 0, 190))
+        columns = (width - 130, width - 70, width - 10)   # Right edges of avg / p95 / p99
+
+        def row(y, name, values, color):
+            panel.blit(font.render(name[:28], True, color), (6, y))
+            for right, value in zip(columns, values):
+                text = font.render(value, True, color)
+                panel.blit(text, (right - text.get_width(), y))
+
+        y = 4
+        row(y, 'section', ('avg', 'p95', 'p99'), (200, 200, 200))
+        y += line_h
+        for name, values in [('frame', frame)] + ranked:
+            color = (255, 220, 100) if name == 'frame' else (230, 230, 230)
+            row(y, name, [f"{v:.2f}" for v in values], color)
+            y += line_h
+        for note in notes:
+            panel.blit(font.render(note, True, (160, 200, 255)), (6, y))
+            y += line_h
+        # Frame-time graph: one bar per frame, scaled so the budget sits halfway up
+        y += 6
+        scale = graph_h / (self.budget_ms * 2)
+        times = list(self.frame_times)[-(width - 12):]
+        for i, ms in enumerate(times):
+            h = min(graph_h, max(1, int(ms * scale)))
+            color = (100, 200, 100) if ms <= self.budget_ms else (220, 80, 80)
+            panel.fill(color, (6 + i, y + graph_h - h, 1, h))
+        budget_y = y + graph_h - int(self.budget_ms * scale)
+        panel.fill((255, 255, 255, 120), (6, budget_y, width - 12, 1))
+        screen.blit(panel, (8, 8))
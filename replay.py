@@ -0,0 +1,143 @@
+"""Record c4 gameplay input tick by tick and play it back headless.
+
+    python c4.py --record run.c4r     # play normally; the last run is saved
+    python replay.py run.c4r          # re-simulate it at full speed and verify
+
+A run is fully described by where it started (level, RNG seed, health and
+the game's current level, which the tutorial carries along) and the keys
+held/pressed on every tick, because Game.step() draws all its randomness
+from the game's seeded RNG. The log stores that header, then the
+input as run-length encoded (ticks, held, pressed) triples - held keys
+rarely change and presses are single ticks, so a minute of play is usually
+a few hundred bytes. A fingerprint of the final state is appended so a
+replay can prove it reproduced the run exactly.
+"""
+import argparse
+import struct
+import time
+import zlib
+
+MAGIC = b'C4RP'
+# 1: before engine.py; respawns collided from a stale rect, so those runs no longer reproduce
+# 2: adds the current level to the header
+VERSION = 2
+HEADER = struct.Struct('<4sBIhBBh')  # magic, version, seed, level, health, max health, current level
+RUN = struct.Struct('<HHH')          # ticks, held mask, pressed mask
+FOOTER = struct.Struct('<II')        # tick count, state fingerprint
+
+
+def fingerprint(game):
+    """CRC of the simulation state a replay has to reproduce."""
+    p = game.player
+    values = [game.current_level, p.x, p.y, p.vel_x, p.vel_y,
+              game.level_timer, game.coins_collected, game.player_health,
+              len(game.enemies), game.boss.health if game.boss else -1]
+    return zlib.crc32(struct.pack(f'<{len(values)}d', *values))
+
+
+class InputRecorder:
+    def __init__(self, keys, seed, level, health, max_health, current_level):
+        self.keys = list(keys)    # Bit i of a mask is keys[i]
+        self.seed = seed
+        self.level = level
+        self.health = health
+        self.max_health = max_health
+        self.current_level = current_level
+        self.runs = []
+        self.ticks = 0
+
+    def _mask(self, keys):
+        return sum(1 << i for i, k in enumerate(self.keys) if k in keys)
+
+    def record(self, tick_input):
+        held, pressed = self._mask(tick_input.held), self._mask(tick_input.pressed)
+        runs = self.runs
+        if runs and runs[-1][1] == held and runs[-1][2] == pressed and runs[-1][0] < 0xFFFF:
+            runs[-1][0] += 1
+        else:
+            runs.append([1, held, pressed])
+        self.ticks += 1
+
+    def save(self, path, game):
+        with open(path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, self.seed, self.level,
+                                self.health, self.max_health, self.current_level))
+            f.write(struct.pack('<I', len(self.runs)))
+            for run in self.runs:
+                f.write(RUN.pack(*run))
+            f.write(FOOTER.pack(self.ticks, fingerprint(game)))
+
+
+class Replay:
+    def __init__(self, seed, level, health, max_health, current_level, runs, ticks, expected):
+        self.seed = seed
+        self.level = level
+        self.health = health
+        self.max_health = max_health
+        self.current_level = current_level
+        self.runs = runs
+        self.ticks = ticks
+        self.expected = expected
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'rb') as f:
+            data = f.read()
+        magic, version, seed, level, health, max_health, current_level = HEADER.unpack_from(data)
+        if magic != MAGIC or version != VERSION:
+            raise ValueError(f"{path} is not a version {VERSION} replay")
+        offset = HEADER.size
+        (count,) = struct.unpack_from('<I', data, offset)
+        offset += 4
+        runs = [RUN.unpack_from(data, offset + i * RUN.size) for i in range(count)]
+        ticks, expected = FOOTER.unpack_from(data, offset + count * RUN.size)
+        return cls(seed, level, health, max_health, current_level, runs, ticks, expected)
+
+    def begin(self, game):
+        """Start the recorded run on game, from the state the recording began in."""
+        game.player_max_health = self.max_health
+        game.begin_run(self.level, self.seed, self.health)
+        game.current_level = self.current_level
+
+    def inputs(self, keys):
+        """Yield one TickInput per recorded tick."""
+        from c4 import TickInput
+        for count, held, pressed in self.runs:
+            tick_input = TickInput([k for i, k in enumerate(keys) if held >> i & 1],
+                                   [k for i, k in enumerate(keys) if pressed >> i & 1])
+            for _ in range(count):
+                yield tick_input
+
+
+def play(path):
+    """Re-simulate a recorded run headless; returns (matched, ticks per second)."""
+    from headless import advance
+    from c4 import Game, GAME_KEYS
+
+    replay = Replay.load(path)
+    game = Game(headless=True)
+    replay.begin(game)
+
+    start = time.perf_counter()
+    ticks = 0
+    for tick_input in replay.inputs(GAME_KEYS):
+        ticks += 1
+        if not advance(game, tick_input):
+            break
+    elapsed = time.perf_counter() - start
+
+    # The recording can't outlast the run it was made from
+    matched = ticks == replay.ticks and fingerprint(game) == replay.expected
+    rate = ticks / elapsed if elapsed else float('inf')
+    print(f"{ticks} ticks ({ticks / 60:.1f}s of play) in {elapsed:.2f}s "
+          f"-> {rate:.0f} ticks/s, {'MATCH' if matched else 'MISMATCH'}")
+    if ticks < replay.ticks:
+        print(f"The run ended ({game.state}) with {replay.ticks - ticks} recorded ticks left")
+    return matched, rate
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description="Play back a c4 input recording headless")
+    parser.add_argument('path')
+    args = parser.parse_args()
+    raise SystemExit(0 if play(args.path)[0] else 1)
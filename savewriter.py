@@ -0,0 +1,77 @@
+"""Background save-file writer for c4.py.
+
+Saving used to rewrite savefile.json on the render thread, once per call,
+and a crash halfway through left a truncated file. SaveWriter takes a
+snapshot (already serialised, so later changes to the game can't leak in)
+and hands it to a worker thread. If more saves arrive while a write is in
+progress, only the newest one is written next. Each write goes to a temp
+file that is fsynced and then renamed over the real one, so the save on
+disk is always either the old version or the new one, never half of each.
+"""
+import atexit
+import os
+import threading
+
+
+class SaveWriter:
+    def __init__(self, path):
+        self.path = path
+        self.pending = None      # Newest snapshot not yet written
+        self.busy = False        # Worker is writing right now
+        self.requests = 0
+        self.writes = 0
+        self.cond = threading.Condition()
+        self.thread = None
+        self.closed = False
+        atexit.register(self.close)
+
+    def request(self, text):
+        """Queue text to be written; replaces any snapshot still waiting."""
+        with self.cond:
+            if self.closed:
+                return False
+            self.pending = text
+            self.requests += 1
+            if self.thread is None:
+                self.thread = threading.Thread(target=self._run, name='save-writer', daemon=True)
+                self.thread.start()
+            self.cond.notify()
+        return True
+
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.pending is None and not self.closed:
+                    self.cond.wait()
+                if self.pending is None:
+                    return
+                text, self.pending = self.pending, None
+                self.busy = True
+            try:
+                self._write(text)
+            except Exception as e:
+                print(f"❌ Save failed: {e}")
+            with self.cond:
+                self.busy = False
+                self.writes += 1
+                self.cond.notify_all()
+
+    def _write(self, text):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            f.write(text)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)
+
+    def flush(self, timeout=5.0):
+        """Block until everything requested so far is on disk."""
+        with self.cond:
+            return self.cond.wait_for(lambda: self.pending is None and not self.busy, timeout)
+
+    def close(self):
+        """Flush and stop the worker; registered to run at interpreter exit."""
+        self.flush()
+        with self.cond:
+            self.closed = True
+            self.cond.notify_all()
@@ -0,0 +1,63 @@
+"""Initial-state snapshots of c4 level entities, for instant retries.
+
+A level's coins, enemies, bosses and moving platforms are built once and then
+changed in place while it is played: the magnet drags coins about, bosses
+lose health, platforms drift along their track. Loading the level again used
+to hand back those same half-played objects. LevelSnapshot records every
+entity's attributes the first time the level is loaded, as plain immutable
+tuples, and restore() copies them back into the same objects - so a retry
+rebuilds nothing and costs one attribute copy per entity.
+"""
+import pygame
+
+# How a value was frozen, so restore() can copy it back in place
+VALUE, RECT, LIST, DICT = range(4)
+
+
+def _freeze(value):
+    if isinstance(value, pygame.Rect):
+        return RECT, tuple(value)
+    if isinstance(value, list):
+        return LIST, tuple(value)
+    if isinstance(value, dict):
+        return DICT, tuple(value.items())
+    return VALUE, value
+
+
+class LevelSnapshot:
+    def __init__(self, objects):
+        self.states = tuple(
+            (obj, tuple((name,) + _freeze(value) for name, value in vars(obj).items()))
+            for obj in objects)
+
+    def __len__(self):
+        return len(self.states)
+
+    def restore(self):
+        """Write the recorded state back into every object, reusing its Rects and lists."""
+        for obj, state in self.states:
+            attrs = vars(obj)
+            if len(attrs) != len(state):
+                # Picked up extra attributes during play; start from a clean slate
+                attrs.clear()
+            for name, kind, value in state:
+                if kind is VALUE:
+                    attrs[name] = value
+                    continue
+                current = attrs.get(name)
+                if kind is RECT:
+                    if isinstance(current, pygame.Rect):
+                        current.update(value)
+                    else:
+                        attrs[name] = pygame.Rect(value)
+                elif kind is LIST:
+                    if isinstance(current, list):
+                        current[:] = value
+                    else:
+                        attrs[name] = list(value)
+                else:
+                    if isinstance(current, dict):
+                        current.clear()
+                        current.update(value)
+                    else:
+                        attrs[name] = dict(value)
@@ -0,0 +1,67 @@
+"""Pre-rendered character frames for c4.py.
+
+c4's characters used to be rebuilt from pygame.draw primitives every frame:
+the player alone is about ten rects and circles, with the leg colour
+recomputed and a fresh SRCALPHA Surface allocated per speed-trail ghost.
+A SpriteSheet runs a character's drawing code once per distinct frame (walk
+pose, squish, wing position, hit flash, ...) onto one shared Surface. Drawing
+a character is then a single blit of that frame's area.
+
+Every frame of a sheet is the same size: bounds is the box, relative to the
+character's anchor (its x, y on screen), that the drawing code can touch.
+Frames are painted the first time they're asked for, so a sheet can be
+pre-warmed with the poses it's known to need and still cope with one it
+wasn't told about.
+"""
+import pygame
+
+
+class SpriteSheet:
+    def __init__(self, paint, bounds, keys=(), columns=16):
+        """paint(surface, x, y, *key) draws the frame for key anchored at (x, y);
+        bounds is (left, top, right, bottom) around the anchor."""
+        self.paint = paint
+        self.left, self.top, right, bottom = bounds
+        self.frame_w = right - self.left
+        self.frame_h = bottom - self.top
+        self.columns = columns
+        self.frames = {}        # key -> area of the sheet holding that frame
+        self.surface = None
+        for key in keys:
+            self.frame(key)
+
+    def __len__(self):
+        return len(self.frames)
+
+    def frame(self, key):
+        area = self.frames.get(key)
+        if area is None:
+            area = self.frames[key] = self._add(key)
+        return area
+
+    def _add(self, key):
+        n = len(self.frames)
+        area = pygame.Rect((n % self.columns) * self.frame_w, (n // self.columns) * self.frame_h,
+                           self.frame_w, self.frame_h)
+        if self.surface is None or area.bottom > self.surface.get_height():
+            self._grow(area.bottom)
+        # Painting through a subsurface clips each frame to its own cell
+        self.paint(self.surface.subsurface(area), -self.left, -self.top, *key)
+        return area
+
+    def _grow(self, min_height):
+        """Make room for another row of frames, keeping the ones already painted."""
+        rows = max(1, min_height // self.frame_h)
+        if self.surface is not None:
+            rows = max(rows, self.surface.get_height() // self.frame_h * 2)
+        surface = pygame.Surface((self.columns * self.frame_w, rows * self.frame_h), pygame.SRCALPHA)
+        if pygame.display.get_surface() is not None:
+            surface = surface.convert_alpha()
+        surface.fill((0, 0, 0, 0))
+        if self.surface is not None:
+            surface.blit(self.surface, (0, 0))
+        self.surface = surface
+
+    def blit(self, screen, key, x, y):
+        """Draw key's frame with its anchor at (x, y), truncated like pygame.draw truncates."""
+        screen.blit(self.surface, (int(x) + self.left, int(y) + self.top), self.frame(key))
@@ -0,0 +1,118 @@
+"""Procedural sound effects for c4.py, synthesised with NumPy.
+
+c4 used to build its blips sample by sample in Python at every launch (and
+then threw most of that work away). Here a tone is a few whole-array NumPy
+operations - oscillator, ADSR envelope, volume - written straight into the
+buffer pygame.sndarray.make_sound wants, shaped for whatever format the mixer
+actually opened with. Finished tones are also kept on disk, named by a hash
+of their parameters, so later launches just load them. Synthesis is cheap
+enough to run mid-game, which is how pitch-varied effects are made.
+"""
+import hashlib
+import os
+
+import numpy as np
+import pygame
+
+WAVES = ('sine', 'square', 'saw', 'noise')
+CACHE_VERSION = 1   # Bump when synthesis changes so stale files aren't reused
+
+
+def envelope(frames, rate, adsr=None):
+    """Amplitude per sample. adsr is (attack s, decay s, sustain level, release s);
+    None is a plain linear fade over the whole tone."""
+    if adsr is None:
+        return np.linspace(1.0, 0.0, frames, endpoint=False, dtype=np.float32)
+    attack, decay, sustain, release = adsr
+    a = min(frames, int(attack * rate))
+    d = min(frames - a, int(decay * rate))
+    r = min(frames - a - d, int(release * rate))
+    s = frames - a - d - r
+    return np.concatenate((
+        np.linspace(0.0, 1.0, a, endpoint=False, dtype=np.float32),
+        np.linspace(1.0, sustain, d, endpoint=False, dtype=np.float32),
+        np.full(s, sustain, dtype=np.float32),
+        np.linspace(sustain, 0.0, r, endpoint=False, dtype=np.float32),
+    ))
+
+
+def tone(freq, dur, vol=0.4, wave='sine', adsr=None, rate=44100, seed=0):
+    """Mono int16 samples for one tone."""
+    if wave not in WAVES:
+        raise ValueError(f"unknown wave {wave!r}")
+    frames = int(rate * dur)
+    if wave == 'noise':
+        signal = np.random.default_rng(seed).uniform(-1.0, 1.0, frames).astype(np.float32)
+    else:
+        phase = np.arange(frames, dtype=np.float32) * np.float32(freq / rate)
+        phase -= np.floor(phase)
+        if wave == 'sine':
+            signal = np.sin(phase * np.float32(2 * np.pi))
+        elif wave == 'square':
+            signal = np.where(phase < 0.5, 1.0, -1.0).astype(np.float32)
+        else:
+            signal = phase * 2 - 1
+    signal *= envelope(frames, rate, adsr) * vol
+    np.clip(signal, -1.0, 1.0, out=signal)
+    return (signal * 32767).astype(np.int16)
+
+
+class Synth:
+    def __init__(self, cache_dir=None):
+        init = pygame.mixer.get_init()
+        if init is None:
+            raise pygame.error("mixer not initialised")
+        self.rate, self.size, self.channels = init
+        self.cache_dir = cache_dir
+        self.sounds = {}        # Parameters -> Sound, for this session
+        self.synthesised = 0
+        self.loaded = 0
+
+    def sound(self, freq, dur, vol=0.4, wave='sine', adsr=None):
+        """A Sound for these parameters, from memory, the disk cache or freshly made."""
+        key = (round(freq, 2), dur, vol, wave, adsr)
+        snd = self.sounds.get(key)
+        if snd is None:
+            snd = self.sounds[key] = self._make_sound(self._samples(key))
+        return snd
+
+    def _samples(self, key):
+        path = None
+        if self.cache_dir:
+            name = hashlib.sha1(repr((CACHE_VERSION, self.rate) + key).encode()).hexdigest()
+            path = os.path.join(self.cache_dir, name + '.npy')
+            try:
+                samples = np.load(path)
+                self.loaded += 1
+                return samples
+            except (OSError, ValueError):
+                pass
+        freq, dur, vol, wave, adsr = key
+        samples = tone(freq, dur, vol, wave, adsr, self.rate)
+        self.synthesised += 1
+        if path:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                tmp = path + '.tmp.npy'
+                np.save(tmp, samples)
+                os.replace(tmp, path)
+            except OSError as e:
+                print(f"⚠️ SFX cache not written: {e}")
+        return samples
+
+    def _make_sound(self, samples):
+        """Convert mono int16 samples to the mixer's own sample format and channel count."""
+        if self.size == 8:
+            data = (samples >> 8).astype(np.int16) + 128
+            data = data.astype(np.uint8)
+        elif self.size == -8:
+            data = (samples >> 8).astype(np.int8)
+        elif self.size == 16:
+            data = (samples.astype(np.int32) + 32768).astype(np.uint16)
+        elif self.size == 32:
+            data = samples.astype(np.float32) / 32768
+        else:
+            data = samples
+        if self.channels > 1:
+            data = np.repeat(data[:, None], self.channels, axis=1)
+        return pygame.sndarray.make_sound(np.ascontiguousarray(data))
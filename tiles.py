@@ -0,0 +1,70 @@
+"""Pre-rendered static level geometry for c4.py.
+
+Platforms, spikes and the exit never change once a level is loaded, so
+instead of issuing their draw calls every frame they are painted once into
+512x512 colour-keyed tiles. A tile is only rendered the first time the camera
+reaches it, and a frame blits just the few tiles that overlap the screen, so
+drawing the static level costs the same however long it is.
+"""
+from collections import OrderedDict
+
+import pygame
+
+# Transparent background of a tile. Level art is flat and opaque, so a colour
+# key (RLE-accelerated) blits far faster than per-pixel alpha would.
+COLORKEY = (255, 0, 255)
+
+# Tiles are painted this much oversize and trimmed when blitted, so small
+# shapes that cross a seam rasterise exactly as they would unclipped.
+PAD = 32
+
+
+class StaticLayer:
+    def __init__(self, tile_size=512, max_tiles=32):
+        self.tile_size = tile_size
+        self.max_tiles = max_tiles    # Least recently seen tiles are dropped past this
+        self.items = []               # (bounds, draw) - draw(surface, camera_x, camera_y)
+        self.index = {}               # (tx, ty) -> indices into items
+        self.tiles = OrderedDict()    # (tx, ty) -> Surface, LRU order
+        self.rendered = 0             # Tiles painted so far, for stats
+
+    def add(self, bounds, draw):
+        """Register something to bake; bounds is a Rect covering everything draw() paints."""
+        i = len(self.items)
+        self.items.append((bounds, draw))
+        ts = self.tile_size
+        for tx in range(bounds.left // ts, (bounds.right - 1) // ts + 1):
+            for ty in range(bounds.top // ts, (bounds.bottom - 1) // ts + 1):
+                self.index.setdefault((tx, ty), []).append(i)
+                self.tiles.pop((tx, ty), None)
+
+    def _tile(self, key):
+        surf = self.tiles.get(key)
+        if surf is not None:
+            self.tiles.move_to_end(key)
+            return surf
+        ts = self.tile_size
+        surf = pygame.Surface((ts + PAD * 2, ts + PAD * 2))
+        surf.fill(COLORKEY)
+        ox, oy = key[0] * ts - PAD, key[1] * ts - PAD
+        for i in self.index[key]:
+            self.items[i][1](surf, ox, oy)
+        surf.set_colorkey(COLORKEY, pygame.RLEACCEL)
+        self.tiles[key] = surf
+        self.rendered += 1
+        while len(self.tiles) > self.max_tiles:
+            self.tiles.popitem(last=False)
+        return surf
+
+    def draw(self, screen, camera_x, camera_y):
+        ts = self.tile_size
+        w, h = screen.get_size()
+        cam_x, cam_y = int(camera_x), int(camera_y)
+        index = self.index
+        area = pygame.Rect(PAD, PAD, ts, ts)
+        blits = []
+        for tx in range(cam_x // ts, (cam_x + w - 1) // ts + 1):
+            for ty in range(cam_y // ts, (cam_y + h - 1) // ts + 1):
+                if (tx, ty) in index:
+                    blits.append((self._tile((tx, ty)), (tx * ts - cam_x, ty * ts - cam_y), area))
+        screen.blits(blits, doreturn=False)
@@ -0,0 +1,89 @@
+"""Fixed-rate simulation clock and render interpolation, shared by c2.py, c2x.py and c4.py.
+
+Game logic always advances in whole 1/60 s ticks no matter how long a frame
+took to draw: a slow frame runs several ticks to catch up (the frames in
+between are simply never drawn), a fast one may run none. Timers that count
+ticks - level times, dash cooldowns, invincibility - therefore measure real
+time on any machine. Because ticks and frames no longer line up, drawing
+blends each moving object between where it was one tick ago and where it is
+now, so motion stays smooth at any frame rate.
+"""
+import time
+from contextlib import contextmanager
+
+
+class FixedTimestep:
+    def __init__(self, hz=60, max_steps=15):
+        self.dt = 1.0 / hz
+        self.max_steps = max_steps  # Catch-up limit per frame (a quarter second at 60 Hz)
+        self.accumulator = 0.0
+        self.last = None
+        self.ticks = 0
+        self.dropped_frames = 0     # Ticks that were simulated but never drawn
+
+    def reset(self):
+        """Forget time spent elsewhere (menus, loading) so it isn't replayed as ticks."""
+        self.accumulator = 0.0
+        self.last = None
+
+    def advance(self):
+        """How many ticks to simulate before drawing this frame."""
+        now = time.perf_counter()
+        if self.last is None:
+            self.last = now - self.dt
+        self.accumulator += now - self.last
+        self.last = now
+
+        steps = int(self.accumulator / self.dt)
+        if steps > self.max_steps:
+            # A stall this long (window drag, debugger) can't be caught up without
+            # a burst of invisible ticks, so only that much time is skipped.
+            steps = self.max_steps
+            self.accumulator = 0.0
+        else:
+            self.accumulator -= steps * self.dt
+        self.ticks += steps
+        self.dropped_frames += max(0, steps - 1)
+        return steps
+
+    @property
+    def alpha(self):
+        """How far the next tick has progressed, 0..1, for interpolation."""
+        return min(1.0, self.accumulator / self.dt)
+
+
+class Interpolator:
+    """Remembers where objects were one tick ago so a draw can blend to now."""
+
+    def __init__(self, snap_distance=128):
+        self.snap_distance = snap_distance  # Bigger jumps are teleports - don't blend them
+        self.prev = {}
+
+    def clear(self):
+        self.prev.clear()
+
+    def capture(self, objects, attrs=('x', 'y')):
+        """Record attrs of each object as its previous-tick state; call just before a tick."""
+        for obj in objects:
+            if obj is not None:
+                self.prev[id(obj)] = (obj, attrs, [getattr(obj, a) for a in attrs])
+
+    @contextmanager
+    def blend(self, alpha):
+        """Move every captured object part-way back to its previous state while drawing."""
+        restore = []
+        if alpha < 1.0:
+            snap = self.snap_distance
+            for obj, attrs, old in self.prev.values():
+                now = [getattr(obj, a) for a in attrs]
+                if any(abs(n - o) > snap for n, o in zip(now, old)):
+                    continue
+                restore.append((obj, attrs, now))
+                for a, o, n in zip(attrs, old, now):
+                    setattr(obj, a, o + (n - o) * alpha)
+        try:
+            yield
+        finally:
+            for obj, attrs, now in restore:
+                for a, n in zip(attrs, now):
+                    setattr(obj, a, n)
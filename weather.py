@@ -0,0 +1,199 @@
+"""Array-backed rain and snow for c4.py.
+
+draw_weather used to keep every drop as a dict, remove dead ones with
+list.remove while iterating, draw each with its own pygame.draw call (and a
+fresh random.randint radius per snowflake per frame) and slice the list down
+to 300 when it grew past that. A Weather keeps a fixed population in
+preallocated NumPy arrays instead. Each frame moves them all in one
+vectorised step, and whatever leaves the screen is recycled in place at the
+other edge, so nothing is allocated or removed.
+
+What the arrays hold are clumps: a CLUMP-pixel square holding a few drops,
+baked once per depth layer, rain slant and variant into colour-keyed
+(RLE-accelerated) sprites like tiles.py's. The whole population is then a
+single blits() call. A blit costs about the same for one drop as for a
+handful, so a clump makes heavy weather cheap.
+
+Clumps sit in screen space on a few depth layers. Far layers fall slower,
+are dimmer and shift less when the camera moves, which gives the parallax.
+Wind eases toward a new random gust every few seconds, and rain streaks lean
+to match.
+"""
+import numpy as np
+import pygame
+
+CLUMP = 48        # Side of a clump sprite; also how far off-screen clumps wrap
+VARIANTS = 4      # Differently scattered clumps per layer (and slant)
+MAX_SLANT = 6     # Rain streaks lean up to this many pixels either way
+COLORKEY = (255, 0, 255)
+
+# Per kind: colour, fall speed, the wind it settles back to, gust strength,
+# drops per clump, streak length (rain) or flake radii (snow)
+KINDS = {
+    'rain': {'color': (120, 160, 220), 'fall': 14.0, 'wind': -1.0, 'gust': 3.0,
+             'per_clump': 8, 'length': 8},
+    'snow': {'color': (220, 230, 255), 'fall': 2.0, 'wind': 0.0, 'gust': 1.0,
+             'per_clump': 4, 'radii': (2, 3, 4)},
+}
+
+# Depth layers, far to near: speed/parallax factor and brightness
+LAYERS = ((0.45, 0.45), (0.7, 0.7), (1.0, 1.0))
+
+
+class Weather:
+    def __init__(self, width, height, capacity=1000):
+        """capacity is the most clumps on screen at once."""
+        self.width = width
+        self.height = height
+        self.capacity = capacity
+        self.rng = np.random.default_rng()
+        self.kind = None
+        self.count = 0   # Live clumps
+
+        self.x = np.zeros(capacity, np.float32)
+        self.y = np.zeros(capacity, np.float32)
+        self.layer = np.zeros(capacity, np.int32)
+        self.variant = np.zeros(capacity, np.int32)
+        self.depth = np.array([speed for speed, _ in LAYERS], np.float32)
+
+        self.wind = 0.0
+        self.gust_target = 0.0
+        self.gust_timer = 0
+        self.camera = None   # Camera position last frame, for parallax
+
+        # Clump scatter is fixed, so every run bakes the same sprites
+        bake_rng = np.random.default_rng(0)
+        self.sprites = {kind: self._bake(kind, bake_rng) for kind in KINDS}
+
+    def __len__(self):
+        """Drops on screen."""
+        return self.count * KINDS[self.kind]['per_clump'] if self.kind else 0
+
+    def seed(self, seed):
+        """Restart the random stream, for reproducible frames."""
+        self.rng = np.random.default_rng(seed)
+
+    def reset(self, seed=None):
+        """Clear the sky; the next set() scatters a fresh population."""
+        if seed is not None:
+            self.seed(seed)
+        self.kind = None
+        self.count = 0
+        self.camera = None
+
+    def set(self, kind, drops):
+        """Show about drops drops of kind ('rain', 'snow' or None for clear skies).
+
+        A change of kind scatters the new clumps over the whole screen, so a
+        level starts mid-shower rather than with an empty sky.
+        """
+        count = min(-(-drops // KINDS[kind]['per_clump']), self.capacity) if kind else 0
+        if kind == self.kind and count == self.count:
+            return
+        if kind != self.kind:
+            self.kind = kind
+            self.count = 0
+            self.camera = None
+            if kind:
+                self.wind = self.gust_target = KINDS[kind]['wind']
+                self.gust_timer = 0
+        if count > self.count:
+            self._spawn(slice(self.count, count), scatter=True)
+        self.count = count
+
+    def _spawn(self, slots, scatter=False):
+        """Put new clumps in slots (a slice or index array): anywhere on screen
+        if scatter, else just above the top edge."""
+        n = self.x[slots].size
+        if not n:
+            return
+        rng = self.rng
+        self.x[slots] = rng.uniform(-CLUMP, self.width, n)
+        self.y[slots] = rng.uniform(-CLUMP, self.height if scatter else 0, n)
+        self.layer[slots] = rng.integers(len(LAYERS), size=n)
+        self.variant[slots] = rng.integers(VARIANTS, size=n)
+
+    def _gust(self):
+        spec = KINDS[self.kind]
+        if self.gust_timer <= 0:
+            self.gust_target = spec['wind'] + float(self.rng.normal(0, spec['gust']))
+            self.gust_timer = int(self.rng.integers(120, 360))
+        self.gust_timer -= 1
+        self.wind += (self.gust_target - self.wind) * 0.02
+
+    def update(self, camera_x=0, camera_y=0):
+        """Advance every clump one frame; camera movement shifts each layer by its depth."""
+        n = self.count
+        if not n:
+            return
+        self._gust()
+        depth = self.depth[self.layer[:n]]
+        x = self.x[:n]
+        y = self.y[:n]
+        x += self.wind * depth
+        y += KINDS[self.kind]['fall'] * depth
+        if self.camera is not None:
+            x -= (camera_x - self.camera[0]) * depth
+            y -= (camera_y - self.camera[1]) * depth
+        self.camera = (camera_x, camera_y)
+
+        # Off the sides: wrap around. Off the bottom: start again above the top.
+        span = self.width + CLUMP
+        np.subtract(np.mod(x + CLUMP, span), CLUMP, out=x)
+        fallen = np.flatnonzero(y > self.height)
+        if fallen.size:
+            self._spawn(fallen)
+        y[y < -2 * CLUMP] += self.height + CLUMP   # The camera dropped faster than the drops
+
+    def _bake(self, kind, rng):
+        """Clump sprites for kind as an object array, indexed by the key draw() computes."""
+        spec = KINDS[kind]
+        slants = range(-MAX_SLANT, MAX_SLANT + 1) if kind == 'rain' else (0,)
+        sprites = []
+        for _, brightness in LAYERS:
+            color = tuple(int(c * brightness) for c in spec['color'])
+            # The same scatter at every slant, so a clump doesn't jump when the wind turns
+            scatter = [rng.integers(0, CLUMP, (spec['per_clump'], 2)) for _ in range(VARIANTS)]
+            for slant in slants:
+                for points in scatter:
+                    surf = pygame.Surface((CLUMP, CLUMP))
+                    surf.fill(COLORKEY)
+                    for i, (px, py) in enumerate(points.tolist()):
+                        if kind == 'rain':
+                            px = min(max(px, max(0, -slant)), CLUMP - 1 - max(0, slant))
+                            py = min(py, CLUMP - 1 - spec['length'])
+                            pygame.draw.line(surf, color, (px, py), (px + slant, py + spec['length']), 1)
+                        else:
+                            radius = spec['radii'][i % len(spec['radii'])]
+                            px = min(max(px, radius), CLUMP - radius)
+                            py = min(max(py, radius), CLUMP - radius)
+                            pygame.draw.circle(surf, color, (px, py), radius)
+                    if pygame.display.get_surface() is not None:
+                        surf = surf.convert()
+                    surf.set_colorkey(COLORKEY, pygame.RLEACCEL)
+                    sprites.append(surf)
+        out = np.empty(len(sprites), object)
+        out[:] = sprites
+        return out
+
+    def draw(self, screen):
+        n = self.count
+        if not n:
+            return
+        px = self.x[:n].astype(np.int32)
+        py = self.y[:n].astype(np.int32)
+        keys = self.variant[:n].copy()
+        if self.kind == 'rain':
+            # Streaks lean along the wind: slant / length = vx / vy
+            spec = KINDS['rain']
+            slant = int(np.clip(round(self.wind / spec['fall'] * spec['length']), -MAX_SLANT, MAX_SLANT))
+            keys += (self.layer[:n] * (2 * MAX_SLANT + 1) + slant + MAX_SLANT) * VARIANTS
+        else:
+            keys += self.layer[:n] * VARIANTS
+        w, h = screen.get_size()
+        visible = np.flatnonzero((px < w) & (py < h) & (px > -CLUMP) & (py > -CLUMP))
+        if not visible.size:
+            return
+        visible = visible[np.argsort(self.layer[visible], kind='stable')]   # Far layers first
+        positions = np.stack((px[visible], py[visible]), axis=1).tolist()
+        screen.blits(zip(self.sprites[self.kind][keys[visible]].tolist(), positions), doreturn=False)